@@ -15,6 +15,7 @@
 # limitations under the License.
 import logging
 import os
+from contextlib import contextmanager
 
 from networkapi.api_deploy import exceptions
 from networkapi.api_equipment.exceptions import AllEquipmentsAreInMaintenanceException
@@ -28,6 +29,7 @@ from networkapi.settings import CONFIG_FILES_PATH
 from networkapi.settings import CONFIG_FILES_REL_PATH
 from networkapi.settings import TFTP_SERVER_ADDR
 from networkapi.settings import TFTPBOOT_FILES_PATH
+from networkapi.util.fanout import fan_out
 # import pkgutil
 # import re
 # import sys
@@ -66,14 +68,33 @@ def _applyconfig(equipment, filename, equipment_access=None, source_server=None,
     # TODO: Handle exceptions from the following methods and generate response
     # for the caller
 
+    with equipment_session(equipment) as equip_plugin:
+        return _copy_file(equip_plugin, filename)
+
+
+@contextmanager
+def equipment_session(equipment):
+    """Connected plugin of equipment in privileged mode, closed at the end
+    of the block.
+
+    Args:
+            equipment: networkapi.equipamento.Equipamento()
+    """
+
     equip_plugin = PluginFactory.factory(equipment)
     equip_plugin.connect()
-    equip_plugin.ensure_privilege_level()
-    vrf = equip_plugin.equipment_access.vrf.internal_name if equip_plugin.equipment_access.vrf else None
-    equip_output = equip_plugin.copyScriptFileToConfig(filename, use_vrf=vrf)
-    equip_plugin.close()
+    try:
+        equip_plugin.ensure_privilege_level()
+        yield equip_plugin
+    finally:
+        equip_plugin.close()
 
-    return equip_output
+
+def _copy_file(equip_plugin, filename):
+    """Copy file to config of equipment using a connected plugin."""
+
+    vrf = equip_plugin.equipment_access.vrf.internal_name if equip_plugin.equipment_access.vrf else None
+    return equip_plugin.copyScriptFileToConfig(filename, use_vrf=vrf)
 
 
 def create_file_from_script(script, prefix_name=''):
@@ -155,6 +176,63 @@ def deploy_config_in_equipment_synchronous(rel_filename, equipment, lockvar,
             equipment, rel_filename, equipment_access, tftpserver)
 
 
+def deploy_configs_in_equipments_synchronous(deploys):
+    """Apply configuration in equipments in parallel
+
+    Each equipment is configured under its lock, using a single session for
+    all its actions. At most settings.DEPLOY_WORKERS equipments are
+    configured at the same time.
+
+    Args:
+            deploys: list of (equipment, lockvar, actions), where equipment is
+                     networkapi.equipamento.Equipamento(), lockvar the
+                     distributed lock variable of equipment and actions a
+                     list of file paths relative to TFTPBOOT_FILES_PATH or
+                     functions receiving the connected plugin, applied in
+                     order
+
+    Returns:
+            dict with joined outputs of actions by equipment id
+
+    Raises:
+            AllEquipmentsAreInMaintenanceException: if an equipment is in
+                                                    maintenance
+    """
+
+    by_equipment = dict()
+    for equipment, lockvar, actions in deploys:
+        if equipment.id in by_equipment:
+            # Same equipment, same session
+            by_equipment[equipment.id][2].extend(actions)
+        else:
+            by_equipment[equipment.id] = (equipment, lockvar, list(actions))
+
+        for action in actions:
+            if callable(action):
+                continue
+            # validate filename
+            path = os.path.abspath(TFTPBOOT_FILES_PATH + action)
+            if not path.startswith(TFTPBOOT_FILES_PATH):
+                raise exceptions.InvalidFilenameException(action)
+
+        if equipment.maintenance:
+            raise AllEquipmentsAreInMaintenanceException()
+
+    def apply_actions(equipment_id, deploy):
+        equipment, lockvar, actions = deploy
+        with distributedlock(lockvar):
+            with equipment_session(equipment) as equip_plugin:
+                output = ''
+                for action in actions:
+                    if callable(action):
+                        output += action(equip_plugin) or ''
+                    else:
+                        output += _copy_file(equip_plugin, action) or ''
+                return output
+
+    return fan_out(by_equipment.items(), apply_actions)
+
+
 def deploy_config_in_equipment(rel_filename, equipment, tftpserver=None,
                                equipment_access=None):
     """Apply configuration file on equipment
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+from mock import MagicMock
+from mock import patch
+
+from networkapi.api_deploy.facade import deploy_configs_in_equipments_synchronous
+from networkapi.api_equipment.exceptions import AllEquipmentsAreInMaintenanceException
+
+
+def equipment(id, maintenance=False):
+    return MagicMock(id=id, maintenance=maintenance)
+
+
+class DeployConfigsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = patch(
+            'networkapi.api_deploy.facade.distributedlock').start()
+        self.factory = patch(
+            'networkapi.api_deploy.facade.PluginFactory.factory').start()
+        self.factory.side_effect = self.plugin
+        patch('networkapi.util.fanout._close_connections').start()
+        self.plugins = dict()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def plugin(self, equipment):
+        plugin = MagicMock()
+        plugin.equipment_access.vrf = None
+        plugin.copyScriptFileToConfig.side_effect = \
+            lambda filename, use_vrf: 'copied %s\n' % filename
+        plugin.remove_svi.return_value = 'svi removed\n'
+        self.plugins[equipment.id] = plugin
+        return plugin
+
+    def test_reuse_session_of_equipment(self):
+        status = deploy_configs_in_equipments_synchronous([
+            (equipment(1), 'lock_1', [
+                'networks/file_1',
+                lambda equip_plugin: equip_plugin.remove_svi(10)])])
+
+        self.assertEqual({1: 'copied networks/file_1\nsvi removed\n'}, status)
+        plugin = self.plugins[1]
+        plugin.connect.assert_called_once_with()
+        plugin.ensure_privilege_level.assert_called_once_with()
+        plugin.remove_svi.assert_called_once_with(10)
+        plugin.close.assert_called_once_with()
+        self.lock.assert_called_once_with('lock_1')
+
+    def test_merge_deploys_of_same_equipment(self):
+        router = equipment(1)
+        status = deploy_configs_in_equipments_synchronous([
+            (router, 'lock_1', ['networks/file_1']),
+            (router, 'lock_1', ['networks/file_2'])])
+
+        self.assertEqual(
+            {1: 'copied networks/file_1\ncopied networks/file_2\n'}, status)
+        self.plugins[1].connect.assert_called_once_with()
+
+    def test_deploy_equipments_in_parallel(self):
+        threads = set()
+
+        def copy(filename, use_vrf):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.2)
+            return filename
+
+        def plugin(equipment):
+            equip_plugin = self.plugin(equipment)
+            equip_plugin.copyScriptFileToConfig.side_effect = copy
+            return equip_plugin
+
+        self.factory.side_effect = plugin
+        equipments = [equipment(i) for i in range(1, 4)]
+
+        start = time.time()
+        status = deploy_configs_in_equipments_synchronous([
+            (eqpt, 'lock_%s' % eqpt.id, ['networks/file_%s' % eqpt.id])
+            for eqpt in equipments])
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(3, len(threads))
+        self.assertEqual({1: 'networks/file_1', 2: 'networks/file_2',
+                          3: 'networks/file_3'}, status)
+
+    def test_close_session_on_error(self):
+        self.factory.side_effect = None
+        self.factory.return_value = MagicMock()
+        self.factory.return_value.copyScriptFileToConfig.side_effect = \
+            IOError
+        with self.assertRaises(IOError):
+            deploy_configs_in_equipments_synchronous([
+                (equipment(1), 'lock_1', ['networks/file_1'])])
+        self.factory.return_value.close.assert_called_once_with()
+
+    def test_equipment_in_maintenance(self):
+        with self.assertRaises(AllEquipmentsAreInMaintenanceException):
+            deploy_configs_in_equipments_synchronous([
+                (equipment(1, True), 'lock_1', ['networks/file_1'])])
+        self.assertFalse(self.factory.called)
@@ -20,7 +20,6 @@ import re
 from django.core.exceptions import FieldError
 from django.core.exceptions import ObjectDoesNotExist
 from django.template import Context
-from django.template import Template
 
 from networkapi.api_deploy.facade import deploy_config_in_equipment_synchronous
 from networkapi.api_interface import exceptions
@@ -43,6 +42,8 @@ from networkapi.interface import models
 from networkapi.system import exceptions as var_exceptions
 from networkapi.system.facade import get_value as get_variable
 from networkapi.util import is_valid_int_greater_zero_param
+from networkapi.util.template import get_template
+from networkapi.util.template import render_to_file
 
 
 log = logging.getLogger(__name__)
@@ -303,7 +304,6 @@ def generate_delete_file(user, equip_id, interface_list, channel):
             'TEMPLATE_REMOVE_CHANNEL ou TEMPLATE_REMOVE_INTERFACE.')
 
     key_dict = dict()
-    config_to_be_saved = ''
     request_id = getattr(local, 'request_id', NO_REQUEST_ID)
     extension = '.py' if interface_list[0].equipamento.modelo.marca.nome == "HP" else ''
     filename_out = 'equip_' + str(equip_id) + '_channel_' + str(channel.id) + '_remove_' + str(request_id) + extension
@@ -313,34 +313,28 @@ def generate_delete_file(user, equip_id, interface_list, channel):
 
     key_dict['PORTCHANNEL_NAME'] = channel.nome
 
-    for i in interface_list:
-        key_dict['INTERFACE_NAME'] = i.interface
-        try:
-            interface_template_file = _load_template_file(
-                int(equip_id), TEMPLATE_REMOVE_INTERFACE)
-            config_to_be_saved += interface_template_file.render(
-                Context(key_dict))
-        except exceptions.InterfaceTemplateException, e:
-            log.error(e)
-            raise exceptions.InterfaceTemplateException()
-        except KeyError, exception:
-            log.error('Erro: %s ' % exception)
-            raise exceptions.InvalidKeyException(exception)
-        log.info('facade ' + str(i.interface))
+    try:
+        interface_template_file = _load_template_file(
+            int(equip_id), TEMPLATE_REMOVE_INTERFACE)
+    except exceptions.InterfaceTemplateException, e:
+        log.error(e)
+        raise exceptions.InterfaceTemplateException()
+    channel_template_file = _load_template_file(
+        int(equip_id), TEMPLATE_REMOVE_CHANNEL)
+
+    def render():
+        for i in interface_list:
+            key_dict['INTERFACE_NAME'] = i.interface
+            yield interface_template_file.render(Context(key_dict))
+            log.info('facade ' + str(i.interface))
+        yield channel_template_file.render(Context(key_dict))
 
+    # Save new file
     try:
-        channel_template_file = _load_template_file(
-            int(equip_id), TEMPLATE_REMOVE_CHANNEL)
-        config_to_be_saved += channel_template_file.render(Context(key_dict))
+        render_to_file(filename_to_save, render())
     except KeyError, exception:
         log.error('Erro: %s ' % exception)
         raise exceptions.InvalidKeyException(exception)
-
-    # Save new file
-    try:
-        file_handle = open(filename_to_save, 'w')
-        file_handle.write(config_to_be_saved)
-        file_handle.close()
     except IOError, e:
         log.error('Error writing to config file: %s' % filename_to_save)
         raise e
@@ -443,7 +437,6 @@ def _generate_config_file(interfaces_list):
                 'different equipments in same call.')
             raise exceptions.InvalidIdInterfaceException
 
-    config_to_be_saved = ''
     equipment_id = interfaces_list[0].equipamento.id
 
     request_id = getattr(local, 'request_id', NO_REQUEST_ID)
@@ -454,34 +447,34 @@ def _generate_config_file(interfaces_list):
     rel_file_to_deploy = INTERFACE_CONFIG_TOAPPLY_REL_PATH + filename_out
 
     int_template_file = _load_template_file(equipment_id, TEMPLATE_TYPE_INT)
-    channels_configured = {}
+    if any(interface.channel is not None and interface.channel.id is not None
+           for interface in interfaces_list):
+        channel_template_file = _load_template_file(
+            equipment_id, TEMPLATE_TYPE_CHANNEL)
 
-    for interface in interfaces_list:
-        key_dict = _generate_dict(interface)
+    def render():
+        channels_configured = {}
 
-        # If Interface is in channel, render the template for channel,
-        # only once for each channel
-        try:
+        for interface in interfaces_list:
+            key_dict = _generate_dict(interface)
+
+            # If Interface is in channel, render the template for channel,
+            # only once for each channel
             if interface.channel is not None:
                 if interface.channel.id is not None and \
                         interface.channel.id not in channels_configured.keys():
-                    channel_template_file = _load_template_file(
-                        equipment_id, TEMPLATE_TYPE_CHANNEL)
-                    config_to_be_saved += channel_template_file.render(
-                        Context(key_dict))
+                    yield channel_template_file.render(Context(key_dict))
                     channels_configured[interface.channel.id] = 1
 
             # Render the template for interface
-            config_to_be_saved += int_template_file.render(Context(key_dict))
-        except KeyError, exception:
-            log.error('Erro: %s ' % exception)
-            raise exceptions.InvalidKeyException(exception)
+            yield int_template_file.render(Context(key_dict))
 
     # Save new file
     try:
-        file_handle = open(filename_to_save, 'w')
-        file_handle.write(config_to_be_saved)
-        file_handle.close()
+        render_to_file(filename_to_save, render())
+    except KeyError, exception:
+        log.error('Erro: %s ' % exception)
+        raise exceptions.InvalidKeyException(exception)
     except IOError, e:
         log.error('Error writing to config file: %s' % filename_to_save)
         raise e
@@ -513,9 +506,7 @@ def _load_template_file(equipment_id, template_type):
 
     # Read contents from file
     try:
-        file_handle = open(filename_in, 'r')
-        template_file = Template(file_handle.read())
-        file_handle.close()
+        template_file = get_template(filename_in)
     except IOError, e:
         log.error('Error opening template file for read: %s. Equip: %s' %
                   (filename_in, equipment_id))
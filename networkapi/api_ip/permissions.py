@@ -7,7 +7,7 @@ from networkapi.api_ip.facade import get_ipv6_by_ids
 from networkapi.api_network.facade.v3 import get_networkipv4_by_ids
 from networkapi.api_network.facade.v3 import get_networkipv6_by_ids
 from networkapi.auth import has_perm
-from networkapi.auth import validate_object_perm
+from networkapi.auth import validate_request_object_perm
 
 
 class Read(BasePermission):
@@ -40,9 +40,9 @@ def perm_objv4(request, operation, object_type, *args, **kwargs):
         objs = get_ipv4_by_ids(kwargs.get('obj_ids', []).split(';'))\
             .values_list('networkipv4__vlan', flat=True)
 
-    return validate_object_perm(
+    return validate_request_object_perm(
+        request,
         objs,
-        request.user,
         operation,
         object_type
     )
@@ -58,9 +58,9 @@ def perm_objv6(request, operation, object_type, *args, **kwargs):
         objs = get_ipv6_by_ids(kwargs.get('obj_ids', []).split(';'))\
             .values_list('networkipv6__vlan', flat=True)
 
-    return validate_object_perm(
+    return validate_request_object_perm(
+        request,
         objs,
-        request.user,
         operation,
         object_type
     )
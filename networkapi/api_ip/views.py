@@ -15,10 +15,12 @@ from networkapi.api_ip.permissions import write_objv4_permission
 from networkapi.api_ip.permissions import write_objv6_permission
 from networkapi.settings import SPECS
 from networkapi.util.classes import CustomAPIView
+from networkapi.util.decorators import buffer_audit_apiview
 from networkapi.util.decorators import logs_method_apiview
 from networkapi.util.decorators import permission_classes_apiview
 from networkapi.util.decorators import permission_obj_apiview
 from networkapi.util.decorators import prepare_search
+from networkapi.util.decorators import publish_batch_apiview
 from networkapi.util.geral import render_to_json
 from networkapi.util.json_validate import json_validate
 from networkapi.util.json_validate import raise_json_validate
@@ -71,6 +73,8 @@ class IPv4View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv4_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """Create Ipv4."""
 
@@ -88,6 +92,8 @@ class IPv4View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv4_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """Edit Ipv4."""
 
@@ -105,6 +111,8 @@ class IPv4View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv4_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """Delete Ipv4."""
 
@@ -239,6 +247,8 @@ class IPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """Save Ipv6."""
 
@@ -256,6 +266,8 @@ class IPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """Edit Ipv6."""
 
@@ -273,6 +285,8 @@ class IPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, Write))
     @permission_obj_apiview([write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """Edit Ipv6"""
 
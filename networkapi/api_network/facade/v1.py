@@ -17,9 +17,8 @@ import logging
 
 from django.db import transaction
 from django.template import Context
-from django.template import Template
 
-from networkapi.api_deploy.facade import deploy_config_in_equipment_synchronous
+from networkapi.api_deploy.facade import deploy_configs_in_equipments_synchronous
 from networkapi.api_interface import exceptions as exceptions_interface
 from networkapi.api_network import exceptions
 from networkapi.api_network.facade.v3 import utils
@@ -42,10 +41,10 @@ from networkapi.ip.models import Ipv6
 from networkapi.ip.models import Ipv6Equipament
 from networkapi.ip.models import NetworkIPv4
 from networkapi.ip.models import NetworkIPv6
-from networkapi.plugins.factory import PluginFactory
 from networkapi.settings import NETWORK_CONFIG_FILES_PATH
 from networkapi.settings import NETWORK_CONFIG_TEMPLATE_PATH
 from networkapi.settings import NETWORK_CONFIG_TOAPPLY_REL_PATH
+from networkapi.util.template import get_template
 
 
 log = logging.getLogger(__name__)
@@ -120,18 +119,9 @@ def deploy_networkIPv4_configuration(user, networkipv4, equipment_list):
             # load dict with all equipment attributes
             dict_ips = get_dict_v4_to_use_in_configuration_deploy(
                 user, networkipv4, equipment_list)
-            status_deploy = dict()
-            # TODO implement threads
-            for equipment in equipment_list:
-                # generate config file
-                file_to_deploy = _generate_config_file(
-                    dict_ips, equipment, TEMPLATE_NETWORKv4_ACTIVATE)
-                # deploy config file in equipments
-                lockvar = LOCK_EQUIPMENT_DEPLOY_CONFIG_NETWORK_SCRIPT % (
-                    equipment.id)
-                status_deploy[equipment.id] = \
-                    deploy_config_in_equipment_synchronous(
-                        file_to_deploy, equipment, lockvar)
+            # deploy config file in equipments
+            status_deploy = _deploy_config_in_equipments(
+                dict_ips, equipment_list, TEMPLATE_NETWORKv4_ACTIVATE)
 
             networkipv4.activate(user)
             transaction.commit()
@@ -163,17 +153,9 @@ def deploy_networkIPv6_configuration(user, networkipv6, equipment_list):
             # load dict with all equipment attributes
             dict_ips = get_dict_v6_to_use_in_configuration_deploy(
                 user, networkipv6, equipment_list)
-            status_deploy = dict()
-            # TODO implement threads
-            for equipment in equipment_list:
-                # generate config file
-                file_to_deploy = _generate_config_file(
-                    dict_ips, equipment, TEMPLATE_NETWORKv6_ACTIVATE)
-                # deploy config file in equipments
-                lockvar = LOCK_EQUIPMENT_DEPLOY_CONFIG_NETWORK_SCRIPT % (
-                    equipment.id)
-                status_deploy[equipment.id] = deploy_config_in_equipment_synchronous(
-                    file_to_deploy, equipment, lockvar)
+            # deploy config file in equipments
+            status_deploy = _deploy_config_in_equipments(
+                dict_ips, equipment_list, TEMPLATE_NETWORKv6_ACTIVATE)
 
             networkipv6.activate(user)
             transaction.commit()
@@ -205,29 +187,21 @@ def remove_deploy_networkIPv4_configuration(user, networkipv4, equipment_list):
             # load dict with all equipment attributes
             dict_ips = get_dict_v4_to_use_in_configuration_deploy(
                 user, networkipv4, equipment_list)
-            status_deploy = dict()
-            # TODO implement threads
-            for equipment in equipment_list:
-                # generate config file
-                file_to_deploy = _generate_config_file(
-                    dict_ips, equipment, TEMPLATE_NETWORKv4_DEACTIVATE)
-                # deploy config file in equipments
-                lockvar = LOCK_EQUIPMENT_DEPLOY_CONFIG_NETWORK_SCRIPT % (
-                    equipment.id)
-                status_deploy[equipment.id] = deploy_config_in_equipment_synchronous(
-                    file_to_deploy, equipment, lockvar)
+            # if there are no other networks active in vlan, remove int vlan
+            # in the same session used to deploy config file
+            remove_svi = networkipv4.vlan.ativada == 1 and \
+                not _has_active_network_in_vlan(networkipv4.vlan,
+                                                exclude=networkipv4)
+
+            # deploy config file in equipments
+            status_deploy = _deploy_config_in_equipments(
+                dict_ips, equipment_list, TEMPLATE_NETWORKv4_DEACTIVATE,
+                networkipv4.vlan.num_vlan if remove_svi else None)
+
             networkipv4.deactivate(user)
             transaction.commit()
-            if networkipv4.vlan.ativada == 1:
-                # if there are no other networks active in vlan, remove int
-                # vlan
-                if not _has_active_network_in_vlan(networkipv4.vlan):
-                    # remove int vlan
-                    for equipment in equipment_list:
-                        if equipment.maintenance is not True:
-                            status_deploy[
-                                equipment.id] += _remove_svi(equipment, networkipv4.vlan.num_vlan)
-                    networkipv4.vlan.remove(user)
+            if remove_svi:
+                networkipv4.vlan.remove(user)
 
             return status_deploy
 
@@ -254,34 +228,51 @@ def remove_deploy_networkIPv6_configuration(user, networkipv6, equipment_list):
             # load dict with all equipment attributes
             dict_ips = get_dict_v6_to_use_in_configuration_deploy(
                 user, networkipv6, equipment_list)
-            status_deploy = dict()
-            # TODO implement threads
-            for equipment in equipment_list:
-                # generate config file
-                file_to_deploy = _generate_config_file(
-                    dict_ips, equipment, TEMPLATE_NETWORKv6_DEACTIVATE)
-                # deploy config file in equipments
-                lockvar = LOCK_EQUIPMENT_DEPLOY_CONFIG_NETWORK_SCRIPT % (
-                    equipment.id)
-                status_deploy[equipment.id] = deploy_config_in_equipment_synchronous(
-                    file_to_deploy, equipment, lockvar)
+            # if there are no other networks active in vlan, remove int vlan
+            # in the same session used to deploy config file
+            remove_svi = networkipv6.vlan.ativada == 1 and \
+                not _has_active_network_in_vlan(networkipv6.vlan,
+                                                exclude=networkipv6)
+
+            # deploy config file in equipments
+            status_deploy = _deploy_config_in_equipments(
+                dict_ips, equipment_list, TEMPLATE_NETWORKv6_DEACTIVATE,
+                networkipv6.vlan.num_vlan if remove_svi else None)
 
             networkipv6.deactivate(user)
             transaction.commit()
-            if networkipv6.vlan.ativada == 1:
-                # if there are no other networks active in vlan, remove int
-                # vlan
-                if not _has_active_network_in_vlan(networkipv6.vlan):
-                    # remove int vlan
-                    for equipment in equipment_list:
-                        if equipment.maintenance is not True:
-                            status_deploy[
-                                equipment.id] += _remove_svi(equipment, networkipv6.vlan.num_vlan)
-                    networkipv6.vlan.remove(user)
+            if remove_svi:
+                networkipv6.vlan.remove(user)
 
             return status_deploy
 
 
+def _deploy_config_in_equipments(dict_ips, equipment_list, template_type,
+                                 svi_to_remove=None):
+    """Generate config files and apply them in equipments in parallel
+
+    Args: 2-dimension dictionary with equipments information for template rendering
+    equipment_list: Equipamento objects list
+    template type to load
+    svi_to_remove: number of vlan to remove int vlan after applying config
+
+    Returns: Dict with status of equipments output
+    """
+
+    deploys = list()
+    for equipment in equipment_list:
+        # generate config file
+        actions = [_generate_config_file(dict_ips, equipment, template_type)]
+        if svi_to_remove is not None:
+            actions.append(
+                lambda equip_plugin: equip_plugin.remove_svi(svi_to_remove))
+        lockvar = LOCK_EQUIPMENT_DEPLOY_CONFIG_NETWORK_SCRIPT % (
+            equipment.id)
+        deploys.append((equipment, lockvar, actions))
+
+    return deploy_configs_in_equipments_synchronous(deploys)
+
+
 def _generate_config_file(dict_ips, equipment, template_type):
     """Load a template and write a file with the rended output
 
@@ -557,24 +548,25 @@ def get_dict_v6_to_use_in_configuration_deploy(user, networkipv6, equipment_list
     return dict_ips
 
 
-def _has_active_network_in_vlan(vlan):
+def _has_active_network_in_vlan(vlan, exclude=None):
     """Check if there are any other active network in the vlan
     this is used because some equipments remove all the L3 config
     when applying some commands, so they can only be applyed at the first time
     or to remove interface vlan configuration
 
     Args: vlan object
+    exclude: NetworkIPv4 or NetworkIPv6 object to ignore
 
     Returns: True of False
     """
     nets = NetworkIPv4.objects.filter(vlan=vlan)
     for network in nets:
-        if network.active is True:
+        if network.active is True and network != exclude:
             return True
 
     netsv6 = NetworkIPv6.objects.filter(vlan=vlan)
     for network in netsv6:
-        if network.active is True:
+        if network.active is True and network != exclude:
             return True
 
     return False
@@ -601,9 +593,7 @@ def _load_template_file(equipment, template_type):
 
     # Read contents from file
     try:
-        file_handle = open(filename_in, 'r')
-        template_file = Template(file_handle.read())
-        file_handle.close()
+        template_file = get_template(filename_in)
     except IOError, e:
         log.error('Error opening template file for read: %s' % filename_in)
         raise e
@@ -613,12 +603,3 @@ def _load_template_file(equipment, template_type):
         # TemplateSyntaxError
 
     return template_file
-
-
-def _remove_svi(equipment, vlan_num):
-    equip_plugin = PluginFactory.factory(equipment)
-    equip_plugin.connect()
-    output = equip_plugin.remove_svi(vlan_num)
-    equip_plugin.close()
-
-    return output
@@ -3,7 +3,6 @@ import logging
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.template import Context
-from django.template import Template
 
 from networkapi.api_network import exceptions
 from networkapi.ip.models import Ip
@@ -17,6 +16,7 @@ from networkapi.settings import NETWORK_CONFIG_TEMPLATE_PATH
 from networkapi.settings import NETWORK_CONFIG_TOAPPLY_REL_PATH
 from networkapi.system.facade import get_value as get_variable
 from networkapi.system import exceptions as var_exceptions
+from networkapi.util.template import get_template
 
 log = logging.getLogger(__name__)
 
@@ -84,9 +84,7 @@ def load_template_file(equipment, template_type):
 
     # Read contents from file
     try:
-        file_handle = open(filename_in, 'r')
-        template_file = Template(file_handle.read())
-        file_handle.close()
+        template_file = get_template(filename_in)
     except IOError, e:
         log.error('Error opening template file for read: %s' % filename_in)
         raise Exception(e)
@@ -6,7 +6,7 @@ from networkapi.admin_permission import AdminPermission
 from networkapi.api_network.facade.v3 import get_networkipv4_by_ids
 from networkapi.api_network.facade.v3 import get_networkipv6_by_ids
 from networkapi.auth import has_perm
-from networkapi.auth import validate_object_perm
+from networkapi.auth import validate_request_object_perm
 
 
 class Read(BasePermission):
@@ -59,9 +59,9 @@ def perm_objv4(request, operation, object_type, *args, **kwargs):
         objs = get_networkipv4_by_ids(kwargs.get('obj_ids', []).split(';'))\
             .values_list('vlan', flat=True)
 
-    return validate_object_perm(
+    return validate_request_object_perm(
+        request,
         objs,
-        request.user,
         operation,
         object_type
     )
@@ -79,9 +79,9 @@ def perm_objv6(request, operation, object_type, *args, **kwargs):
         objs = get_networkipv6_by_ids(kwargs.get('obj_ids', []).split(';'))\
             .values_list('vlan', flat=True)
 
-    return validate_object_perm(
+    return validate_request_object_perm(
+        request,
         objs,
-        request.user,
         operation,
         object_type
     )
@@ -224,8 +224,9 @@ class NetworkFacadeTestCase(unittest.TestCase):
         open_mock.return_value = file_handle
 
     def mock_deploy_config(self, response):
+        patch('networkapi.api_deploy.facade.equipment_session').start()
         deploy_config_mock = patch(
-            'networkapi.api_network.facade.v1.deploy_config_in_equipment_synchronous').start()
+            'networkapi.api_deploy.facade._copy_file').start()
         deploy_config_mock.return_value = response
         return deploy_config_mock
 
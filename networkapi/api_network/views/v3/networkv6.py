@@ -13,10 +13,12 @@ from networkapi.api_network.facade import v3 as facade
 from networkapi.api_network.serializers import v3 as serializers
 from networkapi.settings import SPECS
 from networkapi.util.classes import CustomAPIView
+from networkapi.util.decorators import buffer_audit_apiview
 from networkapi.util.decorators import logs_method_apiview
 from networkapi.util.decorators import permission_classes_apiview
 from networkapi.util.decorators import permission_obj_apiview
 from networkapi.util.decorators import prepare_search
+from networkapi.util.decorators import publish_batch_apiview
 from networkapi.util.geral import render_to_json
 from networkapi.util.json_validate import json_validate
 from networkapi.util.json_validate import raise_json_validate
@@ -69,6 +71,8 @@ class NetworkIPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """Creates list of networkv6."""
 
@@ -88,6 +92,8 @@ class NetworkIPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """Updates list of networkv6."""
 
@@ -107,6 +113,8 @@ class NetworkIPv6View(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_objv6_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """Deletes list of networkv6."""
 
@@ -303,6 +311,8 @@ class NetworkIPv6ForceView(CustomAPIView):
     @raise_json_validate('networkv6_post')
     @permission_classes_apiview((IsAuthenticated, permissions.WriteForce))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """Creates list of networkv6."""
 
@@ -322,6 +332,8 @@ class NetworkIPv6ForceView(CustomAPIView):
     @raise_json_validate('networkv6_put')
     @permission_classes_apiview((IsAuthenticated, permissions.WriteForce))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """Updates list of networkv6."""
 
@@ -341,6 +353,8 @@ class NetworkIPv6ForceView(CustomAPIView):
     @raise_json_validate('')
     @permission_classes_apiview((IsAuthenticated, permissions.WriteForce))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """Deletes list of networkv6."""
 
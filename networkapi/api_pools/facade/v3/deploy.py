@@ -17,6 +17,7 @@ from networkapi.equipamento.models import EquipamentoAcesso
 from networkapi.plugins.factory import PluginFactory
 from networkapi.requisicaovips.models import ServerPool
 from networkapi.requisicaovips.models import ServerPoolMember
+from networkapi.util.fanout import fan_out
 
 log = logging.getLogger(__name__)
 
@@ -100,14 +101,39 @@ def _prepare_apply(pools, created=False, user=None):
     return load_balance
 
 
+def _apply_in_lbs(load_balance, method, *args, **kwargs):
+    """Call method of plugin in all load balancers in parallel.
+
+    :param load_balance: Dict returned by _prepare_apply
+    :param method: Name of method of plugin, called with data of load
+                   balancer and args
+    :param compensate: Name of method of plugin called with data of load
+                       balancer and cleanup flag where method was done,
+                       when it fails in other load balancer
+    :return: Dict of results of method by load balancer
+    """
+
+    compensate = kwargs.get('compensate')
+
+    def call(lb, inst):
+        return getattr(inst['plugin'], method)(inst, *args)
+
+    def rollback(lb, inst, result):
+        getattr(inst['plugin'], compensate)(inst, True)
+
+    return fan_out(load_balance.items(), call,
+                   rollback if compensate else None)
+
+
 @commit_on_success
 def create_real_pool(pools, user):
     """Create real pool in eqpt."""
 
     load_balance = _prepare_apply(pools=pools, created=False, user=user)
 
-    for lb in load_balance:
-        load_balance[lb]['plugin'].create_pool(load_balance[lb])
+    # Pools are removed from load balancers where they were created when
+    # other load balancer fails
+    _apply_in_lbs(load_balance, 'create_pool', compensate='delete_pool')
 
     ids = [pool['id'] for pool in pools]
     ServerPool.objects.filter(id__in=ids).update(pool_created=True)
@@ -124,10 +150,8 @@ def delete_real_pool(pools, user, cleanup='0'):
 
     id_lists = list()
     if cleanup:
-        for lb_id in load_balance:
-            ids_aux = load_balance[lb_id]['plugin'].delete_pool(
-                load_balance[lb_id], cleanup)
-            id_lists.append(ids_aux)
+        id_lists = _apply_in_lbs(
+            load_balance, 'delete_pool', cleanup).values()
 
         num_list = len(id_lists)
         exists = True
@@ -140,9 +164,7 @@ def delete_real_pool(pools, user, cleanup='0'):
             if exists:
                 ids.append(id)
     else:
-        for lb_id in load_balance:
-            load_balance[lb_id]['plugin'].delete_pool(
-                load_balance[lb_id], cleanup)
+        _apply_in_lbs(load_balance, 'delete_pool', cleanup)
         ids = [pool['id'] for pool in pools]
 
     ServerPool.objects.filter(id__in=ids).update(pool_created=False)
@@ -301,8 +323,7 @@ def update_real_pool(pools, user):
     if len(list(set(keys))) > 1:
         raise Exception('Pools are in differents load balancers')
 
-    for lb in load_balance:
-        load_balance[lb]['plugin'].update_pool(load_balance[lb])
+    _apply_in_lbs(load_balance, 'update_pool')
 
     return {}
 
@@ -366,8 +387,7 @@ def set_poolmember_state(pools, user):
 
     load_balance = _prepare_apply_state(pools['server_pools'], user)
 
-    for lb in load_balance:
-        load_balance[lb]['plugin'].set_state_member(load_balance[lb])
+    _apply_in_lbs(load_balance, 'set_state_member')
 
     for pool in pools['server_pools']:
         for pool_member in pool['server_pool_members']:
@@ -385,12 +405,13 @@ def get_poolmember_state(pools):
 
     load_balance = _prepare_apply_state(pools)
 
+    # call plugin to get state member
+    results = _apply_in_lbs(load_balance, 'get_state_member')
+
     ps = dict()
     status = dict()
     for lb in load_balance:
-        # call plugin to get state member
-        states = load_balance[lb]['plugin'].\
-            get_state_member(load_balance[lb])
+        states = results[lb]
 
         for idx, state in enumerate(states):
             pool_id = load_balance[lb]['pools'][idx]['id']
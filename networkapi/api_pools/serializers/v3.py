@@ -319,6 +319,7 @@ class PoolV3Serializer(DynamicFieldsModelSerializer):
                         'many': True,
                     },
                     'obj': 'server_pool_members',
+                    'relation': 'serverpoolmember_set',
                 },
                 'server_pool_members__details': {
                     'serializer': PoolMemberV3Serializer,
@@ -326,6 +327,7 @@ class PoolV3Serializer(DynamicFieldsModelSerializer):
                         'many': True
                     },
                     'obj': 'server_pool_members',
+                    'relation': 'serverpoolmember_set',
                 },
                 'vips': {
                     'serializer': vip_slz.VipRequestV3Serializer,
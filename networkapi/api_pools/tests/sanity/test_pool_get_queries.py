@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from django.core.management import call_command
+from django.test.client import Client
+
+from networkapi.test.test_case import NetworkApiTestCase
+
+log = logging.getLogger(__name__)
+
+
+def setup():
+    call_command(
+        'loaddata',
+        'networkapi/system/fixtures/initial_variables.json',
+        'networkapi/api_pools/fixtures/initial_optionspool.json',
+        'networkapi/requisicaovips/fixtures/initial_optionsvip.json',
+        'networkapi/healthcheckexpect/fixtures/initial_healthcheck.json',
+        'networkapi/usuario/fixtures/initial_usuario.json',
+        'networkapi/grupo/fixtures/initial_ugrupo.json',
+        'networkapi/usuario/fixtures/initial_usuariogrupo.json',
+        'networkapi/api_ogp/fixtures/initial_objecttype.json',
+        'networkapi/api_ogp/fixtures/initial_objectgrouppermissiongeneral.json',
+        'networkapi/grupo/fixtures/initial_permissions.json',
+        'networkapi/grupo/fixtures/initial_permissoes_administrativas.json',
+        'networkapi/api_pools/fixtures/initial_base.json',
+        'networkapi/api_pools/fixtures/initial_pools_1.json',
+        verbosity=0
+    )
+
+
+class PoolGetQueriesTestCase(NetworkApiTestCase):
+
+    """Queries of v3 list endpoints of pools, so nested serializers do not
+    go back to one query per object."""
+
+    def setUp(self):
+        self.client = Client()
+        # Caches filled by the first request are not counted
+        self.get_pools('/api/v3/pool/', 1)
+
+    def tearDown(self):
+        pass
+
+    def get_pools(self, url, end_record):
+        search = {'start_record': 0, 'end_record': end_record}
+
+        with self.capture_queries() as queries:
+            response = self.client.get(
+                url,
+                {'search': json.dumps(search)},
+                HTTP_AUTHORIZATION=self.get_http_authorization('test'))
+
+        self.compare_status(200, response.status_code)
+
+        return len(response.data['server_pools']), queries.executed
+
+    # Equipments of each member are properties of the model, loaded apart,
+    # so queries grow with members. Ceilings measured with the fixtures.
+
+    def test_list_queries(self):
+        """
+        Test number of queries of list
+        """
+        pools, queries = self.get_pools('/api/v3/pool/', 25)
+
+        self.assertEqual(3, pools)
+        self.assertLessEqual(queries, 26)
+
+    def test_list_details_queries(self):
+        """
+        Test number of queries of list(details)
+        """
+        pools, queries = self.get_pools('/api/v3/pool/details/', 25)
+
+        self.assertEqual(3, pools)
+        self.assertLessEqual(queries, 35)
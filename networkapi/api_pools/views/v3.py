@@ -17,10 +17,12 @@ from networkapi.distributedlock import LOCK_POOL
 from networkapi.requisicaovips import models as models_vips
 from networkapi.settings import SPECS
 from networkapi.util.classes import CustomAPIView
+from networkapi.util.decorators import buffer_audit_apiview
 from networkapi.util.decorators import logs_method_apiview
 from networkapi.util.decorators import permission_classes_apiview
 from networkapi.util.decorators import permission_obj_apiview
 from networkapi.util.decorators import prepare_search
+from networkapi.util.decorators import publish_batch_apiview
 from networkapi.util.geral import create_lock
 from networkapi.util.geral import destroy_lock
 from networkapi.util.geral import render_to_json
@@ -357,6 +359,8 @@ class PoolDBView(CustomAPIView):
     @raise_json_validate('pool_post')
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """
         Save server pool
@@ -377,6 +381,8 @@ class PoolDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """
         Updates server pool
@@ -399,6 +405,8 @@ class PoolDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.delete_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """
         Delete server pool
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from netaddr import IPAddress
+from netaddr import IPNetwork
+
+log = logging.getLogger(__name__)
+
+# Prefix of the point-to-point links of spines and leafs, by IP version
+LINK_PREFIX = {4: 31, 6: 127}
+
+
+def get_subnet(net, new_prefix, index):
+    """Return subnet number index of net with prefix new_prefix.
+
+    Same as list(net.subnet(new_prefix))[index], but the address of the
+    subnet is computed instead of generating every subnet before it.
+    Raises IndexError when net has no such subnet.
+    """
+
+    new_prefix = int(new_prefix)
+    width = 32 if net.version == 4 else 128
+    if not net.prefixlen <= new_prefix <= width:
+        raise IndexError('Network %s has no subnets with prefix %s' %
+                         (net, new_prefix))
+
+    count = 1 << (new_prefix - net.prefixlen)
+    if index < 0:
+        index += count
+    if not 0 <= index < count:
+        raise IndexError('Network %s has %s subnets with prefix %s, '
+                         'subnet %s does not exist' %
+                         (net, count, new_prefix, index))
+
+    first = net.first + index * (1 << (width - new_prefix))
+    return IPNetwork('%s/%s' % (IPAddress(first, net.version), new_prefix))
+
+
+class RackAddressing(object):
+
+    """Point-to-point links of a rack and the addresses of each side.
+
+    Computed once for the rack and shared by leaf and spine configs.
+
+    :param spine_links: Dict by IP version of lists with the network of the
+                        link between each spine and the leafs of the rack
+    :param leaf_links: Dict by IP version with the network of the link
+                       between the two leafs of the rack
+    """
+
+    def __init__(self, spine_links, leaf_links):
+
+        self.spine_links = spine_links
+        self.leaf_links = leaf_links
+
+    @classmethod
+    def from_fabric(cls, numero_rack, spine_blocks, leaf_blocks):
+        """Plan of rack numero_rack from the blocks of the fabric.
+
+        :param spine_blocks: Dict by IP version of lists with the block of
+                             each spine, split in links for every rack
+        :param leaf_blocks: Dict by IP version with the block split in
+                            links between leafs for every rack
+        """
+
+        spine_links = dict(
+            (version, [get_subnet(block, LINK_PREFIX[version], numero_rack)
+                       for block in blocks])
+            for version, blocks in spine_blocks.items())
+        leaf_links = dict(
+            (version, get_subnet(block, LINK_PREFIX[version], numero_rack))
+            for version, block in leaf_blocks.items())
+        return cls(spine_links, leaf_links)
+
+    def spine_link(self, version, spine):
+        return self.spine_links[version][spine]
+
+    def spine_ips(self, version):
+        """Addresses of spines, in order of spines."""
+
+        return [link[0] for link in self.spine_links[version]]
+
+    def leaf_ips(self, version):
+        """Addresses of leafs in the link with each spine."""
+
+        return [link[1] for link in self.spine_links[version]]
+
+    def leaf_link(self, version):
+        return self.leaf_links[version]
+
+    def ibgp_ips(self, version):
+        """Addresses of the two leafs in the link between them."""
+
+        link = self.leaf_links[version]
+        return [link[0], link[1]]
@@ -4,14 +4,17 @@ import ast
 import json
 import logging
 import operator
-import re
 from django.core.exceptions import ObjectDoesNotExist
 from django.forms.models import model_to_dict
 from netaddr import IPNetwork
 from networkapi.rack.models import Rack, RackConfigError
 from networkapi.ambiente import models as models_env
+from networkapi.api_rack.addressing import get_subnet
+from networkapi.api_rack.addressing import RackAddressing
 from networkapi.system.facade import get_value as get_variable
 from networkapi.system import exceptions as var_exceptions
+from networkapi.util.template import get_roteiro
+from networkapi.util.template import substitute
 
 log = logging.getLogger(__name__)
 
@@ -19,27 +22,16 @@ log = logging.getLogger(__name__)
 def replace(filein, fileout, dicionario):
     try:
         # Read contents from file as a single string
-        file_handle = open(filein, 'r')
-        file_string = file_handle.read()
-        file_handle.close()
+        file_string = get_roteiro(filein)
     except Exception as e:
         log.error("Erro abrindo roteiro: %s. Error: %s" % (str(filein), e))
         raise RackConfigError(None, None, "Erro abrindo roteiro: %s." % str(filein))
 
     try:
-        for key in dicionario:
-            # Use RE package to allow for replacement (also allowing for (multiline) REGEX)
-            log.debug("variavel: %s, valor: %s" % (str(key), str(dicionario[key])))
-            file_string = (re.sub(key, dicionario[key], file_string))
-    except Exception as e:
-        log.error("Erro atualizando as variáveis no roteiro: %s. Error: %s" % (filein, e))
-        raise RackConfigError(None, None, "Erro atualizando as variáveis no roteiro: %s." % filein)
-
-    try:
-        # Write contents to file.
+        # Write contents to file, replacing all variables in a single pass.
         # Using mode 'w' truncates the file.
         file_handle = open(fileout, 'w')
-        file_handle.write(file_string)
+        file_handle.writelines(substitute(file_string, dicionario))
         file_handle.close()
     except Exception as e:
         log.error("Erro salvando arquivo de configuração: %s. Error: %s" % (fileout, e))
@@ -47,8 +39,7 @@ def replace(filein, fileout, dicionario):
 
 
 def splitnetworkbyrack(net, bloco, posicao):
-    subnets = list(net.subnet(bloco))
-    return subnets[posicao]
+    return get_subnet(net, bloco, posicao)
 
 
 def autoprovision_splf(rack, equips):
@@ -333,43 +324,19 @@ def autoprovision_splf(rack, equips):
     id_vlt = [envconfig.get("VLT").get("id_vlt_lf1"), envconfig.get("VLT").get("id_vlt_lf2")]
     priority_vlt = [envconfig.get("VLT").get("priority_vlt_lf1"), envconfig.get("VLT").get("priority_vlt_lf2")]
 
-    subSPINE1ipv4 = list(SPINE1ipv4.subnet(31))
-    subSPINE2ipv4 = list(SPINE2ipv4.subnet(31))
-    subSPINE3ipv4 = list(SPINE3ipv4.subnet(31))
-    subSPINE4ipv4 = list(SPINE4ipv4.subnet(31))
-    subSPINE1ipv6 = list(SPINE1ipv6.subnet(127))
-    subSPINE2ipv6 = list(SPINE2ipv6.subnet(127))
-    subSPINE3ipv6 = list(SPINE3ipv6.subnet(127))
-    subSPINE4ipv6 = list(SPINE4ipv6.subnet(127))
-
-    subIBGPToRLxLipv4 = list(IBGPToRLxLipv4.subnet(31))
-    subIBGPToRLxLipv6 = list(IBGPToRLxLipv6.subnet(127))
-
-    IPSPINEipv4[numero_rack].append(subSPINE1ipv4[numero_rack][0])
-    IPSPINEipv4[numero_rack].append(subSPINE2ipv4[numero_rack][0])
-    IPSPINEipv4[numero_rack].append(subSPINE3ipv4[numero_rack][0])
-    IPSPINEipv4[numero_rack].append(subSPINE4ipv4[numero_rack][0])
-    #
-    IPLEAFipv4[numero_rack].append(subSPINE1ipv4[numero_rack][1])
-    IPLEAFipv4[numero_rack].append(subSPINE2ipv4[numero_rack][1])
-    IPLEAFipv4[numero_rack].append(subSPINE3ipv4[numero_rack][1])
-    IPLEAFipv4[numero_rack].append(subSPINE4ipv4[numero_rack][1])
-    #
-    IPSIBGPipv4[numero_rack].append(subIBGPToRLxLipv4[numero_rack][0])
-    IPSIBGPipv4[numero_rack].append(subIBGPToRLxLipv4[numero_rack][1])
-    #
-    IPSPINEipv6[numero_rack].append(subSPINE1ipv6[numero_rack][0])
-    IPSPINEipv6[numero_rack].append(subSPINE2ipv6[numero_rack][0])
-    IPSPINEipv6[numero_rack].append(subSPINE3ipv6[numero_rack][0])
-    IPSPINEipv6[numero_rack].append(subSPINE4ipv6[numero_rack][0])
-    #
-    IPLEAFipv6[numero_rack].append(subSPINE1ipv6[numero_rack][1])
-    IPLEAFipv6[numero_rack].append(subSPINE2ipv6[numero_rack][1])
-    IPLEAFipv6[numero_rack].append(subSPINE3ipv6[numero_rack][1])
-    IPLEAFipv6[numero_rack].append(subSPINE4ipv6[numero_rack][1])
+    plan = RackAddressing.from_fabric(
+        numero_rack,
+        {4: [SPINE1ipv4, SPINE2ipv4, SPINE3ipv4, SPINE4ipv4],
+         6: [SPINE1ipv6, SPINE2ipv6, SPINE3ipv6, SPINE4ipv6]},
+        {4: IBGPToRLxLipv4, 6: IBGPToRLxLipv6})
+
+    IPSPINEipv4[numero_rack] = plan.spine_ips(4)
+    IPLEAFipv4[numero_rack] = plan.leaf_ips(4)
+    IPSIBGPipv4[numero_rack] = plan.ibgp_ips(4)
     #
-    IPSIBGPipv6[numero_rack].append(subIBGPToRLxLipv6[numero_rack][0])
-    IPSIBGPipv6[numero_rack].append(subIBGPToRLxLipv6[numero_rack][1])
+    IPSPINEipv6[numero_rack] = plan.spine_ips(6)
+    IPLEAFipv6[numero_rack] = plan.leaf_ips(6)
+    IPSIBGPipv6[numero_rack] = plan.ibgp_ips(6)
     #
     VLANBELEAF[numero_rack].append(VLANBE+numero_rack)
     VLANBELEAF[numero_rack].append(VLANBE+numero_rack+BASE_RACK)
@@ -469,9 +436,9 @@ def autoprovision_splf(rack, equips):
             variablestochangeleaf1["NET_HOST_BOCAA_IPV4"] = str(subnetsRackBOCAAipv4[numero_rack])
         if CIDRBOCABipv4interno:
             variablestochangeleaf1["NET_HOST_BOCAB_IPV4"] = str(subnetsRackBOCABipv4[numero_rack])
-        variablestochangeleaf1["NET_SPINE1_LF_IPV4"] = str(subSPINE1ipv4[numero_rack])
-        variablestochangeleaf1["NET_SPINE2_LF_IPV4"] = str(subSPINE2ipv4[numero_rack])
-        variablestochangeleaf1["NET_LF_LF_IPV4"] = str(subIBGPToRLxLipv4[numero_rack])
+        variablestochangeleaf1["NET_SPINE1_LF_IPV4"] = str(plan.spine_link(4, 0))
+        variablestochangeleaf1["NET_SPINE2_LF_IPV4"] = str(plan.spine_link(4, 1))
+        variablestochangeleaf1["NET_LF_LF_IPV4"] = str(plan.leaf_link(4))
         variablestochangeleaf1["NET_HOST_BE_IPV6"] = str(subnetsRackBEipv6[numero_rack])
         variablestochangeleaf1["NET_HOST_FE_IPV6"] = str(subnetsRackFEipv6[numero_rack])
         if CIDRBO_DSRipv6interno:
@@ -480,9 +447,9 @@ def autoprovision_splf(rack, equips):
             variablestochangeleaf1["NET_HOST_BOCAA_IPV6"] = str(subnetsRackBOCAAipv6[numero_rack])
         if CIDRBOCABipv6interno:
             variablestochangeleaf1["NET_HOST_BOCAB_IPV6"] = str(subnetsRackBOCABipv6[numero_rack])
-        variablestochangeleaf1["NET_SPINE1_LF_IPV6"] = str(subSPINE1ipv6[numero_rack])
-        variablestochangeleaf1["NET_SPINE2_LF_IPV6"] = str(subSPINE2ipv6[numero_rack])
-        variablestochangeleaf1["NET_LF_LF_IPV6"] = str(subIBGPToRLxLipv6[numero_rack])
+        variablestochangeleaf1["NET_SPINE1_LF_IPV6"] = str(plan.spine_link(6, 0))
+        variablestochangeleaf1["NET_SPINE2_LF_IPV6"] = str(plan.spine_link(6, 1))
+        variablestochangeleaf1["NET_LF_LF_IPV6"] = str(plan.leaf_link(6))
 
         variablestochangeleaf1["ID_LEAF"] = str(equip.get("sw"))  # lf1 ou lf2
         variablestochangeleaf1["OWN_IP_MGMT"] = equip.get("ip_mngt")
@@ -587,7 +554,7 @@ def autoprovision_coreoob(rack, equips):
         if net.ip_version == "v4":
             redev4 = IPNetwork(str(net.network))
             prefixv4 = int(net.subnet_mask)
-            subredev4 = list(redev4.subnet(prefixv4))
+            subredev4 = get_subnet(redev4, prefixv4, rack.numero)
 
     if not vlan_base:
         raise Exception("Range de Vlans do ambiente de gerencia do fabric não encontrado.")
@@ -632,8 +599,8 @@ def autoprovision_coreoob(rack, equips):
                 variablestochangecore1["HOSTNAME_RACK"] = rack.nome
                 variablestochangecore1["SO_HOSTNAME_OOB"] = "SO_" + str(rack.nome)
                 variablestochangecore1["VLAN_SO"] = vlan_so
-                variablestochangecore1['IPCORE'] = str(subredev4[rack.numero][ip])
-                variablestochangecore1['IPHSRP'] = str(subredev4[rack.numero][1])
+                variablestochangecore1['IPCORE'] = str(subredev4[ip])
+                variablestochangecore1['IPHSRP'] = str(subredev4[1])
                 variablestochangecore1['NUM_CHANNEL'] = str(BASE_CHANNEL + int(rack.numero))
                 if (1+int(rack.numero)) % 2 == 0:
                     variablestochangecore1["HSRP_PRIORITY"] = "100"
@@ -655,8 +622,8 @@ def autoprovision_coreoob(rack, equips):
                 variablestochangecore2["HOSTNAME_RACK"] = rack.nome
                 variablestochangecore2["SO_HOSTNAME_OOB"] = "SO_" + str(rack.nome)
                 variablestochangecore2["VLAN_SO"] = vlan_so
-                variablestochangecore2['IPCORE'] = str(subredev4[rack.numero][ip])
-                variablestochangecore2['IPHSRP'] = str(subredev4[rack.numero][1])
+                variablestochangecore2['IPCORE'] = str(subredev4[ip])
+                variablestochangecore2['IPHSRP'] = str(subredev4[1])
                 variablestochangecore2['NUM_CHANNEL'] = str(BASE_CHANNEL + int(rack.numero))
                 if (2+int(rack.numero)) % 2 == 0:
                     variablestochangecore2["HSRP_PRIORITY"] = "100"
@@ -31,10 +31,12 @@ from networkapi.api_vlan.facade import v3 as facade_vlan_v3
 from networkapi.equipamento.models import Equipamento, EquipamentoRoteiro, EquipamentoAmbiente, \
     EquipamentoAmbienteDuplicatedError
 from networkapi.interface.models import Interface
+from networkapi.interface.models import InterfaceLinks
 from networkapi.ip.models import IpEquipamento
 from networkapi.rack.models import Rack, Datacenter, DatacenterRooms, RackConfigError
 from networkapi.api_rack import serializers as rack_serializers
 from networkapi.api_rack import exceptions
+from networkapi.api_rack.addressing import get_subnet
 from networkapi.api_rack import provision
 from networkapi.api_rack import autoprovision
 from networkapi.system import exceptions as var_exceptions
@@ -375,14 +377,17 @@ def gerar_arquivo_config(ids):
         prefixoob = "OOB"
 
         # Interface e Roteiro
+        links = InterfaceLinks()
         for equip in equips:
             try:
-                interfaces = Interface.search(equip.get("id"))
+                interfaces = list(Interface.search(equip.get("id")))
+                sw_routers = links.search_from_host_interfaces(
+                    interfaces, InterfaceLinks.SWITCH_ROUTER)
                 equip["interfaces"] = list()
                 for interface in interfaces:
                     dic = dict()
                     try:
-                        sw = interface.get_switch_and_router_interface_from_host_interface(None)
+                        sw = sw_routers[interface.id]
                         if sw.equipamento.nome[:3] in [prefixlf, prefixoob, prefixspn]:
                             dic["nome"] = sw.equipamento.nome
                             dic["id"] = sw.equipamento.id
@@ -440,7 +445,8 @@ def _create_spnlfenv(user, rack):
             cidr = IPNetwork(net.network)
             prefix = int(net.subnet_mask)
             network = {
-                'cidr': list(cidr.subnet(prefix)),
+                'cidr': cidr,
+                'prefix': prefix,
                 'type': net.ip_version,
                 'network_type': net.id_network_type.id
             }
@@ -458,7 +464,7 @@ def _create_spnlfenv(user, rack):
             config = list()
             for sub in config_subnet:
                 config_spn = {
-                    'subnet': str(sub.get("cidr")[spn]),
+                    'subnet': str(get_subnet(sub.get("cidr"), sub.get("prefix"), spn)),
                     'new_prefix': str(31) if str(sub.get("type"))[-1] is "4" else str(127),
                     'type': str(sub.get("type")),
                     'network_type': sub.get("network_type")
@@ -522,9 +528,9 @@ def _create_spnlfvlans(rack, user):
 
         for net in env.configs:
             prefix = int(net.subnet_mask)
-            block = list(IPNetwork(net.network).subnet(int(net.subnet_mask)))
+            block = get_subnet(IPNetwork(net.network), net.subnet_mask, int(rack_number))
             network = {
-                'network': str(block[rack_number]),
+                'network': str(block),
                 'prefix': prefix,
                 'network_type': id_network_type,
                 'ip_version': str(net.ip_version)
@@ -598,9 +604,8 @@ def _create_prod_envs(rack, user):
         for net in env.configs:
             cidr = IPNetwork(str(net.network))
             prefix = int(net.subnet_mask)
-            subnet_list = list(cidr.subnet(int(prefix)))
             try:
-                bloco = subnet_list[int(rack.numero)]
+                bloco = get_subnet(cidr, prefix, int(rack.numero))
             except IndexError:
                 msg = "Rack number %d is greater than the maximum number of " \
                       "subnets available with prefix %d from %s subnet" % \
@@ -721,11 +726,11 @@ def _create_prod_vlans(rack, user):
                     initial_prefix = 20 if net.ip_version == "v4" else 56
                     prefixo = net_dict.get("mask")
                     if not idx:
-                        bloco = list(cidr.subnet(int(prefixo)))[0]
+                        bloco = get_subnet(cidr, prefixo, 0)
                         log.debug(str(bloco))
                     else:
-                        bloco1 = list(cidr.subnet(initial_prefix))[1]
-                        bloco = list(bloco1.subnet(int(prefixo)))[idx-1]
+                        bloco1 = get_subnet(cidr, initial_prefix, 1)
+                        bloco = get_subnet(bloco1, prefixo, idx-1)
                         log.debug(str(bloco))
                     network = {
                         'network': str(bloco),
@@ -788,7 +793,7 @@ def _create_lflf_envs(rack):
     for env in env_lf:
         config_subnet = []
         for net in env.configs:
-            cidr = list(IPNetwork(net.network).subnet(int(net.subnet_mask)))[rack.numero]
+            cidr = get_subnet(IPNetwork(net.network), net.subnet_mask, rack.numero)
             network = {
                 'network': str(cidr),
                 'ip_version': str(net.ip_version),
@@ -902,7 +907,7 @@ def _create_oobvlans(rack, user):
             log.debug("Configs: "+str(config))
             new_prefix = config.subnet_mask
             redev4 = IPNetwork(config.network)
-            new_v4 = list(redev4.subnet(int(new_prefix)))[int(rack.numero)]
+            new_v4 = get_subnet(redev4, new_prefix, int(rack.numero))
             oct1, oct2, oct3, var = str(new_v4).split('.')
             oct4, prefix = var.split('/')
             netmask = str(new_v4.netmask)
@@ -4,15 +4,18 @@ import ast
 import json
 import logging
 import operator
-import re
 from django.core.exceptions import ObjectDoesNotExist
 from django.forms.models import model_to_dict
 from netaddr import IPNetwork
 from networkapi.rack.models import Rack, RackConfigError
 from networkapi.ambiente import models as models_env
+from networkapi.api_rack.addressing import get_subnet
+from networkapi.api_rack.addressing import RackAddressing
 from networkapi.vlan import models as models_vlan
 from networkapi.system.facade import get_value as get_variable
 from networkapi.system import exceptions as var_exceptions
+from networkapi.util.template import get_roteiro
+from networkapi.util.template import substitute
 
 log = logging.getLogger(__name__)
 
@@ -30,27 +33,16 @@ class Provision:
 
         try:
             # Read contents from file as a single string
-            file_handle = open(filein, 'r')
-            file_string = file_handle.read()
-            file_handle.close()
+            file_string = get_roteiro(filein)
         except Exception as e:
             log.error("Erro abrindo roteiro: %s. Error: %s" % (str(filein), e))
             raise RackConfigError(None, None, "Erro abrindo roteiro: %s." % str(filein))
 
         try:
-            for key in dicionario:
-                # Use RE package to allow for replacement (also allowing for (multiline) REGEX)
-                log.debug("variavel: %s, valor: %s" % (str(key), str(dicionario[key])))
-                file_string = (re.sub(key, dicionario[key], file_string))
-        except Exception as e:
-            log.error("Erro atualizando as variáveis no roteiro: %s. Error: %s" % (filein, e))
-            raise RackConfigError(None, None, "Erro atualizando as variáveis no roteiro: %s." % filein)
-
-        try:
-            # Write contents to file.
+            # Write contents to file, replacing all variables in a single pass.
             # Using mode 'w' truncates the file.
             file_handle = open(fileout, 'w')
-            file_handle.write(file_string)
+            file_handle.writelines(substitute(file_string, dicionario))
             file_handle.close()
         except Exception as e:
             log.error("Erro salvando arquivo de configuração: %s. Error: %s" % (fileout, e))
@@ -58,8 +50,7 @@ class Provision:
 
     @staticmethod
     def split_network(net, bloco, posicao):
-        subnets = list(net.subnet(bloco))
-        return subnets[posicao]
+        return get_subnet(net, bloco, posicao)
 
     def spine_provision(self, rack, equips):
 
@@ -282,31 +273,16 @@ class Provision:
         id_vlt = [envconfig.get("VLT").get("id_vlt_lf1"), envconfig.get("VLT").get("id_vlt_lf2")]
         priority_vlt = [envconfig.get("VLT").get("priority_vlt_lf1"), envconfig.get("VLT").get("priority_vlt_lf2")]
 
-        IPSPINEipv4[numero_rack].append(CIDRBEipv4[0][0])
-        IPSPINEipv4[numero_rack].append(CIDRBEipv4[1][0])
-        IPSPINEipv4[numero_rack].append(CIDRBEipv4[2][0])
-        IPSPINEipv4[numero_rack].append(CIDRBEipv4[3][0])
-        #
-        IPLEAFipv4[numero_rack].append(CIDRBEipv4[0][1])
-        IPLEAFipv4[numero_rack].append(CIDRBEipv4[1][1])
-        IPLEAFipv4[numero_rack].append(CIDRBEipv4[2][1])
-        IPLEAFipv4[numero_rack].append(CIDRBEipv4[3][1])
-        #
-        IPSIBGPipv4[numero_rack].append(IBGPToRLxLipv4[0])
-        IPSIBGPipv4[numero_rack].append(IBGPToRLxLipv4[1])
-        #
-        IPSPINEipv6[numero_rack].append(CIDRBEipv6[0][0])
-        IPSPINEipv6[numero_rack].append(CIDRBEipv6[1][0])
-        IPSPINEipv6[numero_rack].append(CIDRBEipv6[2][0])
-        IPSPINEipv6[numero_rack].append(CIDRBEipv6[3][0])
-        #
-        IPLEAFipv6[numero_rack].append(CIDRBEipv6[0][1])
-        IPLEAFipv6[numero_rack].append(CIDRBEipv6[1][1])
-        IPLEAFipv6[numero_rack].append(CIDRBEipv6[2][1])
-        IPLEAFipv6[numero_rack].append(CIDRBEipv6[3][1])
+        plan = RackAddressing({4: CIDRBEipv4, 6: CIDRBEipv6},
+                              {4: IBGPToRLxLipv4, 6: IBGPToRLxLipv6})
+
+        IPSPINEipv4[numero_rack] = plan.spine_ips(4)
+        IPLEAFipv4[numero_rack] = plan.leaf_ips(4)
+        IPSIBGPipv4[numero_rack] = plan.ibgp_ips(4)
         #
-        IPSIBGPipv6[numero_rack].append(IBGPToRLxLipv6[0])
-        IPSIBGPipv6[numero_rack].append(IBGPToRLxLipv6[1])
+        IPSPINEipv6[numero_rack] = plan.spine_ips(6)
+        IPLEAFipv6[numero_rack] = plan.leaf_ips(6)
+        IPSIBGPipv6[numero_rack] = plan.ibgp_ips(6)
         #
         log.debug("vlan subnet")
         log.debug(vlanBE)
@@ -372,9 +348,9 @@ class Provision:
             if CIDRBOCABipv4interno:
                 variablestochangeleaf1["NET_HOST_BOCAB_IPV4"] = CIDRBOCABipv4interno
             log.debug("3")
-            variablestochangeleaf1["NET_SPINE1_LF_IPV4"] = str(CIDRBEipv4[0])
-            variablestochangeleaf1["NET_SPINE2_LF_IPV4"] = str(CIDRBEipv4[1])
-            variablestochangeleaf1["NET_LF_LF_IPV4"] = str(IBGPToRLxLipv4)
+            variablestochangeleaf1["NET_SPINE1_LF_IPV4"] = str(plan.spine_link(4, 0))
+            variablestochangeleaf1["NET_SPINE2_LF_IPV4"] = str(plan.spine_link(4, 1))
+            variablestochangeleaf1["NET_LF_LF_IPV4"] = str(plan.leaf_link(4))
 
             try:
                 variablestochangeleaf1["NET_HOST_BE_IPV6"] = CIDRBEipv6interno
@@ -389,9 +365,9 @@ class Provision:
             if CIDRBOCABipv6interno:
                 variablestochangeleaf1["NET_HOST_BOCAB_IPV6"] = CIDRBOCABipv6interno
             log.debug("4")
-            variablestochangeleaf1["NET_SPINE1_LF_IPV6"] = str(CIDRBEipv6[0])
-            variablestochangeleaf1["NET_SPINE2_LF_IPV6"] = str(CIDRBEipv6[1])
-            variablestochangeleaf1["NET_LF_LF_IPV6"] = str(IBGPToRLxLipv6)
+            variablestochangeleaf1["NET_SPINE1_LF_IPV6"] = str(plan.spine_link(6, 0))
+            variablestochangeleaf1["NET_SPINE2_LF_IPV6"] = str(plan.spine_link(6, 1))
+            variablestochangeleaf1["NET_LF_LF_IPV6"] = str(plan.leaf_link(6))
 
             variablestochangeleaf1["ID_LEAF"] = str(equip.get("sw"))  # lf1 ou lf2
             variablestochangeleaf1["OWN_IP_MGMT"] = equip.get("ip_mngt")
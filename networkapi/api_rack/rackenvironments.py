@@ -7,6 +7,7 @@ import operator
 from netaddr import IPNetwork
 from networkapi.rack.models import Rack
 from networkapi.ambiente import models as models_env
+from networkapi.api_rack.addressing import get_subnet
 from networkapi.vlan import models as models_vlan
 from networkapi.api_environment import facade as facade_env
 from networkapi.api_vlan.facade import v3 as facade_vlan_v3
@@ -71,7 +72,8 @@ class RackEnvironment:
                 cidr = IPNetwork(net.network)
                 prefix = int(net.subnet_mask)
                 network = {
-                    'cidr': list(cidr.subnet(prefix)),
+                    'cidr': cidr,
+                    'prefix': prefix,
                     'type': net.ip_version,
                     'network_type': net.id_network_type.id
                 }
@@ -89,7 +91,7 @@ class RackEnvironment:
                 config = list()
                 for sub in config_subnet:
                     config_spn = {
-                        'subnet': str(sub.get("cidr")[spn]),
+                        'subnet': str(get_subnet(sub.get("cidr"), sub.get("prefix"), spn)),
                         'new_prefix': str(31) if str(sub.get("type"))[-1] is "4" else str(127),
                         'type': str(sub.get("type")),
                         'network_type': sub.get("network_type")
@@ -241,7 +243,7 @@ class RackEnvironment:
         for env in env_lf:
             config_subnet = []
             for net in env.configs:
-                cidr = list(IPNetwork(net.network).subnet(int(net.subnet_mask)))[self.rack.numero]
+                cidr = get_subnet(IPNetwork(net.network), net.subnet_mask, self.rack.numero)
                 network = {
                     'network': str(cidr),
                     'ip_version': str(net.ip_version),
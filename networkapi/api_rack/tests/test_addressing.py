@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from netaddr import IPNetwork
+
+from networkapi.api_rack.addressing import get_subnet
+from networkapi.api_rack.addressing import RackAddressing
+
+
+class GetSubnetTestCase(unittest.TestCase):
+
+    def test_parity_with_subnet_list(self):
+        for net, prefix in [(IPNetwork('10.0.0.0/24'), 28),
+                            (IPNetwork('10.0.1.0/24'), 24),
+                            (IPNetwork('10.0.2.0/27'), 31),
+                            (IPNetwork('fd00::/120'), 124),
+                            (IPNetwork('fd00:1::/118'), 127)]:
+            subnets = list(net.subnet(prefix))
+            for index in range(-len(subnets), len(subnets)):
+                self.assertEqual(subnets[index],
+                                 get_subnet(net, prefix, index))
+
+    def test_host_bits_of_network_ignored(self):
+        self.assertEqual(IPNetwork('10.0.0.16/28'),
+                         get_subnet(IPNetwork('10.0.0.5/24'), '28', 1))
+
+    def test_out_of_range(self):
+        net = IPNetwork('10.0.0.0/24')
+
+        with self.assertRaises(IndexError):
+            get_subnet(net, 28, 16)
+        with self.assertRaises(IndexError):
+            get_subnet(net, 28, -17)
+        with self.assertRaises(IndexError):
+            get_subnet(net, 23, 0)
+        with self.assertRaises(IndexError):
+            get_subnet(net, 33, 0)
+
+    def test_large_ipv6_block(self):
+        net = IPNetwork('fd00::/48')
+
+        self.assertEqual(IPNetwork('fd00::ffff:ffff:ffff:fffe/127'),
+                         get_subnet(net, 127, 2 ** 63 - 1))
+        self.assertEqual(IPNetwork('fd00:0:0:ffff:ffff:ffff:ffff:fffe/127'),
+                         get_subnet(net, 127, -1))
+
+
+class RackAddressingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spine_blocks = {
+            4: [IPNetwork('10.10.%s.0/24' % i) for i in range(4)],
+            6: [IPNetwork('fd00:%s::/112' % i) for i in range(4)],
+        }
+        self.leaf_blocks = {4: IPNetwork('10.20.0.0/24'),
+                            6: IPNetwork('fd00:10::/112')}
+
+    def test_links(self):
+        plan = RackAddressing.from_fabric(127, self.spine_blocks,
+                                          self.leaf_blocks)
+
+        self.assertEqual(
+            {4: [IPNetwork('10.10.%s.254/31' % i) for i in range(4)],
+             6: [IPNetwork('fd00:%s::fe/127' % i) for i in range(4)]},
+            plan.spine_links)
+        self.assertEqual({4: IPNetwork('10.20.0.254/31'),
+                          6: IPNetwork('fd00:10::fe/127')},
+                         plan.leaf_links)
+
+    def test_addresses(self):
+        plan = RackAddressing.from_fabric(2, self.spine_blocks,
+                                          self.leaf_blocks)
+
+        self.assertEqual(IPNetwork('10.10.1.4/31'), plan.spine_link(4, 1))
+        self.assertEqual(['10.10.%s.4' % i for i in range(4)],
+                         [str(ip) for ip in plan.spine_ips(4)])
+        self.assertEqual(['10.10.%s.5' % i for i in range(4)],
+                         [str(ip) for ip in plan.leaf_ips(4)])
+        self.assertEqual(IPNetwork('fd00:10::4/127'), plan.leaf_link(6))
+        self.assertEqual(['fd00:10::4', 'fd00:10::5'],
+                         [str(ip) for ip in plan.ibgp_ips(6)])
+
+    def test_large_fabric(self):
+        # Fabric with IPv4 /22 and IPv6 /64 blocks for each spine
+        spine_blocks = {
+            4: [IPNetwork('10.%s.0.0/22' % i) for i in range(4)],
+            6: [IPNetwork('fd00:%s::/64' % i) for i in range(4)],
+        }
+        leaf_blocks = {4: IPNetwork('10.20.0.0/22'),
+                       6: IPNetwork('fd00:20::/64')}
+
+        plan = RackAddressing.from_fabric(448, spine_blocks, leaf_blocks)
+
+        self.assertEqual(
+            {4: [IPNetwork('10.%s.3.128/31' % i) for i in range(4)],
+             6: [IPNetwork('fd00:%s::380/127' % i) for i in range(4)]},
+            plan.spine_links)
+        self.assertEqual({4: IPNetwork('10.20.3.128/31'),
+                          6: IPNetwork('fd00:20::380/127')},
+                         plan.leaf_links)
@@ -22,7 +22,25 @@ class BasicAuthentication(BaseAuthentication):
         """
         Returns a `User` if a correct username and password have been supplied
         using HTTP Basic authentication.  Otherwise returns `None`.
+
+        The same request is authenticated by the tracking middleware, by
+        the view and by legacy resources, so the result is kept in the
+        django request and reused.
         """
+        http_request = getattr(request, '_request', request)
+
+        if not hasattr(http_request, '_basic_auth'):
+            try:
+                http_request._basic_auth = (self._authenticate(request), None)
+            except exceptions.AuthenticationFailed as error:
+                http_request._basic_auth = (None, error)
+
+        user_auth_tuple, error = http_request._basic_auth
+        if error is not None:
+            raise error
+        return user_auth_tuple
+
+    def _authenticate(self, request):
         auth = get_authorization_header(request).split()
 
         if not auth or auth[0].lower() != b'basic':
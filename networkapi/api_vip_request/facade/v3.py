@@ -28,6 +28,7 @@ from networkapi.plugins.factory import PluginFactory
 from networkapi.requisicaovips.models import OptionVip
 from networkapi.requisicaovips.models import ServerPool
 from networkapi.util import valid_expression
+from networkapi.util.fanout import fan_out
 from networkapi.util.geral import get_app
 
 
@@ -392,6 +393,34 @@ def prepare_apply(load_balance, vip, created=True, user=None):
     return load_balance
 
 
+def _apply_in_lbs(load_balance, method, *args, **kwargs):
+    """Call method of plugin in all load balancers in parallel.
+
+    :param load_balance: Dict returned by prepare_apply
+    :param method: Name of method of plugin, called with data of load
+                   balancer and args
+    :param compensate: Name of method of plugin called with data of load
+                       balancer and cleanup flag where method was done,
+                       when it fails in other load balancer
+    :return: Dict of results of method by load balancer
+    """
+
+    compensate = kwargs.get('compensate')
+
+    def call(lb, inst):
+        log.info('started call:%s' % lb)
+        result = getattr(inst.get('plugin'), method)(inst, *args)
+        log.info('ended call:%s' % lb)
+        return result
+
+    def rollback(lb, inst, result):
+        getattr(inst.get('plugin'), compensate)(inst, True)
+
+    return fan_out(
+        [(lb, copy.deepcopy(inst)) for lb, inst in load_balance.items()],
+        call, rollback if compensate else None)
+
+
 @commit_on_success
 def create_real_vip_request(vip_requests, user):
 
@@ -409,11 +438,9 @@ def create_real_vip_request(vip_requests, user):
     if len(list(set(keys))) > 1:
         raise Exception('Vips Request are in differents load balancers')
 
-    for lb in load_balance:
-        inst = copy.deepcopy(load_balance.get(lb))
-        log.info('started call:%s' % lb)
-        inst.get('plugin').create_vip(inst)
-        log.info('ended call')
+    # VIPs are removed from load balancers where they were created when
+    # other load balancer fails
+    _apply_in_lbs(load_balance, 'create_vip', compensate='delete_vip')
 
     ids = [vip_id.get('id') for vip_id in vip_requests]
 
@@ -558,11 +585,8 @@ def update_real_vip_request(vip_requests, user):
     pools_ids_ins = list()
     pools_ids_del = list()
 
-    for lb in load_balance:
-        inst = copy.deepcopy(load_balance.get(lb))
-        log.info('started call:%s' % lb)
-        pool_ins, pool_del = inst.get('plugin').update_vip(inst)
-        log.info('ended call')
+    results = _apply_in_lbs(load_balance, 'update_vip')
+    for pool_ins, pool_del in results.values():
         pools_ids_ins += pool_ins
         pools_ids_del += pool_del
 
@@ -608,11 +632,7 @@ def patch_real_vip_request(vip_requests, user):
     if len(list(set(keys))) > 1:
         raise Exception('Vips Request are in differents load balancers')
 
-    for lb in load_balance:
-        inst = copy.deepcopy(load_balance.get(lb))
-        log.info('started call:%s' % lb)
-        inst.get('plugin').partial_update_vip(inst)
-        log.info('ended call')
+    _apply_in_lbs(load_balance, 'partial_update_vip')
 
 
 @commit_on_success
@@ -634,11 +654,8 @@ def delete_real_vip_request(vip_requests, user, cleanup='0'):
 
     pools_ids = list()
 
-    for lb in load_balance:
-        inst = copy.deepcopy(load_balance.get(lb))
-        log.info('started call:%s' % lb)
-        pool_del = inst.get('plugin').delete_vip(inst, cleanup)
-        log.info('ended call')
+    results = _apply_in_lbs(load_balance, 'delete_vip', cleanup)
+    for pool_del in results.values():
         pools_ids += pool_del
 
     ids = [vip_id.get('id') for vip_id in vip_requests]
@@ -75,6 +75,7 @@ class VipRequestPortPoolV3Serializer(DynamicFieldsModelSerializer):
                         'kind': 'details'
                     },
                     'obj': 'l7_rule',
+                    'relation': 'optionvip',
                 },
             }
 
@@ -132,6 +133,7 @@ class VipRequestPortV3Serializer(DynamicFieldsModelSerializer):
                         'many': True
                     },
                     'obj': 'pools',
+                    'relation': 'viprequestportpool_set',
                 },
                 'pools__details': {
                     'serializer': VipRequestPortPoolV3Serializer,
@@ -139,7 +141,8 @@ class VipRequestPortV3Serializer(DynamicFieldsModelSerializer):
                         'many': True,
                         'kind': 'details'
                     },
-                    'obj': 'pools'
+                    'obj': 'pools',
+                    'relation': 'viprequestportpool_set'
                 },
                 'options': {
                     'keys': (
@@ -148,7 +151,8 @@ class VipRequestPortV3Serializer(DynamicFieldsModelSerializer):
                     ),
                     'kwargs': {
                     },
-                    'obj': 'optionvip_id'
+                    'obj': 'optionvip_id',
+                    'relation': 'viprequestportoptionvip_set__optionvip',
                 },
                 'options__details': {
                     'keys': (
@@ -160,6 +164,7 @@ class VipRequestPortV3Serializer(DynamicFieldsModelSerializer):
                         'kind': 'details'
                     },
                     'obj': 'optionvip',
+                    'relation': 'viprequestportoptionvip_set__optionvip',
                 },
             }
 
@@ -320,6 +325,7 @@ class VipRequestV3Serializer(DynamicFieldsModelSerializer):
                         'many': True
                     },
                     'obj': 'ports',
+                    'relation': 'viprequestport_set',
                 },
                 'ports__details': {
                     'serializer': VipRequestPortV3Serializer,
@@ -327,7 +333,8 @@ class VipRequestV3Serializer(DynamicFieldsModelSerializer):
                         'many': True,
                         'kind': 'details'
                     },
-                    'obj': 'ports'
+                    'obj': 'ports',
+                    'relation': 'viprequestport_set'
                 },
                 'groups_permissions': {
                     'serializer': ogp_slz.ObjectGroupPermissionV3Serializer,
@@ -362,7 +369,8 @@ class VipRequestV3Serializer(DynamicFieldsModelSerializer):
                     ),
                     'kwargs': {
                     },
-                    'obj': 'optionvip_id'
+                    'obj': 'optionvip_id',
+                    'relation': 'viprequestoptionvip_set__optionvip',
                 },
                 'options__details': {
                     'keys': (
@@ -376,6 +384,7 @@ class VipRequestV3Serializer(DynamicFieldsModelSerializer):
                         'kind': 'details'
                     },
                     'obj': 'optionvip',
+                    'relation': 'viprequestoptionvip_set__optionvip',
                 },
                 'equipments': {
                     'serializer': eqpt_slz.EquipmentV3Serializer,
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from django.core.management import call_command
+from django.test.client import Client
+
+from networkapi.test.test_case import NetworkApiTestCase
+log = logging.getLogger(__name__)
+
+
+def setup():
+    call_command(
+        'loaddata',
+        'networkapi/system/fixtures/initial_variables.json',
+        'networkapi/api_pools/fixtures/initial_optionspool.json',
+        'networkapi/requisicaovips/fixtures/initial_optionsvip.json',
+        'networkapi/healthcheckexpect/fixtures/initial_healthcheck.json',
+        'networkapi/usuario/fixtures/initial_usuario.json',
+        'networkapi/grupo/fixtures/initial_ugrupo.json',
+        'networkapi/usuario/fixtures/initial_usuariogrupo.json',
+        'networkapi/api_ogp/fixtures/initial_objecttype.json',
+        'networkapi/api_ogp/fixtures/initial_objectgrouppermissiongeneral.json',
+        'networkapi/grupo/fixtures/initial_permissions.json',
+        'networkapi/grupo/fixtures/initial_permissoes_administrativas.json',
+        'networkapi/api_vip_request/fixtures/initial_base_environment.json',
+        'networkapi/api_vip_request/fixtures/initial_base_pool.json',
+        'networkapi/api_vip_request/fixtures/initial_vip_request.json',
+        verbosity=0
+    )
+
+
+class VipRequestGetQueriesTestCase(NetworkApiTestCase):
+
+    """Queries of v3 list endpoints of vip requests, so nested serializers
+    do not go back to one query per object."""
+
+    def setUp(self):
+        self.client = Client()
+        # Caches filled by the first request are not counted
+        self.get_vips('/api/v3/vip-request/', 1)
+
+    def tearDown(self):
+        pass
+
+    def get_vips(self, url, end_record, **params):
+        search = {'start_record': 0, 'end_record': end_record}
+        params['search'] = json.dumps(search)
+
+        with self.capture_queries() as queries:
+            response = self.client.get(
+                url,
+                params,
+                HTTP_AUTHORIZATION=self.get_http_authorization('test'))
+
+        self.compare_status(200, response.status_code)
+
+        return len(response.data['vips']), queries.executed
+
+    def assert_queries_do_not_grow(self, url, **params):
+        vips, one_queries = self.get_vips(url, 1, **params)
+        self.assertEqual(1, vips)
+
+        vips, all_queries = self.get_vips(url, 25, **params)
+        self.assertEqual(2, vips)
+
+        self.assertEqual(
+            one_queries, all_queries,
+            '%s executed %d queries for 1 vip request and %d for 2' %
+            (url, one_queries, all_queries))
+
+    def test_list_queries(self):
+        """
+        Test that queries of list do not grow with vip requests
+        """
+        self.assert_queries_do_not_grow('/api/v3/vip-request/')
+
+    def test_list_include_queries(self):
+        """
+        Test that queries of list with nested includes do not grow with
+        vip requests
+        """
+        self.assert_queries_do_not_grow(
+            '/api/v3/vip-request/', include='ports__details__pools__details')
+
+    def test_list_details_queries(self):
+        """
+        Test number of queries of list(details)
+        """
+        # Equipments, environment and permissions of each vip request are
+        # properties of the model, loaded apart. Measured with the fixtures.
+        vips, queries = self.get_vips('/api/v3/vip-request/details/', 25)
+
+        self.assertEqual(2, vips)
+        self.assertLessEqual(queries, 44)
@@ -14,10 +14,12 @@ from networkapi.api_vip_request.serializers.v3 import VipRequestV3Serializer
 from networkapi.distributedlock import LOCK_VIP
 from networkapi.settings import SPECS
 from networkapi.util.classes import CustomAPIView
+from networkapi.util.decorators import buffer_audit_apiview
 from networkapi.util.decorators import logs_method_apiview
 from networkapi.util.decorators import permission_classes_apiview
 from networkapi.util.decorators import permission_obj_apiview
 from networkapi.util.decorators import prepare_search
+from networkapi.util.decorators import publish_batch_apiview
 from networkapi.util.geral import create_lock
 from networkapi.util.geral import destroy_lock
 from networkapi.util.geral import render_to_json
@@ -270,6 +272,8 @@ class VipRequestDBView(CustomAPIView):
     @raise_json_validate('vip_request_post')
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """
         Creates list of vip request
@@ -293,6 +297,8 @@ class VipRequestDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """
         Updates list of vip request
@@ -319,6 +325,8 @@ class VipRequestDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.delete_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """
         Deletes list of vip request
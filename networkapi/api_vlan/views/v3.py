@@ -12,10 +12,12 @@ from networkapi.api_vlan import tasks
 from networkapi.api_vlan.facade import v3 as facade
 from networkapi.settings import SPECS
 from networkapi.util.classes import CustomAPIView
+from networkapi.util.decorators import buffer_audit_apiview
 from networkapi.util.decorators import logs_method_apiview
 from networkapi.util.decorators import permission_classes_apiview
 from networkapi.util.decorators import permission_obj_apiview
 from networkapi.util.decorators import prepare_search
+from networkapi.util.decorators import publish_batch_apiview
 from networkapi.util.geral import render_to_json
 from networkapi.util.json_validate import json_validate
 from networkapi.util.json_validate import raise_json_validate
@@ -69,6 +71,8 @@ class VlanDBView(CustomAPIView):
     @raise_json_validate('vlan_post')
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def post(self, request, *args, **kwargs):
         """Creates list of vlans."""
 
@@ -88,6 +92,8 @@ class VlanDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.write_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def put(self, request, *args, **kwargs):
         """Updates list of vlans."""
 
@@ -107,6 +113,8 @@ class VlanDBView(CustomAPIView):
     @permission_classes_apiview((IsAuthenticated, permissions.Write))
     @permission_obj_apiview([permissions.delete_obj_permission])
     @commit_on_success
+    @publish_batch_apiview
+    @buffer_audit_apiview
     def delete(self, request, *args, **kwargs):
         """Deletes list of vlans."""
 
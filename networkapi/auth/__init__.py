@@ -13,19 +13,86 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
 import logging
+import os
+import time
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
 
 from networkapi.admin_permission import AdminPermission
 from networkapi.api_ogp import models
 from networkapi.equipamento.models import Equipamento
 from networkapi.grupo.models import DireitosGrupoEquipamento
 from networkapi.grupo.models import EGrupo
+from networkapi.grupo.models import GrupoError
 from networkapi.grupo.models import PermissaoAdministrativa
-from networkapi.grupo.models import PermissaoAdministrativaNotFoundError
+from networkapi.grupo.models import Permission
+from networkapi.settings import AUTH_CACHE_TIME
+from networkapi.settings import PERMISSION_CACHE_TIME
 from networkapi.usuario.models import Usuario
 
 log = logging.getLogger(__name__)
 
+# Users authenticated by this worker in the last AUTH_CACHE_TIME seconds,
+# by salted hash of credentials -> (user id, expiration)
+_credentials_cache = dict()
+_credentials_salt = os.urandom(16)
+CREDENTIALS_CACHE_SIZE = 1024
+
+
+def _credentials_key(username, password):
+    digest = hashlib.sha256(_credentials_salt)
+    for part in (username, password):
+        if isinstance(part, unicode):
+            part = part.encode('utf-8')
+        digest.update(part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _get_cached_user(key):
+    user_id, expires = _credentials_cache.get(key, (None, 0))
+    if user_id is None:
+        return None
+
+    if expires < time.time():
+        _credentials_cache.pop(key, None)
+        return None
+
+    try:
+        return Usuario.objects.prefetch_related('grupos').get(
+            id=user_id, ativo=1)
+    except ObjectDoesNotExist:
+        _credentials_cache.pop(key, None)
+        return None
+
+
+def _set_cached_user(key, user):
+    now = time.time()
+    if len(_credentials_cache) >= CREDENTIALS_CACHE_SIZE:
+        for cached_key, (user_id, expires) in _credentials_cache.items():
+            if expires < now:
+                _credentials_cache.pop(cached_key, None)
+        if len(_credentials_cache) >= CREDENTIALS_CACHE_SIZE:
+            _credentials_cache.clear()
+
+    _credentials_cache[key] = (user.id, now + AUTH_CACHE_TIME)
+
+
+def clear_credentials_cache(*args, **kwargs):
+    """Discard credentials remembered by this worker."""
+
+    _credentials_cache.clear()
+
+
+post_save.connect(clear_credentials_cache, sender=Usuario,
+                  dispatch_uid='clear_credentials_cache_save')
+post_delete.connect(clear_credentials_cache, sender=Usuario,
+                    dispatch_uid='clear_credentials_cache_delete')
+
 
 def authenticate(username, password, user_ldap=None):
     """
@@ -36,10 +103,22 @@ def authenticate(username, password, user_ldap=None):
     if username is None or password is None:
         return None
 
-    if user_ldap is None:
+    if user_ldap is not None:
+        return Usuario().get_by_ldap_user(user_ldap, True)
+
+    if not AUTH_CACHE_TIME:
         return Usuario().get_enabled_user(username, password)
+
+    key = _credentials_key(username, password)
+    user = _get_cached_user(key)
+    if user is None:
+        user = Usuario().get_enabled_user(username, password)
+        if user is not None:
+            _set_cached_user(key, user)
     else:
-        return Usuario().get_by_ldap_user(user_ldap, True)
+        log.debug(u'User %s authenticated by credentials cache', username)
+
+    return user
 
 
 def has_perm(user, perm_function, perm_oper, egroup_id=None, equip_id=None, equip_oper=None):
@@ -58,88 +137,198 @@ def has_perm(user, perm_function, perm_oper, egroup_id=None, equip_id=None, equi
     egroups = None
     if egroup_id is not None:
         egroup = EGrupo.get_by_pk(egroup_id)
-        egroups = [egroup]
+        egroups = [egroup.id]
     elif equip_id is not None:
         equip = Equipamento.get_by_pk(equip_id, 'grupos')
-        egroups = equip.grupos.all()
+        egroups = [egroup.id for egroup in equip.grupos.all()]
         if len(egroups) == 0:
             return False
 
-    ugroups = user.grupos.all()
+    ugroups = [ugroup.id for ugroup in user.grupos.all()]
+    matrix = get_permission_matrix(ugroups)
+    perm_index = 1 if perm_oper == AdminPermission.WRITE_OPERATION else 0
+
     for ugroup in ugroups:
-        try:
-            # perm = PermissaoAdministrativa().get_permission(perm_function, ugroup, perm_oper)
-            PermissaoAdministrativa().get_permission(perm_function, ugroup, perm_oper)
-            if (egroups is None) or (_has_equip_perm(ugroup, egroups, equip_oper)):
-                return True
-        except PermissaoAdministrativaNotFoundError:
+        functions, rights = matrix[ugroup]
+        if not functions.get(perm_function, (False, False))[perm_index]:
             continue
+        if (egroups is None) or (_has_equip_perm(rights, egroups, equip_oper)):
+            return True
     return False
 
 
-def _has_equip_perm(ugroup, egroups, equip_oper):
-    if len(egroups) == 0:
-        return False
+# Flags of DireitosGrupoEquipamento checked by each equipment operation,
+# other operations are allowed by any right
+EQUIP_OPERATION_INDEXES = {
+    AdminPermission.EQUIP_READ_OPERATION: 0,
+    AdminPermission.EQUIP_WRITE_OPERATION: 1,
+    AdminPermission.EQUIP_UPDATE_CONFIG_OPERATION: 2,
+}
 
-    direitos = DireitosGrupoEquipamento.search(ugroup.id, equip_oper)
-    for direito in direitos:
-        if direito.egrupo in egroups:
+
+def _has_equip_perm(rights, egroups, equip_oper):
+    index = EQUIP_OPERATION_INDEXES.get(equip_oper)
+
+    for egroup in egroups:
+        flags = rights.get(egroup)
+        if flags is not None and (index is None or flags[index]):
             return True
     return False
 
 
+# Compiled permissions of user groups kept by this worker:
+# ugroup id -> ({function: (read, write)},
+#               {egroup id: (read, write, update config)})
+_permission_matrix = {
+    'ugroups': dict(),
+    'expires': 0
+}
+
+
+def get_permission_matrix(ugroups):
+    """Return dict ugroup id -> compiled permissions of user groups ugroups.
+
+    Groups not compiled yet are loaded with one query for administrative
+    permissions and one for equipment group rights, and kept in memory for
+    PERMISSION_CACHE_TIME seconds or until some permission is changed.
+    """
+
+    if _permission_matrix['expires'] < time.time():
+        _permission_matrix['ugroups'] = dict()
+        _permission_matrix['expires'] = time.time() + PERMISSION_CACHE_TIME
+
+    compiled = _permission_matrix['ugroups']
+    missing = [ugroup for ugroup in ugroups if ugroup not in compiled]
+
+    if missing:
+        matrix = dict((ugroup, (dict(), dict())) for ugroup in missing)
+
+        try:
+            perms = list(PermissaoAdministrativa.objects.filter(
+                ugrupo__in=missing
+            ).values_list('ugrupo', 'permission__function', 'leitura',
+                          'escrita'))
+            rights = list(DireitosGrupoEquipamento.objects.filter(
+                ugrupo__in=missing
+            ).values_list('ugrupo', 'egrupo', 'leitura', 'escrita',
+                          'alterar_config'))
+        except Exception, e:
+            log.error(u'Falha ao pesquisar as permissões administrativas.')
+            raise GrupoError(
+                e, u'Falha ao pesquisar as permissões administrativas.')
+
+        for ugroup, function, read, write in perms:
+            functions = matrix[ugroup][0]
+            old_read, old_write = functions.get(function, (False, False))
+            functions[function] = (old_read or bool(read),
+                                   old_write or bool(write))
+
+        for ugroup, egroup, read, write, update_config in rights:
+            matrix[ugroup][1][egroup] = (bool(read), bool(write),
+                                         bool(update_config))
+
+        if PERMISSION_CACHE_TIME:
+            compiled.update(matrix)
+        else:
+            return matrix
+
+    return dict((ugroup, compiled[ugroup]) for ugroup in ugroups)
+
+
+def clear_permission_matrix(*args, **kwargs):
+    """Discard permissions of user groups kept by this worker."""
+
+    _permission_matrix['ugroups'] = dict()
+    _permission_matrix['expires'] = 0
+
+
+for _sender in (Permission, PermissaoAdministrativa, DireitosGrupoEquipamento):
+    post_save.connect(clear_permission_matrix, sender=_sender,
+                      dispatch_uid='clear_permission_matrix_save')
+    post_delete.connect(clear_permission_matrix, sender=_sender,
+                        dispatch_uid='clear_permission_matrix_delete')
+
+
+# Flag of ObjectGroupPermission/ObjectGroupPermissionGeneral checked by
+# each object operation
+OBJ_OPERATION_FLAGS = {
+    AdminPermission.OBJ_READ_OPERATION: 'read',
+    AdminPermission.OBJ_WRITE_OPERATION: 'write',
+    AdminPermission.OBJ_DELETE_OPERATION: 'delete',
+    AdminPermission.OBJ_UPDATE_CONFIG_OPERATION: 'change_config',
+}
+
+
 def validate_object_perm(objects_id, user, operation, object_type):
+    """Validate permission of user to objects of object_type.
+
+    General permission of user groups gives access to all objects. Otherwise
+    each object that has individual permissions needs one of them to be of
+    a user group. Individual permissions of all objects are fetched with a
+    single query.
+    """
 
-    ugroups = user.grupos.all()
+    ugroups = [ugroup.id for ugroup in user.grupos.all()]
+    flag = OBJ_OPERATION_FLAGS.get(operation)
 
     # general perms
     perms = models.ObjectGroupPermissionGeneral.objects.filter(
-        object_type__name=object_type
+        object_type__name=object_type,
+        user_group__in=ugroups
     )
-    if perms:
-        pool_perm = _validate_obj(perms, ugroups, operation)
-        if pool_perm:
-            return True
+    if flag:
+        perms = perms.filter(**{flag: True})
+    if perms.exists():
+        return True
+
+    objects_id = set(int(object_id) for object_id in objects_id)
 
     if len(objects_id) == 0:
         return False
 
-    for object_id in objects_id:
-
-        # individuals perms
-        perms = models.ObjectGroupPermission.objects.filter(
-            object_value=object_id,
-            object_type__name=object_type
-        )
-        if perms:
-            pool_perm = _validate_obj(perms, ugroups, operation)
-            if not pool_perm:
-                log.warning('User {} does not have permission {} to Object {}:{}'.format(
-                    user, operation, object_type, object_id
-                ))
-                return False
+    # individuals perms
+    perms = models.ObjectGroupPermission.objects.filter(
+        object_value__in=objects_id,
+        object_type__name=object_type
+    ).values_list('object_value', 'user_group', flag or 'id')
+
+    restricted = set()
+    allowed = set()
+    for object_id, ugroup, perm in perms:
+        restricted.add(object_id)
+        if ugroup in ugroups and perm:
+            allowed.add(object_id)
+
+    for object_id in sorted(restricted - allowed):
+        log.warning('User {} does not have permission {} to Object {}:{}'.format(
+            user, operation, object_type, object_id
+        ))
+        return False
 
     return True
 
 
-def _validate_obj(perms, ugroups, operation):
-    obj_perm = False
-
-    perms = perms.filter(user_group__in=ugroups)
-
-    if operation == AdminPermission.OBJ_READ_OPERATION:
-        perms = perms.filter(read=True)
-    elif operation == AdminPermission.OBJ_WRITE_OPERATION:
-        perms = perms.filter(write=True)
-    elif operation == AdminPermission.OBJ_DELETE_OPERATION:
-        perms = perms.filter(delete=True)
-    elif operation == AdminPermission.OBJ_UPDATE_CONFIG_OPERATION:
-        perms = perms.filter(change_config=True)
-
-    if perms:
-        obj_perm = True
+def validate_request_object_perm(request, objects_id, operation, object_type):
+    """Validate object permission of request user, only once per request for
+    the same operation, object type and objects."""
+
+    memo = getattr(request, '_object_perm_memo', None)
+    if memo is None:
+        memo = dict()
+        request._object_perm_memo = memo
+
+    objects_id = list(objects_id)
+    key = (operation, object_type,
+           tuple(sorted(set(str(object_id) for object_id in objects_id))))
+    if key not in memo:
+        memo[key] = validate_object_perm(
+            objects_id,
+            request.user,
+            operation,
+            object_type
+        )
 
-    return obj_perm
+    return memo[key]
 
 
 def perm_obj(request, operation, object_type, *args, **kwargs):
@@ -147,9 +336,9 @@ def perm_obj(request, operation, object_type, *args, **kwargs):
     obj_ids = kwargs.get('obj_ids')
     objs = obj_ids.split(';') if obj_ids is not None else []
 
-    return validate_object_perm(
+    return validate_request_object_perm(
+        request,
         objs,
-        request.user,
         operation,
         object_type
     )
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import base64
+import time
+import unittest
+
+from django.test.client import RequestFactory
+from mock import MagicMock
+from mock import patch
+from rest_framework.exceptions import AuthenticationFailed
+
+from networkapi import auth
+from networkapi.api_rest.authentication import BasicAuthentication
+from networkapi.auth import authenticate
+from networkapi.auth import clear_credentials_cache
+
+
+class CredentialsCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        clear_credentials_cache()
+        self.user = MagicMock(id=7)
+        self.enabled_user = patch(
+            'networkapi.auth.Usuario.get_enabled_user',
+            return_value=self.user).start()
+        self.objects = patch('networkapi.auth.Usuario.objects').start()
+        self.get_user = self.objects.prefetch_related.return_value.get
+        self.get_user.return_value = self.user
+
+    def tearDown(self):
+        patch.stopall()
+        clear_credentials_cache()
+
+    def test_credentials_authenticated_once(self):
+        for _ in range(3):
+            self.assertEqual(self.user, authenticate('user', 'pass'))
+        self.assertEqual(1, self.enabled_user.call_count)
+        self.get_user.assert_called_with(id=7, ativo=1)
+
+    def test_credentials_are_not_kept_in_clear(self):
+        authenticate('user', 'pass')
+        for key in auth._credentials_cache:
+            self.assertNotIn('pass', key)
+
+    def test_other_password_is_authenticated(self):
+        authenticate('user', 'pass')
+        authenticate('user', 'other')
+        self.assertEqual(2, self.enabled_user.call_count)
+
+    def test_failed_authentication_is_not_cached(self):
+        self.enabled_user.return_value = None
+        self.assertIsNone(authenticate('user', 'wrong'))
+        self.assertIsNone(authenticate('user', 'wrong'))
+        self.assertEqual(2, self.enabled_user.call_count)
+
+    def test_expired_credentials(self):
+        authenticate('user', 'pass')
+        with patch('networkapi.auth.time.time',
+                   return_value=time.time() + auth.AUTH_CACHE_TIME + 1):
+            authenticate('user', 'pass')
+        self.assertEqual(2, self.enabled_user.call_count)
+
+    def test_disabled_user(self):
+        authenticate('user', 'pass')
+        self.get_user.side_effect = auth.ObjectDoesNotExist()
+        authenticate('user', 'pass')
+        self.assertEqual(2, self.enabled_user.call_count)
+
+    def test_user_saved(self):
+        authenticate('user', 'pass')
+        clear_credentials_cache()
+        authenticate('user', 'pass')
+        self.assertEqual(2, self.enabled_user.call_count)
+
+
+class RequestAuthenticationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.user = MagicMock(ativo=True)
+        self.authenticate = patch(
+            'networkapi.api_rest.authentication.authenticate',
+            return_value=self.user).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def get_request(self, credentials):
+        return RequestFactory().get(
+            '/api/v3/vlan/',
+            HTTP_AUTHORIZATION=b'Basic ' + base64.b64encode(credentials))
+
+    def test_request_authenticated_once(self):
+        request = self.get_request(b'user:pass')
+        drf_request = MagicMock(_request=request, META=request.META)
+
+        self.assertEqual((self.user, None),
+                         BasicAuthentication().authenticate(request))
+        self.assertEqual((self.user, None),
+                         BasicAuthentication().authenticate(drf_request))
+        self.authenticate.assert_called_once_with('user', 'pass')
+
+    def test_failed_authentication_once(self):
+        self.authenticate.return_value = None
+        request = self.get_request(b'user:wrong')
+
+        for _ in range(2):
+            with self.assertRaises(AuthenticationFailed):
+                BasicAuthentication().authenticate(request)
+        self.assertEqual(1, self.authenticate.call_count)
+
+    def test_requests_without_credentials(self):
+        request = RequestFactory().get('/api/v3/vlan/')
+        self.assertIsNone(BasicAuthentication().authenticate(request))
+        self.assertFalse(self.authenticate.called)
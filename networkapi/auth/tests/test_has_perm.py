@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import MagicMock
+from mock import patch
+
+from networkapi.admin_permission import AdminPermission
+from networkapi.auth import clear_permission_matrix
+from networkapi.auth import has_perm
+
+
+READ = AdminPermission.READ_OPERATION
+WRITE = AdminPermission.WRITE_OPERATION
+EQUIP_READ = AdminPermission.EQUIP_READ_OPERATION
+EQUIP_WRITE = AdminPermission.EQUIP_WRITE_OPERATION
+EQUIP_UPDATE_CONFIG = AdminPermission.EQUIP_UPDATE_CONFIG_OPERATION
+
+
+class HasPermTestCase(unittest.TestCase):
+
+    def setUp(self):
+        clear_permission_matrix()
+
+        self.user = MagicMock()
+        self.user.grupos.all.return_value = [MagicMock(id=1), MagicMock(id=2)]
+
+        # ugroup, function, read, write
+        self.perms = [
+            (1, 'VLAN_MANAGEMENT', True, False),
+            (2, 'VLAN_MANAGEMENT', False, True),
+            (2, 'EQUIPMENT_MANAGEMENT', True, True),
+        ]
+        # ugroup, egroup, read, write, update config
+        self.rights = [
+            (2, 10, True, False, False),
+            (2, 11, True, True, True),
+            (3, 12, True, True, True),
+        ]
+        self.perm_objects = patch(
+            'networkapi.auth.PermissaoAdministrativa.objects').start()
+        self.perm_objects.filter.side_effect = lambda ugrupo__in: \
+            self.queryset(self.perms, ugrupo__in)
+        self.right_objects = patch(
+            'networkapi.auth.DireitosGrupoEquipamento.objects').start()
+        self.right_objects.filter.side_effect = lambda ugrupo__in: \
+            self.queryset(self.rights, ugrupo__in)
+
+        patch('networkapi.auth.EGrupo.get_by_pk',
+              side_effect=lambda pk: MagicMock(id=pk)).start()
+        self.equip = MagicMock()
+        patch('networkapi.auth.Equipamento.get_by_pk',
+              return_value=self.equip).start()
+
+    def tearDown(self):
+        patch.stopall()
+        clear_permission_matrix()
+
+    def queryset(self, rows, ugroups):
+        queryset = MagicMock()
+        queryset.values_list.return_value = [
+            row for row in rows if row[0] in ugroups]
+        return queryset
+
+    def test_without_user(self):
+        self.assertFalse(has_perm(None, 'VLAN_MANAGEMENT', READ))
+
+    def test_function_permission(self):
+        self.assertTrue(has_perm(self.user, 'VLAN_MANAGEMENT', READ))
+        self.assertTrue(has_perm(self.user, 'VLAN_MANAGEMENT', WRITE))
+        self.assertFalse(has_perm(self.user, 'IPS', READ))
+
+    def test_egroup_permission(self):
+        self.assertTrue(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', WRITE,
+                                 egroup_id=10, equip_oper=EQUIP_READ))
+        self.assertFalse(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', WRITE,
+                                  egroup_id=10, equip_oper=EQUIP_WRITE))
+        self.assertTrue(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', WRITE,
+                                 egroup_id=10))
+        self.assertFalse(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', WRITE,
+                                  egroup_id=12))
+        # Group 1 has function permission, but no right on egroup
+        self.assertFalse(has_perm(self.user, 'VLAN_MANAGEMENT', READ,
+                                  egroup_id=11))
+
+    def test_equipment_permission(self):
+        self.equip.grupos.all.return_value = [MagicMock(id=10),
+                                              MagicMock(id=11)]
+        self.assertTrue(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', READ,
+                                 equip_id=1, equip_oper=EQUIP_UPDATE_CONFIG))
+
+        self.equip.grupos.all.return_value = []
+        self.assertFalse(has_perm(self.user, 'EQUIPMENT_MANAGEMENT', READ,
+                                  equip_id=1, equip_oper=EQUIP_READ))
+
+    def test_permissions_loaded_once(self):
+        for _ in range(5):
+            has_perm(self.user, 'VLAN_MANAGEMENT', READ)
+            has_perm(self.user, 'EQUIPMENT_MANAGEMENT', WRITE, egroup_id=11)
+        self.assertEqual(1, self.perm_objects.filter.call_count)
+        self.assertEqual(1, self.right_objects.filter.call_count)
+
+    def test_permission_changed(self):
+        self.assertFalse(has_perm(self.user, 'IPS', READ))
+        self.perms.append((1, 'IPS', True, False))
+        clear_permission_matrix()
+        self.assertTrue(has_perm(self.user, 'IPS', READ))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import MagicMock
+from mock import patch
+
+from networkapi.admin_permission import AdminPermission
+from networkapi.auth import validate_object_perm
+from networkapi.auth import validate_request_object_perm
+
+
+READ = AdminPermission.OBJ_READ_OPERATION
+WRITE = AdminPermission.OBJ_WRITE_OPERATION
+
+
+class ObjectPermTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.user = MagicMock()
+        self.user.grupos.all.return_value = [MagicMock(id=1), MagicMock(id=2)]
+
+        general = patch('networkapi.auth.models.'
+                        'ObjectGroupPermissionGeneral.objects').start()
+        self.general = general.filter.return_value
+        self.general.filter.return_value = self.general
+        self.general.exists.return_value = False
+
+        individual = patch('networkapi.auth.models.'
+                           'ObjectGroupPermission.objects').start()
+        self.individual = individual
+        self.rows = []
+        individual.filter.side_effect = self.filter_rows
+
+    def filter_rows(self, object_value__in, object_type__name):
+        queryset = MagicMock()
+        queryset.values_list.return_value = [
+            row for row in self.rows if row[0] in object_value__in]
+        return queryset
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_general_permission(self):
+        self.general.exists.return_value = True
+        self.assertTrue(validate_object_perm([], self.user, WRITE, 'Vlan'))
+        self.general.filter.assert_called_once_with(write=True)
+        self.assertFalse(self.individual.filter.called)
+
+    def test_without_objects(self):
+        self.assertFalse(validate_object_perm([], self.user, READ, 'Vlan'))
+
+    def test_objects_without_individual_permissions(self):
+        self.assertTrue(
+            validate_object_perm(['1', '2'], self.user, READ, 'Vlan'))
+
+    def test_individual_permissions_in_one_query(self):
+        self.rows = [
+            (10, 1, True),
+            (11, 3, True),
+            (11, 2, True),
+            (12, 3, False),
+        ]
+        self.assertTrue(
+            validate_object_perm(['10', '11', '13'], self.user, READ, 'Vlan'))
+        self.assertFalse(
+            validate_object_perm(['10', '12'], self.user, READ, 'Vlan'))
+        self.assertEqual(2, self.individual.filter.call_count)
+
+        kwargs = self.individual.filter.call_args[1]
+        self.assertEqual(set([10, 12]), kwargs['object_value__in'])
+
+    def test_individual_permission_without_flag(self):
+        self.rows = [(10, 1, False)]
+        self.assertFalse(
+            validate_object_perm(['10'], self.user, WRITE, 'Vlan'))
+
+    def test_request_memo(self):
+        request = MagicMock(spec=['user'])
+        request.user = self.user
+        self.rows = [(10, 1, True)]
+
+        for objs in (['10', '11'], ['11', '10', '10'], [11, 10]):
+            self.assertTrue(
+                validate_request_object_perm(request, objs, READ, 'Vlan'))
+        self.assertEqual(1, self.individual.filter.call_count)
+
+        validate_request_object_perm(request, ['10', '11'], WRITE, 'Vlan')
+        self.assertEqual(2, self.individual.filter.call_count)
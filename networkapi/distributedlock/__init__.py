@@ -55,11 +55,19 @@ LOCK_VLAN = 'vlan:%s'
 LOCK_RACK = 'rack:%s'
 LOCK_GET_IPV4_AVAILABLE = 'Ipv4_get_available_for_vip:%s'
 LOCK_GET_IPV6_AVAILABLE = 'Ipv6_get_available_for_vip:%s'
+LOCK_ODL_NODE = 'odl_node:%s:%s'
 
 
 # Adjusts settings
+import logging
+import time
+
 from django.core.cache import cache
 from networkapi.distributedlock.memcachedlock import MemcachedLock
+from networkapi.distributedlock.mysqllock import MysqlLock
+from networkapi.settings import LOCK_BACKEND
+
+log = logging.getLogger(__name__)
 
 DEBUG = False
 DEFAULT_TIMEOUT = 1200
@@ -67,16 +75,58 @@ DEFAULT_BLOCKING = True
 DEFAULT_MEMCACHED_CLIENT = cache
 
 
-def default_lock_factory(key):
+def memcached_lock_factory(key):
     return MemcachedLock(
         key, DEFAULT_MEMCACHED_CLIENT, DEFAULT_TIMEOUT)
 
 
+def mysql_lock_factory(key):
+    return MysqlLock(key, DEFAULT_TIMEOUT)
+
+
+LOCK_FACTORIES = {
+    'memcached': memcached_lock_factory,
+    'mysql': mysql_lock_factory,
+}
+
+
+def default_lock_factory(key):
+    return LOCK_FACTORIES[LOCK_BACKEND](key)
+
+
 def _debug(msg):
     if DEBUG:
         print 'LOCK:', msg
 
 
+# Wait and hold times of locks in this process, by prefix of lock key
+lock_stats = dict()
+
+
+def _record_stats(key, name, elapsed):
+    prefix = str(key).split(':')[0]
+    stats = lock_stats.setdefault(prefix, {
+        'acquired': 0,
+        'wait_time': 0.0,
+        'max_wait_time': 0.0,
+        'released': 0,
+        'hold_time': 0.0,
+        'max_hold_time': 0.0,
+    })
+    stats['acquired' if name == 'wait' else 'released'] += 1
+    stats['%s_time' % name] += elapsed
+    stats['max_%s_time' % name] = max(stats['max_%s_time' % name], elapsed)
+
+    log.debug('Lock %s %s time: %.3fs', key, name, elapsed)
+
+
+def get_lock_stats():
+    """Return lock wait/hold times of this process by lock key prefix."""
+
+    return dict((prefix, dict(stats))
+                for prefix, stats in lock_stats.items())
+
+
 class LockNotAcquiredError(Exception):
     pass
 
@@ -109,7 +159,10 @@ class distributedlock(object):
         if not (type(self.key) == str or type(self.key) == unicode) and self.key == '':
             raise RuntimeError('Key not specified!')
 
+        start = time.time()
         if self.lock.acquire(self.blocking):
+            self.acquired_at = time.time()
+            _record_stats(self.key, 'wait', self.acquired_at - start)
             _debug('locking with key %s' % self.key)
         else:
             raise LockNotAcquiredError()
@@ -117,3 +170,53 @@ class distributedlock(object):
     def __exit__(self, type, value, traceback):
         _debug('releasing lock %s' % self.key)
         self.lock.release()
+        self._released()
+
+    def _released(self):
+        acquired_at = getattr(self, 'acquired_at', None)
+        if acquired_at is not None:
+            _record_stats(self.key, 'hold', time.time() - acquired_at)
+            self.acquired_at = None
+
+
+def acquire_locks(keys, blocking=None):
+    """Acquire a distributedlock for each key and return them.
+
+    Keys are deduplicated and acquired in sorted order, so two requests
+    locking overlapping sets of objects can not wait for each other
+    forever. If some lock can not be acquired, the ones already acquired
+    are released before raising.
+    """
+
+    locks_list = list()
+    try:
+        for key in sorted(set(keys)):
+            lock = distributedlock(key, blocking=blocking)
+            lock.__enter__()
+            locks_list.append(lock)
+    except:
+        release_locks(locks_list)
+        raise
+
+    return locks_list
+
+
+def release_locks(locks_list):
+    """Release a list of distributedlock.
+
+    Memcached locks sharing the same client are released together, with one
+    get_many and one delete_many instead of a get and a delete for each one.
+    """
+
+    memcached_locks = dict()
+    for lock in locks_list:
+        if isinstance(getattr(lock, 'lock', None), MemcachedLock):
+            memcached_locks.setdefault(lock.lock.client, []).append(lock)
+        else:
+            lock.__exit__('', '', '')
+
+    for client, locks in memcached_locks.items():
+        _debug('releasing locks %s' % [lock.key for lock in locks])
+        MemcachedLock.release_many([lock.lock for lock in locks])
+        for lock in locks:
+            lock._released()
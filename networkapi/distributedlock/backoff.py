@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+
+__all__ = ('backoff_delay',)
+
+# Seconds waited after the first failed attempt
+BACKOFF_MIN = 0.05
+# Maximum seconds waited between two attempts
+BACKOFF_MAX = 1.0
+
+
+def backoff_delay(attempt, minimum=BACKOFF_MIN, maximum=BACKOFF_MAX):
+    """Return seconds to wait before retry number attempt (starting at 0).
+
+    Delay doubles on each attempt up to maximum, and half of it is random
+    so concurrent waiters do not retry at the same time.
+    """
+
+    delay = min(maximum, minimum * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
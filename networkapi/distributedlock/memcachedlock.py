@@ -17,6 +17,8 @@ import logging
 import time
 import uuid
 
+from networkapi.distributedlock.backoff import backoff_delay
+
 log = logging.getLogger('MemcachedLock')
 
 __all__ = ('MemcachedLock',)
@@ -40,9 +42,10 @@ class MemcachedLock(object):
         self.instance_id = uuid.uuid1().hex
 
     def acquire(self, blocking=True):
+        attempt = 0
         while True:
             added = self.client.add(self.key, self.instance_id, self.timeout)
-            log.warning('Added Lock=%s,Key=%s,instance_id=%s,timeout=%s' % (
+            log.debug('Added Lock=%s,Key=%s,instance_id=%s,timeout=%s' % (
                 repr(added), self.key, self.instance_id, self.timeout))
             if added:
                 break
@@ -54,8 +57,10 @@ class MemcachedLock(object):
             if not blocking:   # and not added
                 return False
 
-            log.warning('Waiting locking for "%s"', self.key)
-            time.sleep(1)
+            delay = backoff_delay(attempt)
+            attempt += 1
+            log.debug('Waiting locking for "%s" %.3fs', self.key, delay)
+            time.sleep(delay)
         return True
 
     def release(self):
@@ -65,7 +70,28 @@ class MemcachedLock(object):
             # below can delete another lock! There is no way to solve this in
             # memcached
             self.client.delete(self.key)
-            log.warning('Removed Lock,Key=%s' % (self.key))
+            log.debug('Removed Lock,Key=%s' % (self.key))
         else:
             log.warning(
                 "I've no lock to release. Increase TIMEOUT of lock operations")
+
+    @staticmethod
+    def release_many(locks):
+        """Release MemcachedLocks sharing the same client using two calls
+        to memcached."""
+
+        if not locks:
+            return
+
+        client = locks[0].client
+        values = client.get_many([lock.key for lock in locks])
+
+        owned = [lock.key for lock in locks
+                 if values.get(lock.key) == lock.instance_id]
+        if owned:
+            client.delete_many(owned)
+            log.debug('Removed Locks,Keys=%s' % owned)
+
+        if len(owned) != len(locks):
+            log.warning(
+                "I've no lock to release. Increase TIMEOUT of lock operations")
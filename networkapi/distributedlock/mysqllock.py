@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import logging
+
+from django.db import connection
+
+log = logging.getLogger('MysqlLock')
+
+__all__ = ('MysqlLock',)
+
+# MySQL refuses lock names longer than 64 characters
+MAX_NAME_LENGTH = 64
+
+
+class MysqlLock(object):
+
+    """
+    Distributed lock using MySQL named locks (GET_LOCK/RELEASE_LOCK).
+    Waiting is done by MySQL server, so there is no polling. Locks belong to
+    the database connection of current thread, are released if it is closed
+    and more than one lock by connection needs MySQL 5.7 or later.
+    """
+
+    def __init__(self, key, timeout=600):
+        self.key = 'lock:%s' % key
+        if len(self.key) > MAX_NAME_LENGTH:
+            self.key = 'lock:%s' % hashlib.md5(self.key).hexdigest()
+        # Seconds waited by each GET_LOCK call
+        self.timeout = timeout
+
+    def _execute(self, sql, params):
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def acquire(self, blocking=True):
+        timeout = self.timeout if blocking else 0
+        while True:
+            acquired = self._execute('SELECT GET_LOCK(%s, %s)',
+                                     [self.key, timeout])
+
+            if acquired == 1:
+                return True
+
+            if acquired is None:
+                raise RuntimeError(
+                    u'Error calling mysql GET_LOCK for %s' % self.key)
+
+            if not blocking:
+                return False
+
+            log.debug('Waiting locking for "%s"', self.key)
+
+    def release(self):
+        released = self._execute('SELECT RELEASE_LOCK(%s)', [self.key])
+        if released != 1:
+            log.warning(
+                "I've no lock to release. Lock %s is not held by this "
+                "connection" % self.key)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import Mock
+from mock import patch
+
+from networkapi import distributedlock as distributedlock_module
+from networkapi.distributedlock import acquire_locks
+from networkapi.distributedlock import distributedlock
+from networkapi.distributedlock import get_lock_stats
+from networkapi.distributedlock import LockNotAcquiredError
+from networkapi.distributedlock import release_locks
+from networkapi.distributedlock.backoff import backoff_delay
+from networkapi.distributedlock.backoff import BACKOFF_MAX
+from networkapi.distributedlock.memcachedlock import MemcachedLock
+from networkapi.distributedlock.mysqllock import MysqlLock
+from networkapi.util.geral import create_lock
+from networkapi.util.geral import create_lock_with_blocking
+
+
+class BackoffTestCase(unittest.TestCase):
+
+    def test_delay_grows_until_maximum(self):
+        for attempt in range(10):
+            delay = backoff_delay(attempt, 0.1, 1.0)
+            expected = min(1.0, 0.1 * 2 ** attempt)
+            self.assertTrue(expected / 2 <= delay <= expected)
+
+        self.assertTrue(backoff_delay(50) <= BACKOFF_MAX)
+
+
+class MemcachedLockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.sleep = patch(
+            'networkapi.distributedlock.memcachedlock.time.sleep').start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_acquire_waits_with_backoff(self):
+        client = Mock()
+        client.add.side_effect = [False, False, False, True]
+
+        self.assertTrue(MemcachedLock('vlan:1', client).acquire())
+        self.assertEqual(4, client.add.call_count)
+
+        delays = [call[0][0] for call in self.sleep.call_args_list]
+        self.assertEqual(3, len(delays))
+        self.assertTrue(all(delay < 1 for delay in delays))
+
+    def test_acquire_not_blocking(self):
+        client = Mock()
+        client.add.return_value = False
+
+        self.assertFalse(MemcachedLock('vlan:1', client).acquire(False))
+        self.assertFalse(self.sleep.called)
+
+
+class MysqlLockTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_acquire_and_release(self):
+        execute = patch.object(MysqlLock, '_execute', return_value=1).start()
+        lock = MysqlLock('vlan:1', 10)
+
+        self.assertTrue(lock.acquire())
+        execute.assert_called_with('SELECT GET_LOCK(%s, %s)',
+                                   ['lock:vlan:1', 10])
+        lock.release()
+        execute.assert_called_with('SELECT RELEASE_LOCK(%s)', ['lock:vlan:1'])
+
+    def test_acquire_not_blocking(self):
+        execute = patch.object(MysqlLock, '_execute', return_value=0).start()
+
+        self.assertFalse(MysqlLock('vlan:1', 10).acquire(False))
+        execute.assert_called_once_with('SELECT GET_LOCK(%s, %s)',
+                                        ['lock:vlan:1', 0])
+
+    def test_long_key_is_hashed(self):
+        lock = MysqlLock('x' * 100)
+        self.assertTrue(len(lock.key) <= 64)
+
+
+class DistributedLockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        distributedlock_module.lock_stats.clear()
+
+    def tearDown(self):
+        patch.stopall()
+        distributedlock_module.lock_stats.clear()
+
+    def test_lock_stats_by_prefix(self):
+        for key in ('vlan:1', 'vlan:2'):
+            with distributedlock(key, lock=Mock()):
+                pass
+
+        stats = get_lock_stats()['vlan']
+        self.assertEqual(2, stats['acquired'])
+        self.assertEqual(2, stats['released'])
+
+    def test_lock_not_acquired(self):
+        lock = Mock()
+        lock.acquire.return_value = False
+
+        with self.assertRaises(LockNotAcquiredError):
+            distributedlock('vlan:1', lock=lock).__enter__()
+        self.assertEqual({}, get_lock_stats())
+
+    def test_create_lock_with_blocking_retries_all_locks(self):
+        sleep = patch('networkapi.util.geral.sleep').start()
+        locks = {'vlan:1': Mock(), 'vlan:2': Mock()}
+        locks['vlan:2'].acquire.side_effect = [False, True]
+        patch('networkapi.distributedlock.default_lock_factory',
+              side_effect=lambda key: locks[key]).start()
+
+        locks_list = create_lock_with_blocking(['vlan:1', 'vlan:2'])
+
+        self.assertEqual(['vlan:1', 'vlan:2'],
+                         [lock.key for lock in locks_list])
+        self.assertEqual(1, sleep.call_count)
+        self.assertEqual(1, locks['vlan:1'].release.call_count)
+
+
+class FakeMemcached(object):
+
+    def __init__(self):
+        self.data = dict()
+        self.calls = list()
+
+    def add(self, key, value, timeout=0):
+        self.calls.append('add')
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    def get_many(self, keys):
+        self.calls.append('get_many')
+        return dict((key, self.data[key]) for key in keys if key in self.data)
+
+    def delete_many(self, keys):
+        self.calls.append('delete_many')
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class MultiLockTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeMemcached()
+        patch('networkapi.distributedlock.DEFAULT_MEMCACHED_CLIENT',
+              self.client).start()
+        patch('networkapi.distributedlock.LOCK_BACKEND', 'memcached').start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_create_lock_sorts_and_deduplicates_keys(self):
+        locks_list = create_lock([3, {'id': 1}, 2, 3], 'pool:%s')
+
+        self.assertEqual(['pool:1', 'pool:2', 'pool:3'],
+                         [lock.key for lock in locks_list])
+        self.assertEqual(3, len(self.client.data))
+
+    def test_release_locks_in_bulk(self):
+        locks_list = acquire_locks(['pool:%s' % i for i in range(100)])
+        del self.client.calls[:]
+
+        release_locks(locks_list)
+
+        self.assertEqual(['get_many', 'delete_many'], self.client.calls)
+        self.assertEqual({}, self.client.data)
+
+    def test_release_acquired_locks_on_failure(self):
+        self.client.data['lock:pool:3'] = 'other'
+
+        with self.assertRaises(LockNotAcquiredError):
+            acquire_locks(['pool:3', 'pool:1', 'pool:2'], blocking=False)
+
+        self.assertEqual({'lock:pool:3': 'other'}, self.client.data)
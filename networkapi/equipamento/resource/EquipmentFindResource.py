@@ -32,7 +32,7 @@ from networkapi.exception import InvalidValueError
 from networkapi.grupo.models import GrupoError
 from networkapi.infrastructure.datatable import build_query_to_datatable
 from networkapi.infrastructure.ipaddr import IPAddress
-from networkapi.infrastructure.xml_utils import dumps_networkapi
+from networkapi.infrastructure.xml_utils import iter_dumps_networkapi
 from networkapi.infrastructure.xml_utils import loads
 from networkapi.ip.models import Ip
 from networkapi.ip.models import Ipv6
@@ -363,7 +363,8 @@ class EquipmentFindResource(RestResource):
             equipment_map['equipamento'] = itens
             equipment_map['total'] = total
             logging.debug("17")
-            return self.response(dumps_networkapi(equipment_map))
+            return self.stream_response(
+                iter_dumps_networkapi(equipment_map))
 
         except InvalidValueError, e:
             self.log.error(
@@ -74,9 +74,9 @@ class EventLog(models.Model):
         managed = True
 
     @classmethod
-    def log(cls, usuario, evento):
+    def build(cls, usuario, evento):
         """
-        saves the eventlog in the database
+        returns the unsaved eventlog of an event
         @params
         usuario: Usuario object
         evento: dict in the form
@@ -100,27 +100,55 @@ class EventLog(models.Model):
             for key in evento['parametro_atual']]
         parametro_atual = u'\n'.join(parametro_atual)
 
+        functionality = Functionality()
+        event_log = EventLog()
+        event_log.usuario = usuario
+        event_log.hora_evento = datetime.now()
+        event_log.acao = evento['acao']
+        event_log.funcionalidade = functionality.exist(
+            evento['funcionalidade'])
+        event_log.parametro_anterior = parametro_anterior
+        event_log.parametro_atual = parametro_atual
+        event_log.id_objeto = evento['id_objeto']
+        event_log.audit_request = evento['audit_request']
+        event_log.evento = ''
+        event_log.resultado = 0
+        return event_log
+
+    @classmethod
+    def log(cls, usuario, evento):
+        """
+        saves the eventlog in the database
+        @params
+        usuario: Usuario object
+        evento: dict in the form of EventLog.build
+        """
+
         try:
-            functionality = Functionality()
-            event_log = EventLog()
-            event_log.usuario = usuario
-            event_log.hora_evento = datetime.now()
-            event_log.acao = evento['acao']
-            event_log.funcionalidade = functionality.exist(
-                evento['funcionalidade'])
-            event_log.parametro_anterior = parametro_anterior
-            event_log.parametro_atual = parametro_atual
-            event_log.id_objeto = evento['id_objeto']
-            event_log.audit_request = evento['audit_request']
-            event_log.evento = ''
-            event_log.resultado = 0
-            event_log.save()
+            cls.build(usuario, evento).save()
         except Exception, e:
             cls.logger.error(
                 u'Falha ao salvar o log: evento = %s, id do usuario = %s.' % (evento, usuario))
             raise EventLogError(
                 e, u'Falha ao salvar o log: evento = %s, id do usuario = %s.' % (evento, usuario))
 
+    @classmethod
+    def log_many(cls, events):
+        """
+        saves eventlogs in the database with a single insert
+        @params
+        events: list of (usuario, evento) in the form of EventLog.build
+        """
+
+        try:
+            EventLog.objects.bulk_create(
+                [cls.build(usuario, evento) for usuario, evento in events])
+        except Exception, e:
+            cls.logger.error(
+                u'Falha ao salvar os logs: %s eventos.' % len(events))
+            raise EventLogError(
+                e, u'Falha ao salvar os logs: %s eventos.' % len(events))
+
 
 class EventLogQueue(object):
 
@@ -128,9 +156,11 @@ class EventLogQueue(object):
     def log(cls, usuario, evento):
         """Send the eventlog to queues"""
 
-        usuario_id = 'NoUser'
-        if usuario:
-            usuario_id = usuario.id
+        cls.log_many([(usuario, evento)])
+
+    @classmethod
+    def log_many(cls, events):
+        """Send eventlogs to queues in a single connection"""
 
         # Send to Queue
         queue_manager = QueueManager(
@@ -139,17 +169,23 @@ class EventLogQueue(object):
             routing_key='eventslog'
         )
 
-        queue_manager.append({
-            'action': evento['acao'],
-            'kind': evento['funcionalidade'],
-            'timestamp': int(time()),
-            'data': {
-                'id_object': evento['id_objeto'],
-                'user': usuario_id,
-                'old_value': evento['parametro_anterior'],
-                'new_value': evento['parametro_atual']
-            }
-        })
+        for usuario, evento in events:
+            usuario_id = 'NoUser'
+            if usuario:
+                usuario_id = usuario.id
+
+            queue_manager.append({
+                'action': evento['acao'],
+                'kind': evento['funcionalidade'],
+                'timestamp': int(time()),
+                'data': {
+                    'id_object': evento['id_objeto'],
+                    'user': usuario_id,
+                    'old_value': evento['parametro_anterior'],
+                    'new_value': evento['parametro_atual']
+                }
+            })
+
         queue_manager.send()
 
 
@@ -250,13 +286,19 @@ class Functionality(models.Model):
     class Meta:
         db_table = u'functionality'
 
+    # Functionalities known to exist, so each one is looked up once by worker
+    known = set()
+
     @classmethod
     def exist(cls, event_functionality):
-        func = Functionality.objects.filter(nome=event_functionality)
-        if func.exists():
+        if event_functionality in Functionality.known:
             return event_functionality
-        else:
+
+        func = Functionality.objects.filter(nome=event_functionality)
+        if not func.exists():
             functionality = Functionality()
             functionality.nome = event_functionality
             functionality.save()
-            return event_functionality
+
+        Functionality.known.add(event_functionality)
+        return event_functionality
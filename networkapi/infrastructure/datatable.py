@@ -13,15 +13,126 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from django.core.exceptions import FieldError
 from django.db.models import Q
+from django.db.models.fields import FieldDoesNotExist
+
+COUNT_EXACT = 'exact'
+COUNT_APPROXIMATE = 'approximate'
+COUNT_NONE = 'none'
+
+# Records counted at most when total is approximate
+APPROXIMATE_COUNT_LIMIT = 10000
 
 
 def build_query_to_datatable(query_set, asorting_cols, custom_search,
-                             searchable_columns, start_record, end_record):
+                             searchable_columns, start_record, end_record,
+                             distinct=True, count=COUNT_EXACT):
     """
     Build query using params received
     """
 
+    query_set = _order_and_filter(query_set, asorting_cols, custom_search,
+                                  searchable_columns)
+
+    if distinct:
+        query_set = query_set.distinct()
+
+    total = count_query(query_set, count)
+    # Slice pages
+    query_set = query_set[start_record:end_record]
+
+    # Return data paginated and total of records
+    return query_set, total
+
+
+def build_query_to_datatable_keyset(query_set, asorting_cols, custom_search,
+                                    searchable_columns, cursor, page_size,
+                                    distinct=True, count=COUNT_EXACT):
+    """
+    Build query paginated by the values of the ordering columns of the last
+    record of the previous page (keyset) instead of OFFSET, so every page
+    costs the same whatever its depth.
+
+    pk is added to the ordering columns so the ordering is total. NULL
+    values are taken as lower than any other, as sorted by MySQL.
+
+    :param cursor: Values returned as next_cursor by the previous page or
+        empty list to the first page
+    :return: Data paginated, total of records and cursor of next page, None
+        in the last page
+    """
+
+    query_set = _order_and_filter(query_set, asorting_cols, custom_search,
+                                  searchable_columns)
+
+    query = query_set.query
+    columns = list(query.order_by or
+                   (query.default_ordering and query.model._meta.ordering))
+    if not [column for column in columns
+            if column.lstrip('-') in ('pk', query_set.model._meta.pk.name)]:
+        # Same direction of last column, so an index can be used
+        columns.append('-pk' if columns and columns[-1].startswith('-')
+                       else 'pk')
+    query_set = query_set.order_by(*columns)
+
+    if distinct:
+        query_set = query_set.distinct()
+
+    total = count_query(query_set, count)
+
+    if page_size <= 0:
+        return query_set.none(), total, None
+
+    if cursor:
+        if len(cursor) != len(columns):
+            raise FieldError(
+                'Cursor must have one value for each column of %s.' % columns)
+        cursor_q = _keyset_q(query_set.model, columns, cursor)
+        query_set = query_set.filter(cursor_q) if cursor_q \
+            else query_set.none()
+
+    # Last record of page and first of next one
+    fields = [column.lstrip('-') for column in columns]
+    rows = list(query_set.values_list(*fields)[page_size - 1:page_size + 1])
+    next_cursor = None
+    if len(rows) == 2:
+        next_cursor = [_cursor_value(value) for value in rows[0]]
+
+    return query_set[:page_size], total, next_cursor
+
+
+def needs_distinct(model, lookups):
+    """
+    Return if any lookup spans a relation that may return many rows for
+    each object, duplicating it
+    """
+
+    return any(_resolve_lookup(model, lookup)[0] for lookup in lookups)
+
+
+def count_query(query_set, count=COUNT_EXACT):
+    """
+    Count records of query
+
+    :param count: COUNT_EXACT, COUNT_APPROXIMATE to stop counting at
+        APPROXIMATE_COUNT_LIMIT records or COUNT_NONE to not count
+    """
+
+    if count == COUNT_NONE:
+        return None
+
+    if count == COUNT_APPROXIMATE:
+        # count() ignores slicing, so pks are fetched until limit is reached
+        return len(query_set.order_by().values_list('pk', flat=True)[
+            :APPROXIMATE_COUNT_LIMIT])
+
+    return query_set.count()
+
+
+def _order_and_filter(query_set, asorting_cols, custom_search,
+                      searchable_columns):
+
     if asorting_cols is not None and len(asorting_cols) > 0:
         # Ordering data
         query_set = query_set.order_by(*asorting_cols)
@@ -37,14 +148,85 @@ def build_query_to_datatable(query_set, asorting_cols, custom_search,
             output_q = output_q | Q(**kwargz) if output_q else Q(**kwargz)
         query_set = query_set.filter(output_q)
 
-    query_set = query_set.distinct()
+    return query_set
 
-    total = query_set.count()
-    # Slice pages
-    query_set = query_set[start_record:end_record]
 
-    # Return data paginated and total of records
-    return query_set, total
+def _keyset_q(model, columns, cursor):
+    """
+    Build filter of records after cursor in ordering of columns, None if
+    there is no record after it
+    """
+
+    output_q = None
+    equal_kwargz = dict()
+    for column, value in zip(columns, cursor):
+        field = column.lstrip('-')
+        descending = column.startswith('-')
+
+        after_q = None
+        if value is None:
+            if not descending:
+                after_q = Q(**{field + "__isnull": False})
+        elif descending:
+            after_q = Q(**{field + "__lt": value})
+            if _resolve_lookup(model, field)[1]:
+                after_q = after_q | Q(**{field + "__isnull": True})
+        else:
+            after_q = Q(**{field + "__gt": value})
+
+        if after_q is not None:
+            if equal_kwargz:
+                after_q = Q(**equal_kwargz) & after_q
+            output_q = output_q | after_q if output_q else after_q
+
+        equal_kwargz[field] = value
+
+    return output_q
+
+
+def _resolve_lookup(model, lookup):
+    """
+    Return if lookup spans a relation that may return many rows for each
+    object and if its value may be NULL
+    """
+
+    many = False
+    null = False
+    opts = model._meta
+    for name in lookup.split('__'):
+        if opts is None:
+            break
+        if name == 'pk':
+            name = opts.pk.name
+        try:
+            field, _, direct, m2m = opts.get_field_by_name(name)
+        except FieldDoesNotExist:
+            # Lookup type, like icontains
+            break
+
+        if m2m:
+            many = null = True
+            opts = (field.rel.to if direct else field.model)._meta
+        elif not direct:
+            many = many or not field.field.unique
+            null = True
+            opts = field.model._meta
+        else:
+            null = null or field.null
+            opts = field.rel.to._meta if field.rel else None
+
+    return many, null
+
+
+def _cursor_value(value):
+    """
+    Keep values of cursor serializable in search
+    """
+
+    if value is None or isinstance(value, (bool, int, long, float,
+                                           basestring)):
+        return value
+    return unicode(value)
 
 
 def build_query_to_datatable_v3(query_set, search={}):
@@ -58,7 +240,15 @@ def build_query_to_datatable_v3(query_set, search={}):
     :param search.searchable_columns: List of fields used in "generic search"
     :param search.start_record: Value used in initial "limit"
     :param search.end_record: Value used in final "limit
+    :param search.count: COUNT_EXACT(default), COUNT_APPROXIMATE or
+        COUNT_NONE to return total as None
+    :param search.cursor: Enable keyset pagination, receives empty list in
+        first search and next_cursor in next ones. Size of page is
+        end_record minus start_record
     :return obj_map.total: Total objects returned
+    :return obj_map.next_cursor: Values of ordering columns of the last
+        record, None in the last page. Only returned when search.cursor
+        is sent
     :return obj_map.next_search: Copy of search
     :return obj_map.next_search.start_record: Value to use in initial "limit"
         in next search(add 25)
@@ -68,6 +258,8 @@ def build_query_to_datatable_v3(query_set, search={}):
         in prev search(remove 25 of value received)
     :return obj_map.prev_search.end_record: Value to use in final "limit"
         in prev search(remove 25 of value received)
+    :return obj_map.next_search.cursor: next_cursor, next_search is None in
+        the last page and prev_search is always None with keyset pagination
     """
 
     if search.get('extends_search'):
@@ -81,6 +273,20 @@ def build_query_to_datatable_v3(query_set, search={}):
     search_query["searchable_columns"] = search.get("searchable_columns") or []
     search_query["start_record"] = search.get("start_record") or 0
     search_query["end_record"] = search.get("end_record") or 25
+    if search.get("count"):
+        search_query["count"] = search.get("count")
+    if search.get("cursor") is not None:
+        search_query["cursor"] = search.get("cursor")
+
+    # Joins of reverse and many to many relations duplicate objects
+    lookups = [key for item in search_query["extends_search"] for key in item]
+    lookups += [col.lstrip('-') for col in search_query["asorting_cols"]]
+    if search_query["custom_search"] is not None:
+        lookups += search_query["searchable_columns"]
+    distinct = needs_distinct(query_set.model, lookups)
+
+    if "cursor" in search_query:
+        return _build_keyset_map(query_set, search_query, distinct)
 
     query_set, total = build_query_to_datatable(
         query_set,
@@ -88,7 +294,9 @@ def build_query_to_datatable_v3(query_set, search={}):
         search_query["custom_search"],
         search_query["searchable_columns"],
         search_query["start_record"],
-        search_query["end_record"]
+        search_query["end_record"],
+        distinct,
+        search_query.get("count", COUNT_EXACT)
     )
 
     obj_map = dict()
@@ -109,3 +317,35 @@ def build_query_to_datatable_v3(query_set, search={}):
         obj_map["prev_search"]["end_record"] = f if f >= 0 else 25
 
     return obj_map
+
+
+def _build_keyset_map(query_set, search_query, distinct):
+
+    page_size = search_query["end_record"] - search_query["start_record"]
+
+    query_set, total, next_cursor = build_query_to_datatable_keyset(
+        query_set,
+        search_query["asorting_cols"],
+        search_query["custom_search"],
+        search_query["searchable_columns"],
+        search_query["cursor"],
+        page_size,
+        distinct,
+        search_query.get("count", COUNT_EXACT)
+    )
+
+    obj_map = dict()
+    obj_map['query_set'] = query_set
+    obj_map["total"] = total
+    obj_map["next_cursor"] = next_cursor
+
+    obj_map["next_search"] = None
+    if next_cursor is not None:
+        obj_map["next_search"] = search_query.copy()
+        obj_map["next_search"]["cursor"] = next_cursor
+        obj_map["next_search"]["start_record"] += page_size
+        obj_map["next_search"]["end_record"] += page_size
+
+    obj_map["prev_search"] = None
+
+    return obj_map
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from django.core.exceptions import FieldError
+from django.test.client import Client
+
+from networkapi.ambiente.models import Ambiente
+from networkapi.infrastructure.datatable import build_query_to_datatable_v3
+from networkapi.infrastructure.datatable import needs_distinct
+from networkapi.test.test_case import NetworkApiTestCase
+from networkapi.vlan.models import Vlan
+
+
+class NeedsDistinctTestCase(unittest.TestCase):
+
+    def test_single_valued_lookups(self):
+        self.assertFalse(needs_distinct(Vlan, [
+            'id', 'pk', 'nome__icontains', 'ambiente__divisao_dc__nome',
+            'ambiente', 'vrf']))
+
+    def test_multi_valued_lookups(self):
+        self.assertTrue(needs_distinct(Vlan, ['nome', 'networkipv4__oct1']))
+        self.assertTrue(needs_distinct(Ambiente, ['vlan__nome']))
+
+
+class KeysetPaginationTestCase(NetworkApiTestCase):
+
+    fixtures = [
+        'networkapi/system/fixtures/initial_variables.json',
+        'networkapi/usuario/fixtures/initial_usuario.json',
+        'networkapi/grupo/fixtures/initial_ugrupo.json',
+        'networkapi/usuario/fixtures/initial_usuariogrupo.json',
+        'networkapi/api_ogp/fixtures/initial_objecttype.json',
+        'networkapi/api_ogp/fixtures/initial_objectgrouppermissiongeneral.json',
+        'networkapi/grupo/fixtures/initial_permissions.json',
+        'networkapi/grupo/fixtures/initial_permissoes_administrativas.json',
+        'networkapi/requisicaovips/fixtures/initial_optionsvip.json',
+        'networkapi/api_vlan/fixtures/initial_base.json',
+    ]
+
+    def setUp(self):
+        self.client = Client()
+
+    def crawl(self, search):
+        ids = []
+        search = dict(search, cursor=[])
+        while search is not None:
+            obj_map = build_query_to_datatable_v3(Vlan.objects.all(), search)
+            ids += [vlan.id for vlan in obj_map['query_set']]
+            self.assertIsNone(obj_map['prev_search'])
+            search = obj_map['next_search']
+        return ids
+
+    def test_crawl_same_records_of_offset(self):
+        searches = [
+            {},
+            {'asorting_cols': ['num_vlan']},
+            {'asorting_cols': ['-num_vlan', 'nome']},
+            {'asorting_cols': ['ambiente__divisao_dc__nome', '-id']},
+            {'custom_search': 'RACK', 'searchable_columns': ['nome']},
+            {'extends_search': [{'networkipv4__oct1': 192},
+                                {'num_vlan': 2}]},
+        ]
+
+        for search in searches:
+            for page_size in (1, 2, 3, 25):
+                search = dict(search, start_record=0, end_record=page_size)
+                asorting_cols = search.get('asorting_cols') or ['-id']
+                if 'id' not in [col.lstrip('-') for col in asorting_cols]:
+                    asorting_cols = asorting_cols + ['id']
+
+                offset_map = build_query_to_datatable_v3(
+                    Vlan.objects.all(),
+                    dict(search, asorting_cols=asorting_cols, end_record=25))
+
+                self.assertEqual(
+                    [vlan.id for vlan in offset_map['query_set']],
+                    self.crawl(search))
+
+    def test_next_search(self):
+        search = {'asorting_cols': ['num_vlan'], 'start_record': 0,
+                  'end_record': 3, 'cursor': []}
+
+        obj_map = build_query_to_datatable_v3(Vlan.objects.all(), search)
+
+        self.assertEqual(4, obj_map['total'])
+        self.assertEqual([2, 3], obj_map['next_cursor'])
+        self.assertEqual([2, 3], obj_map['next_search']['cursor'])
+        self.assertEqual(3, obj_map['next_search']['start_record'])
+        self.assertEqual(6, obj_map['next_search']['end_record'])
+
+        obj_map = build_query_to_datatable_v3(
+            Vlan.objects.all(), obj_map['next_search'])
+
+        self.assertEqual([4], [vlan.id for vlan in obj_map['query_set']])
+        self.assertIsNone(obj_map['next_cursor'])
+        self.assertIsNone(obj_map['next_search'])
+
+    def test_count(self):
+        search = {'extends_search': [{'networkipv4__oct1': 192},
+                                     {'num_vlan': 2}]}
+
+        totals = [build_query_to_datatable_v3(
+            Vlan.objects.all(), dict(search, count=count))['total']
+            for count in ('exact', 'approximate', 'none')]
+
+        self.assertEqual([4, 4, None], totals)
+
+    def test_distinct_only_with_multi_valued_joins(self):
+        query_set = build_query_to_datatable_v3(
+            Vlan.objects.all(), {'extends_search': [{'num_vlan': 2}]}
+        )['query_set']
+        self.assertFalse(query_set.query.distinct)
+
+        query_set = build_query_to_datatable_v3(
+            Vlan.objects.all(),
+            {'extends_search': [{'networkipv4__oct1': 192}]}
+        )['query_set']
+        self.assertTrue(query_set.query.distinct)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(FieldError):
+            build_query_to_datatable_v3(
+                Vlan.objects.all(), {'asorting_cols': ['nome'],
+                                     'cursor': [1]})
+
+    def test_get_vlans_with_cursor(self):
+        search = {'asorting_cols': ['-id'], 'start_record': 0,
+                  'end_record': 2, 'cursor': [], 'count': 'none'}
+
+        response = self.client.get(
+            '/api/v3/vlan/?search=%s' % json.dumps(search),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.get_http_authorization('test'))
+
+        self.compare_status(200, response.status_code)
+        self.assertEqual([4, 3],
+                         [vlan['id'] for vlan in response.data['vlans']])
+        self.assertIsNone(response.data['total'])
+        self.assertEqual([3], response.data['next_cursor'])
+        self.assertEqual([3], response.data['next_search']['cursor'])
+        self.assertIsNone(response.data['prev_search'])
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import unittest
+from StringIO import StringIO
+
+from networkapi.infrastructure.xml_utils import dumps
+from networkapi.infrastructure.xml_utils import dumps_networkapi
+from networkapi.infrastructure.xml_utils import iter_dumps
+from networkapi.infrastructure.xml_utils import loads
+from networkapi.infrastructure.xml_utils import XMLError
+
+HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+
+
+def vlans_map(count):
+    """Map of a large VlanFindResource response."""
+
+    vlans = []
+    for i in range(count):
+        vlans.append({
+            'id': i,
+            'nome': u'VLAN_%s_ação & <teste>' % i,
+            'num_vlan': i % 4094 + 1,
+            'ambiente': {'id': i % 50, 'nome': u'DC-%s' % (i % 50)},
+            'ativada': i % 2 == 0,
+            'descricao': None,
+            'redeipv4': [{'id': i, 'oct1': 10, 'oct2': i % 256,
+                          'block': 24, 'network_type': 'valido 100%'}],
+            'redeipv6': [],
+        })
+    return {'vlan': vlans, 'total': count}
+
+
+class DumpsTestCase(unittest.TestCase):
+
+    def test_dumps(self):
+        cases = [
+            (None, '<networkapi versao="1.0"/>'),
+            ({}, '<networkapi versao="1.0"/>'),
+            ({'x': None}, '<networkapi versao="1.0"><x/></networkapi>'),
+            ({'x': ''}, '<networkapi versao="1.0"><x></x></networkapi>'),
+            ({'x': []}, '<networkapi versao="1.0"><x></x></networkapi>'),
+            ({'x': {}}, '<networkapi versao="1.0"><x/></networkapi>'),
+            ({'x': [None, '', {}, {'y': 1}, [1, 2]]},
+             '<networkapi versao="1.0"><x/><x></x><x/><x><y>1</y></x>'
+             '<x>[1, 2]</x></networkapi>'),
+            ({'x': (2, 6)},
+             '<networkapi versao="1.0"><x>(2, 6)</x></networkapi>'),
+            ({'y': 1.5}, '<networkapi versao="1.0"><y>1.5</y></networkapi>'),
+            ({'z': u'ação'},
+             '<networkapi versao="1.0"><z>a\xc3\xa7\xc3\xa3o</z>'
+             '</networkapi>'),
+            ({'w': 'a%b"c'},
+             '<networkapi versao="1.0"><w>a%%b&quot;c</w></networkapi>'),
+            ({'a': {'b': {'c': ['1', '2']}}},
+             '<networkapi versao="1.0"><a><b><c>1</c><c>2</c></b></a>'
+             '</networkapi>'),
+            ({'d': u'<&>'},
+             '<networkapi versao="1.0"><d>&lt;&amp;&gt;</d></networkapi>'),
+        ]
+
+        for map, xml in cases:
+            self.assertEqual(HEADER + xml, dumps_networkapi(map))
+        self.assertEqual(
+            HEADER + '<root a="" b="&quot;&amp;"><a>1</a></root>',
+            dumps({'a': 1}, 'root', {'b': '"&', 'a': ''}))
+        self.assertEqual(HEADER + '<root><a>1</a></root>',
+                         dumps({'a': 1}, 'root'))
+
+    def test_iter_dumps_chunks(self):
+        map = vlans_map(200)
+
+        chunks = list(iter_dumps(map, 'networkapi', {'versao': '1.0'},
+                                 chunk_size=1024))
+
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(dumps_networkapi(map), ''.join(chunks))
+
+
+class LoadsTestCase(unittest.TestCase):
+
+    def test_loads(self):
+        cases = [
+            ('<teste/>', None, ({u'teste': None}, {})),
+            ('<?xml version="1.0" encoding="UTF-8"?><networkapi versao="1.0">'
+             '<!--Comentario--><ambiente><id><!--Comentario--></id></ambiente>'
+             '<ambiente><id>3<teste>geovana</teste>2</id></ambiente>'
+             '</networkapi>', None,
+             ({u'networkapi': {u'ambiente': [
+                 {u'id': None},
+                 {u'id': [u'3', u'2', {u'teste': u'geovana'}]}]}},
+              {u'versao': u'1.0'})),
+            ('<networkapi versao="1.0"><a> 1 %% 2 </a><a/><a>3</a>'
+             '<b>x<![CDATA[<y>]]>z<!--c-->w<?pi data?>v</b>'
+             '<c><![CDATA[1]]><![CDATA[2]]></c><d>&amp;&#233;</d>'
+             '<e> <![CDATA[]]>%%</e></networkapi>', None,
+             ({u'networkapi': {u'a': [u' 1 % 2 ', u'3'],
+                               u'b': [u'x', u'<y>', u'z', u'w', u'v'],
+                               u'c': [u'1', u'2'],
+                               u'd': u'&\xe9',
+                               u'e': u' %'}},
+              {u'versao': u'1.0'})),
+            ('<networkapi><a/><a>1</a><b><c/></b></networkapi>',
+             ['a', 'b', 'c'],
+             ({u'networkapi': {u'a': [u'1'], u'b': [{u'c': []}]}}, {})),
+            (u'<networkapi><a>ação</a></networkapi>', None,
+             ({u'networkapi': {u'a': u'ação'}}, {})),
+        ]
+
+        for xml, force_list, expected in cases:
+            self.assertEqual(expected, loads(xml, force_list))
+
+    def test_dumps_and_loads(self):
+        map = vlans_map(2)
+        map['vlan'][0]['redeipv6'] = ['']
+
+        xml_map, attrs_map = loads(dumps_networkapi(map), ['redeipv4'])
+
+        self.assertEqual({u'versao': u'1.0'}, attrs_map)
+        self.assertEqual(u'2', xml_map['networkapi']['total'])
+        vlan = xml_map['networkapi']['vlan'][1]
+        self.assertEqual(u'VLAN_1_ação & <teste>', vlan['nome'])
+        self.assertEqual(u'False', vlan['ativada'])
+        self.assertEqual(None, vlan['descricao'])
+        self.assertEqual([{u'id': u'1', u'oct1': u'10', u'oct2': u'1',
+                           u'block': u'24', u'network_type': u'valido 100%'}],
+                         vlan['redeipv4'])
+        self.assertEqual(None, vlan['redeipv6'])
+
+    def test_file(self):
+        xml = dumps_networkapi(vlans_map(20))
+
+        self.assertEqual(loads(xml), loads(StringIO(xml)))
+
+    def test_invalid_xml(self):
+        for xml in ['', '<a>', '<a></b>', None, '<a/><b/>']:
+            with self.assertRaises(XMLError):
+                loads(xml)
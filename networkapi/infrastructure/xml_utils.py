@@ -13,9 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from xml.dom import InvalidCharacterErr
 from xml.dom.minicompat import StringTypes
-from xml.dom.minidom import *
+from xml.parsers.expat import ParserCreate
+
+# Tamanho mínimo, em caracteres, de cada parte do XML gerada por iter_dumps
+CHUNK_SIZE = 64 * 1024
 
 
 class XMLError(Exception):
@@ -48,7 +50,12 @@ class InvalidNodeTypeXMLError(XMLError):
         XMLError.__init__(self, cause, message)
 
 
-def _add_text_node(value, node, doc):
+def _escape(data):
+    return data.replace('&', '&amp;').replace('<', '&lt;'). \
+        replace('"', '&quot;').replace('>', '&gt;')
+
+
+def _add_text_node(value, out):
     if value is None:
         return
 
@@ -57,49 +64,85 @@ def _add_text_node(value, node, doc):
     else:
         text = r'%s' % value.replace('%', '%%')
 
-    try:
-        textNode = doc.createTextNode(text)
-        node.appendChild(textNode)
-    except TypeError, t:
-        raise InvalidNodeTypeXMLError(
-            t, u'Conteúdo de um Nó do XML com tipo de dado inválido: %s ' % value)
+    out.append(_escape(text))
+
+
+def _add_node(nodeName, value, out):
+    if isinstance(value, dict):
+        if value:
+            out.append(u'<%s>' % nodeName)
+            _add_nodes_to_parent(value, out)
+            out.append(u'</%s>' % nodeName)
+        else:
+            out.append(u'<%s/>' % nodeName)
+    elif value is None:
+        out.append(u'<%s/>' % nodeName)
+    else:
+        out.append(u'<%s>' % nodeName)
+        _add_text_node(value, out)
+        out.append(u'</%s>' % nodeName)
 
 
-def _add_list_node(nodeName, list, parent, doc):
+def _add_list_node(nodeName, list, out):
     if list:
         for value in list:
-            node = doc.createElement(nodeName)
-            parent.appendChild(node)
-            if isinstance(value, dict):
-                _add_nodes_to_parent(value, node, doc)
-            else:
-                _add_text_node(value, node, doc)
+            _add_node(nodeName, value, out)
     else:
-        node = doc.createElement(nodeName)
-        parent.appendChild(node)
-        _add_text_node('', node, doc)
+        _add_node(nodeName, '', out)
 
 
-def _add_nodes_to_parent(map, parent, doc):
+def _add_nodes_to_parent(map, out):
     if map is None:
         return
 
     for key, value in map.iteritems():
-        try:
-            if isinstance(value, dict):
-                node = doc.createElement(key)
-                parent.appendChild(node)
-                _add_nodes_to_parent(value, node, doc)
-            elif isinstance(value, type([])):
-                _add_list_node(key, value, parent, doc)
-            else:
-                node = doc.createElement(key)
-                parent.appendChild(node)
-                _add_text_node(value, node, doc)
+        if isinstance(value, type([])):
+            _add_list_node(key, value, out)
+        else:
+            _add_node(key, value, out)
+
 
-        except InvalidCharacterErr, i:
-            raise InvalidNodeNameXMLError(
-                i, u'Valor inválido para nome de uma TAG de XML: %s' % key)
+def iter_dumps(map, root_name, root_attributes=None, chunk_size=CHUNK_SIZE):
+    """Gera o XML de dumps em partes codificadas em UTF-8.
+
+    Os nós são escritos à medida que o map é percorrido, sem criar um
+    documento DOM, e cada parte é gerada quando tem ao menos chunk_size
+    caracteres. Pode ser usado como conteúdo de uma resposta em streaming.
+
+    Throws: XMLError, InvalidNodeNameXMLError, InvalidNodeTypeXMLError
+    """
+    out = [u'<?xml version="1.0" encoding="UTF-8"?><%s' % root_name]
+
+    if root_attributes is not None:
+        for key in sorted(root_attributes):
+            out.append(u' %s="%s"' % (key, _escape(root_attributes[key])))
+
+    if not map:
+        out.append(u'/>')
+        yield u''.join(out).encode('utf-8')
+        return
+
+    out.append(u'>')
+
+    size = 0
+    for key, value in map.iteritems():
+        if isinstance(value, type([])):
+            items = value or ['']
+        else:
+            items = [value]
+
+        for item in items:
+            start = len(out)
+            _add_node(key, item, out)
+
+            size += sum(len(part) for part in out[start:])
+            if size >= chunk_size:
+                yield u''.join(out).encode('utf-8')
+                out = []
+                size = 0
+
+    out.append(u'</%s>' % root_name)
+    yield u''.join(out).encode('utf-8')
 
 
 def dumps(map, root_name, root_attributes=None):
@@ -111,87 +154,117 @@ def dumps(map, root_name, root_attributes=None):
 
     Throws: XMLError, InvalidNodeNameXMLError, InvalidNodeTypeXMLError
     """
-    xml = ''
-    try:
-        implementation = getDOMImplementation()
-    except ImportError, i:
-        raise XMLError(i, u'Erro ao obter o DOMImplementation')
-
-    doc = implementation.createDocument(None, root_name, None)
+    return ''.join(iter_dumps(map, root_name, root_attributes))
 
-    try:
-        root = doc.documentElement
 
-        if (root_attributes is not None):
-            for key, value in root_attributes.iteritems():
-                attribute = doc.createAttribute(key)
-                attribute.nodeValue = value
-                root.setAttributeNode(attribute)
+def dumps_networkapi(map, version='1.0'):
+    return dumps(map, 'networkapi', {'versao': version})
 
-        _add_nodes_to_parent(map, root, doc)
 
-        xml = doc.toxml('UTF-8')
-    except InvalidCharacterErr, i:
-        raise InvalidNodeNameXMLError(
-            i, u'Valor inválido para nome de uma TAG de XML: %s' % root_name)
-    finally:
-        doc.unlink()
+def iter_dumps_networkapi(map, version='1.0'):
+    return iter_dumps(map, 'networkapi', {'versao': version})
 
-    return xml
 
+class _MapBuilder(object):
 
-def dumps_networkapi(map, version='1.0'):
-    return dumps(map, 'networkapi', {'versao': version})
+    """Monta o map de loads a partir dos eventos do parser expat.
 
+    Cada element aberto tem na pilha seu nome, o map dos seus filhos, os
+    textos já lidos e as partes do texto sendo lido. Assim como no DOM, um
+    texto termina em um element, comentário, instrução ou seção CDATA com
+    texto.
+    """
 
-def _create_childs_map(parent, force_list):
-    if parent is None:
+    def __init__(self, force_list):
+        self.force_list = force_list
+        self.stack = []
+        self.map = dict()
+        self.attrs_map = dict()
+        self.in_cdata = False
+        self.cdata_text = False
+
+    def install(self, parser):
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = self.character_data
+        parser.CommentHandler = self.end_text
+        parser.ProcessingInstructionHandler = self.end_text
+        parser.StartCdataSectionHandler = self.start_cdata
+        parser.EndCdataSectionHandler = self.end_cdata
+
+    def start_element(self, name, attributes):
+        self.end_text()
+        if not self.stack:
+            self.attrs_map = attributes
+        self.stack.append((name, dict(), [], []))
+
+    def end_element(self, name):
+        self.end_text()
+        name, childs_map, childs_values, _ = self.stack.pop()
+        child_value = _create_childs_value(childs_map, childs_values)
+
+        if not self.stack:
+            self.map[name] = child_value
+            return
+
+        childs_map = self.stack[-1][1]
+        if name in childs_map:
+            if child_value is not None:
+                value = childs_map[name]
+                if not isinstance(value, type([])):
+                    value = [value]
+                value.append(child_value)
+                childs_map[name] = value
+        elif name in self.force_list:
+            if child_value is None:
+                child_value = []
+            else:
+                child_value = [child_value]
+            childs_map[name] = child_value
+        else:
+            childs_map[name] = child_value
+
+    def character_data(self, data):
+        if not self.stack:
+            return
+        if self.in_cdata and not self.cdata_text:
+            # Seção CDATA com texto é um nó separado
+            self.end_text()
+            self.cdata_text = True
+        self.stack[-1][3].append(data)
+
+    def start_cdata(self):
+        self.in_cdata = True
+        self.cdata_text = False
+
+    def end_cdata(self):
+        if self.cdata_text:
+            self.end_text()
+        self.in_cdata = False
+
+    def end_text(self, *args):
+        if not self.stack:
+            return
+        _, _, childs_values, text = self.stack[-1]
+        if text:
+            data = u''.join(text)
+            del text[:]
+            if data.strip() != '':
+                childs_values.append(data.replace('%%', '%'))
+
+
+def _create_childs_value(childs_map, childs_values):
+    if len(childs_values) == 0 and len(childs_map) == 0:
         return None
-
-    if parent.hasChildNodes():
-        childs = parent.childNodes
-        childs_map = dict()
-        childs_values = []
-        for i in range(childs.length):
-            child = childs.item(i)
-            if child.nodeType == Node.ELEMENT_NODE:
-                if child.nodeName in childs_map:
-                    child_value = _create_childs_map(child, force_list)
-                    if child_value is not None:
-                        value = childs_map[child.nodeName]
-                        if not isinstance(value, type([])):
-                            value = [value]
-                        value.append(child_value)
-                        childs_map[child.nodeName] = value
-                elif child.nodeName in force_list:
-                    child_value = _create_childs_map(child, force_list)
-                    if child_value is None:
-                        child_value = []
-                    else:
-                        child_value = [child_value]
-                    childs_map[child.nodeName] = child_value
-                else:
-                    childs_map[child.nodeName] = _create_childs_map(
-                        child, force_list)
-            elif child.nodeType == Node.TEXT_NODE or child.nodeType == Node.CDATA_SECTION_NODE:
-                if child.data.strip() != '':
-                    childs_values.append(child.data.replace('%%', '%'))
-
-        if len(childs_values) == 0 and len(childs_map) == 0:
-            return None
-        if len(childs_values) != 0 and len(childs_map) != 0:
-            childs_values.append(childs_map)
-            return childs_values
-        if len(childs_values) != 0:
-            if len(childs_values) == 1:
-                return childs_values[0]
-            return childs_values
-        return childs_map
-    elif parent.nodeType == Node.TEXT_NODE or parent.nodeType == Node.CDATA_SECTION_NODE:
-        if parent.data.strip() != '':
-            return parent.data
-
-    return None
+    if len(childs_values) != 0 and len(childs_map) != 0:
+        childs_values.append(childs_map)
+        return childs_values
+    if len(childs_values) != 0:
+        if len(childs_values) == 1:
+            return childs_values[0]
+        return childs_values
+    return childs_map
 
 
 def loads(xml, force_list=None):
@@ -205,30 +278,27 @@ def loads(xml, force_list=None):
 
     Se o element root tem atributo, então também retorna um dict com os atributos.
 
+    O xml é lido pelo parser expat à medida que é percorrido, sem criar um
+    documento DOM. Também pode ser um objeto com o método read.
+
     Throws: XMLError
     """
     if force_list is None:
         force_list = []
 
+    builder = _MapBuilder(force_list)
+    parser = ParserCreate()
+    builder.install(parser)
+
     try:
-        doc = parseString(xml)
+        if hasattr(xml, 'read'):
+            parser.ParseFile(xml)
+        else:
+            parser.Parse(xml, True)
     except Exception, e:
         raise XMLError(e, u'Falha ao realizar o parse do xml.')
 
-    root = doc.documentElement
-
-    map = dict()
-    attrs_map = dict()
-
-    if root.hasAttributes():
-        attributes = root.attributes
-        for i in range(attributes.length):
-            attr = attributes.item(i)
-            attrs_map[attr.nodeName] = attr.nodeValue
-
-    map[root.nodeName] = _create_childs_map(root, force_list)
-
-    return map, attrs_map
+    return builder.map, builder.attrs_map
 
 
 if __name__ == '__main__':
@@ -278,32 +278,15 @@ class Interface(BaseModel):
 
         @raise InterfaceError: Falha na consulta de interfaces.
         """
-        interfaces = []
-
         try:
-            interface = self
-            while (interface is not None):
-                interfaces.append(interface)
-
-                if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
-                    from_interface = interface
-                    interface = interface.ligacao_back
-                elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
-                    from_interface = interface
-                    interface = interface.ligacao_front
-                else:
-                    interface = None
-
-                if (interface is not None) and (interface in interfaces):
-                    break
+            return InterfaceLinks([self]).search_interfaces(
+                [(self, from_interface)])[0]
         except Exception, e:
             self.log.error(
                 u'Falha ao pesquisar as interfaces de uma interface.')
             raise InterfaceError(
                 e, u'Falha ao pesquisar as interfaces de uma interface.')
 
-        return interfaces
-
     def search_front_back_interfaces(self):
         """Busca todas as interfaces ligadas no front e no back da interface.
 
@@ -316,11 +299,11 @@ class Interface(BaseModel):
         interfaces = set()
 
         try:
-            if self.ligacao_front is not None:
-                interfaces.update(self.ligacao_front.search_interfaces(self))
-
-            if self.ligacao_back is not None:
-                interfaces.update(self.ligacao_back.search_interfaces(self))
+            links = [(link, self) for link in (self.ligacao_front,
+                                               self.ligacao_back)
+                     if link is not None]
+            for path in InterfaceLinks([self]).search_interfaces(links):
+                interfaces.update(path)
         except Exception, e:
             self.log.error(
                 u'Falha ao pesquisar as interfaces da ligação front e back.')
@@ -343,46 +326,8 @@ class Interface(BaseModel):
         @raise InterfaceProtectedError: A interface do switch está com o campo protegida diferente do parâmetro.
         """
 
-        interface_ids = []
-        from_interface = self
-        interface = self.ligacao_front
-        try:
-            while (interface is not None) \
-                    and (interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH) \
-                    and (interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_ROUTER)\
-                    and (interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_SERVIDOR):
-                interface_ids.append(interface.id)
-
-                if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
-                    from_interface = interface
-                    interface = interface.ligacao_back
-                elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
-                    from_interface = interface
-                    interface = interface.ligacao_front
-                else:
-                    interface = None
-
-                if interface is not None:
-                    if interface.id in interface_ids:
-                        raise InterfaceNotFoundError(None,
-                                                     u'Interface do tipo switch não encontrada a partir do front da '
-                                                     u'interface %d.' % self.id)
-        except InterfaceNotFoundError, e:
-            raise e
-        except Exception, e:
-            self.log.error(u'Falha ao pesquisar a interface do switch.')
-            raise InterfaceError(
-                e, u'Falha ao pesquisar a interface do switch.')
-
-        if interface is None:
-            raise InterfaceNotFoundError(
-                None, u'Interface do tipo switch não encontrada a partir do front da interface %d.' % self.id)
-
-        if (protegida is not None) and (interface.protegida != protegida):
-            raise InterfaceProtectedError(
-                None, u'Interface do switch com o campo protegida diferente de %s.' % protegida)
-
-        return interface
+        return self._get_interface_from_host_interface(
+            InterfaceLinks.SWITCH_ROUTER_SERVER, protegida)
 
     def get_switch_and_router_interface_from_host_interface(self, protegida=None):
         """A partir da ligacao_front da interface local busca uma interface ligada a um equipamento do tipo SWITCH.
@@ -398,45 +343,8 @@ class Interface(BaseModel):
         @raise InterfaceProtectedError: A interface do switch está com o campo protegida diferente do parâmetro.
         """
 
-        interface_ids = []
-        from_interface = self
-        interface = self.ligacao_front
-        try:
-            while (interface is not None) and (
-                        interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH) \
-                    and (interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_ROUTER):
-                interface_ids.append(interface.id)
-
-                if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
-                    from_interface = interface
-                    interface = interface.ligacao_back
-                elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
-                    from_interface = interface
-                    interface = interface.ligacao_front
-                else:
-                    interface = None
-
-                if interface is not None:
-                    if interface.id in interface_ids:
-                        raise InterfaceNotFoundError(
-                            None,
-                            u'Interface do tipo switch não encontrada a partir do front da interface %d.' % self.id)
-        except InterfaceNotFoundError, e:
-            raise e
-        except Exception, e:
-            self.log.error(u'Falha ao pesquisar a interface do switch.')
-            raise InterfaceError(
-                e, u'Falha ao pesquisar a interface do switch.')
-
-        if (interface is None):
-            raise InterfaceNotFoundError(
-                None, u'Interface do tipo switch não encontrada a partir do front da interface %d.' % self.id)
-
-        if (protegida is not None) and (interface.protegida != protegida):
-            raise InterfaceProtectedError(
-                None, u'Interface do switch com o campo protegida diferente de %s.' % protegida)
-
-        return interface
+        return self._get_interface_from_host_interface(
+            InterfaceLinks.SWITCH_ROUTER, protegida)
 
     def get_switch_interface_from_host_interface(self, protegida=None):
         """A partir da ligacao_front da interface local busca uma interface ligada a um equipamento do tipo SWITCH.
@@ -446,44 +354,32 @@ class Interface(BaseModel):
         @raise InterfaceNotFoundError: Interface do switch não encontrada.
         @raise InterfaceProtectedError: A interface do switch está com o campo protegida diferente do parâmetr
         """
-        interface_ids = []
-        from_interface = self
-        interface = self.ligacao_front
+        return self._get_interface_from_host_interface(
+            InterfaceLinks.SWITCH, protegida)
+
+    def _get_interface_from_host_interface(self, tipos, protegida):
+
         try:
-            while (interface is not None) and (
-                        interface.equipamento.tipo_equipamento_id != TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH):
-                interface_ids.append(interface.id)
-
-                if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
-                    from_interface = interface
-                    interface = interface.ligacao_back
-                elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
-                    from_interface = interface
-                    interface = interface.ligacao_front
-                else:
-                    interface = None
-
-                if interface is not None:
-                    if interface.id in interface_ids:
-                        raise InterfaceNotFoundError(
-                            None,
-                            u'Interface do tipo switch não encontrada a partir do front da interface %d.' % self.id)
-        except InterfaceNotFoundError, e:
-            raise e
+            path = InterfaceLinks([self])._search_paths([self], tipos)[0]
         except Exception, e:
             self.log.error(u'Falha ao pesquisar a interface do switch.')
             raise InterfaceError(
                 e, u'Falha ao pesquisar a interface do switch.')
 
-        if (interface is None):
+        if path.error is not None:
+            self.log.error(u'Falha ao pesquisar a interface do switch.')
+            raise InterfaceError(
+                path.error, u'Falha ao pesquisar a interface do switch.')
+
+        if path.found is None:
             raise InterfaceNotFoundError(
                 None, u'Interface do tipo switch não encontrada a partir do front da interface %d.' % self.id)
 
-        if ((protegida is not None) and (interface.protegida != protegida)):
+        if (protegida is not None) and (path.found.protegida != protegida):
             raise InterfaceProtectedError(
                 None, u'Interface do switch com o campo protegida diferente de %s.' % protegida)
 
-        return interface
+        return path.found
 
     @classmethod
     def search(cls, equipment_id=None):
@@ -911,6 +807,143 @@ class Interface(BaseModel):
             interface = self.ligacao_back
             interface.save()
 
+
+class _InterfacePath(object):
+
+    """Path of interfaces leaving from_interface behind.
+
+    Ends at an interface without other link, when a loop is found or, when
+    tipos is given, at the first interface of an equipment of one of tipos.
+    """
+
+    def __init__(self, interface_id, from_interface, tipos=None):
+        self.next_id = interface_id
+        self.from_interface = from_interface
+        self.tipos = tipos
+        self.interfaces = []
+        self.interface_ids = set()
+        self.found = None
+        self.error = None
+
+    def advance(self, interfaces):
+        """Go to next interface, return False when the path ended.
+
+        :param interfaces: Dict of loaded interfaces by id
+        """
+
+        interface = interfaces.get(self.next_id)
+        if interface is None:
+            self.error = Interface.DoesNotExist(
+                u'Interface %s não cadastrada.' % self.next_id)
+            return False
+
+        if self.tipos is not None and \
+                interface.equipamento.tipo_equipamento_id in self.tipos:
+            self.found = interface
+            return False
+
+        self.interfaces.append(interface)
+        self.interface_ids.add(interface.id)
+
+        if (interface.ligacao_back_id is not None) and (self.from_interface.id != interface.ligacao_back_id):
+            self.next_id = interface.ligacao_back_id
+        elif (interface.ligacao_front_id is not None) and (self.from_interface.id != interface.ligacao_front_id):
+            self.next_id = interface.ligacao_front_id
+        else:
+            self.next_id = None
+        self.from_interface = interface
+
+        return self.next_id is not None and \
+            self.next_id not in self.interface_ids
+
+
+class InterfaceLinks(object):
+
+    """Follow ligacao_front and ligacao_back of many interfaces together.
+
+    Paths advance one hop at a time and the next interfaces of all paths
+    are loaded with their equipments in a single query. Resolving a batch
+    costs one query by hop of the longest path, instead of two by hop of
+    each path.
+
+    Loaded interfaces are kept, so an instance can be reused by paths
+    crossing the same patch panels, but it does not see links changed
+    after they were loaded.
+    """
+
+    SWITCH = (TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH,)
+    SWITCH_ROUTER = (TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH,
+                     TipoEquipamento.TIPO_EQUIPAMENTO_ROUTER)
+    SWITCH_ROUTER_SERVER = SWITCH_ROUTER + \
+        (TipoEquipamento.TIPO_EQUIPAMENTO_SERVIDOR,)
+
+    def __init__(self, interfaces=()):
+        self.interfaces = dict((interface.id, interface)
+                               for interface in interfaces)
+
+    def _load(self, interface_ids):
+
+        missing = set(interface_ids) - set(self.interfaces)
+        if missing:
+            for interface in Interface.objects.filter(
+                    id__in=missing).select_related('equipamento'):
+                self.interfaces[interface.id] = interface
+
+    def _walk(self, paths):
+
+        paths = [path for path in paths if path.next_id is not None]
+        while paths:
+            self._load([path.next_id for path in paths])
+            paths = [path for path in paths if path.advance(self.interfaces)]
+
+    def _search_paths(self, interfaces, tipos):
+
+        for interface in interfaces:
+            self.interfaces.setdefault(interface.id, interface)
+
+        paths = [_InterfacePath(interface.ligacao_front_id, interface, tipos)
+                 for interface in interfaces]
+        self._walk(paths)
+        return paths
+
+    def search_interfaces(self, interfaces):
+        """Return the list of interfaces of each path, as returned by
+        Interface.search_interfaces.
+
+        :param interfaces: List of (interface, from_interface)
+
+        @raise Interface.DoesNotExist: A link to a missing interface.
+        """
+
+        for interface, _ in interfaces:
+            self.interfaces.setdefault(interface.id, interface)
+
+        paths = [_InterfacePath(interface.id, from_interface)
+                 for interface, from_interface in interfaces]
+        self._walk(paths)
+
+        for path in paths:
+            if path.error is not None:
+                raise path.error
+        return [path.interfaces for path in paths]
+
+    def search_from_host_interfaces(self, interfaces, tipos):
+        """Return dict by id of host interface with the first interface of
+        an equipment of one of tipos found from its ligacao_front.
+
+        Host interfaces without such interface, with a loop or with a link
+        to a missing interface are left out.
+
+        :param tipos: One of SWITCH, SWITCH_ROUTER or SWITCH_ROUTER_SERVER
+        """
+
+        interfaces = list(interfaces)
+        paths = self._search_paths(interfaces, tipos)
+        return dict((interface.id, path.found)
+                    for interface, path in zip(interfaces, paths)
+                    if path.found is not None)
+
+
 class EnvironmentInterface(BaseModel):
 
     log = logging.getLogger('EnvironmentInterface')
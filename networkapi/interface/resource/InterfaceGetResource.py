@@ -28,6 +28,7 @@ from networkapi.infrastructure.xml_utils import XMLError
 from networkapi.interface.models import EnvironmentInterface
 from networkapi.interface.models import Interface
 from networkapi.interface.models import InterfaceError
+from networkapi.interface.models import InterfaceLinks
 from networkapi.interface.models import InterfaceNotFoundError
 from networkapi.rest import RestResource
 from networkapi.rest import UserNotAuthorizedError
@@ -140,11 +141,14 @@ class InterfaceGetResource(RestResource):
                         if interf.equipamento.id == int(equipamento):
                             int_server = interf.get_server_switch_or_router_interface_from_host_interface()
                             equipamento = int_server.equipamento.id
-                    interfaces_equip = Interface.objects.all().filter(equipamento__id=int(equipamento))
+                    interfaces_equip = list(Interface.objects.all().filter(equipamento__id=int(equipamento)))
+                    sw_routers = InterfaceLinks().search_from_host_interfaces(
+                        interfaces_equip, InterfaceLinks.SWITCH_ROUTER)
                     for interf in interfaces_equip:
+                        if interf.id not in sw_routers:
+                            continue
                         try:
-                            i = interf.get_switch_and_router_interface_from_host_interface()
-                            interface_list.append(get_new_interface_map(i))
+                            interface_list.append(get_new_interface_map(sw_routers[interf.id]))
                         except:
                             pass
                     return self.response(dumps_networkapi({'interfaces': interface_list}))
@@ -32,6 +32,7 @@ from networkapi.interface.models import FrontLinkNotFoundError
 from networkapi.interface.models import Interface
 from networkapi.interface.models import InterfaceError
 from networkapi.interface.models import InterfaceForEquipmentDuplicatedError
+from networkapi.interface.models import InterfaceLinks
 from networkapi.interface.models import InterfaceNotFoundError
 from networkapi.interface.models import InterfaceUsedByOtherInterfaceError
 from networkapi.rest import RestResource
@@ -73,13 +74,17 @@ class InterfaceGetSwRouterResource(RestResource):
             equip_id = kwargs.get('id_equipamento')
 
             interface = Interface()
-            equip_interface = interface.search(equip_id)
+            equip_interface = list(interface.search(equip_id))
             interface_list = []
 
+            sw_routers = InterfaceLinks().search_from_host_interfaces(
+                equip_interface, InterfaceLinks.SWITCH_ROUTER)
             for var in equip_interface:
+                if var.id not in sw_routers:
+                    continue
                 try:
-                    interface_list.append(get_new_interface_map(
-                        var.get_switch_and_router_interface_from_host_interface(None)))
+                    interface_list.append(
+                        get_new_interface_map(sw_routers[var.id]))
                 except:
                     pass
 
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+import logging
+import unittest
+
+from mock import Mock
+from mock import patch
+
+from networkapi.equipamento.models import TipoEquipamento
+from networkapi.interface.models import Interface
+from networkapi.interface.models import InterfaceError
+from networkapi.interface.models import InterfaceLinks
+from networkapi.interface.models import InterfaceNotFoundError
+from networkapi.interface.models import InterfaceProtectedError
+
+LOG = logging.getLogger(__name__)
+
+SWITCH = TipoEquipamento.TIPO_EQUIPAMENTO_SWITCH
+SERVER = TipoEquipamento.TIPO_EQUIPAMENTO_SERVIDOR
+PATCH_PANEL = 8
+
+
+class FakeDB(object):
+
+    """Interfaces by id, counting queries as the ORM would do them."""
+
+    def __init__(self):
+        self.interfaces = dict()
+        self.queries = 0
+
+    def get(self, interface_id):
+        self.queries += 1
+        return self.interfaces[interface_id]
+
+    def filter(self, id__in):
+        self.queries += 1
+        found = [self.interfaces[interface_id] for interface_id in id__in
+                 if interface_id in self.interfaces]
+
+        def select_related(field):
+            for interface in found:
+                interface.related.add(field)
+            return found
+
+        return Mock(select_related=select_related)
+
+
+class FakeInterface(object):
+
+    """Interface with links loaded on access, like lazy foreign keys."""
+
+    def __init__(self, db, interface_id, tipo, protegida=False):
+        self.db = db
+        self.id = interface_id
+        self.tipo = tipo
+        self.protegida = protegida
+        self.ligacao_front_id = None
+        self.ligacao_back_id = None
+        self.related = set()
+        db.interfaces[interface_id] = self
+
+    @property
+    def equipamento(self):
+        if 'equipamento' not in self.related:
+            self.db.queries += 1
+        return Mock(tipo_equipamento_id=self.tipo)
+
+    @property
+    def ligacao_front(self):
+        if self.ligacao_front_id is None:
+            return None
+        return self.db.get(self.ligacao_front_id)
+
+    @property
+    def ligacao_back(self):
+        if self.ligacao_back_id is None:
+            return None
+        return self.db.get(self.ligacao_back_id)
+
+
+def legacy_switch_interface(host, tipos):
+    """Previous search of the switch interface, one hop at a time."""
+
+    interface_ids = []
+    from_interface = host
+    interface = host.ligacao_front
+    while (interface is not None) and \
+            (interface.equipamento.tipo_equipamento_id not in tipos):
+        interface_ids.append(interface.id)
+
+        if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
+            from_interface = interface
+            interface = interface.ligacao_back
+        elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
+            from_interface = interface
+            interface = interface.ligacao_front
+        else:
+            interface = None
+
+        if interface is not None and interface.id in interface_ids:
+            return None
+    return interface
+
+
+def legacy_search_interfaces(start, from_interface):
+    """Previous Interface.search_interfaces."""
+
+    interfaces = []
+    interface = start
+    while (interface is not None):
+        interfaces.append(interface)
+
+        if (interface.ligacao_back is not None) and (from_interface.id != interface.ligacao_back_id):
+            from_interface = interface
+            interface = interface.ligacao_back
+        elif (interface.ligacao_front is not None) and (from_interface.id != interface.ligacao_front_id):
+            from_interface = interface
+            interface = interface.ligacao_front
+        else:
+            interface = None
+
+        if (interface is not None) and (interface in interfaces):
+            break
+    return interfaces
+
+
+def connect_front(interface_a, interface_b):
+    interface_a.ligacao_front_id = interface_b.id
+    interface_b.ligacao_front_id = interface_a.id
+
+
+def connect_back(interface_a, interface_b):
+    interface_a.ligacao_back_id = interface_b.id
+    interface_b.ligacao_back_id = interface_a.id
+
+
+class InterfaceLinksTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDB()
+        patch('networkapi.interface.models.Interface.objects',
+              self.db).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def build_rack(self, hosts, patch_panels):
+        """Hosts connected to ports of a switch through patch panels.
+
+        Patch panels are connected to each other by back and front in
+        turns, the first one by front to the host.
+        """
+
+        host_interfaces = list()
+        switch_interfaces = list()
+        for port in range(hosts):
+            base = port * 100
+            host = FakeInterface(self.db, base + 1, SERVER)
+            switch = FakeInterface(self.db, base + 99, SWITCH,
+                                   protegida=bool(port % 2))
+            path = [host] + [FakeInterface(self.db, base + 10 + panel,
+                                           PATCH_PANEL)
+                             for panel in range(patch_panels)] + [switch]
+            for hop in range(len(path) - 1):
+                connect = connect_back if hop % 2 else connect_front
+                connect(path[hop], path[hop + 1])
+            host_interfaces.append(host)
+            switch_interfaces.append(switch)
+        self.db.queries = 0
+        return host_interfaces, switch_interfaces
+
+    def test_same_results_as_legacy(self):
+        hosts, switches = self.build_rack(4, 3)
+
+        for host, switch in zip(hosts, switches):
+            self.assertIs(switch, legacy_switch_interface(
+                host, InterfaceLinks.SWITCH_ROUTER))
+            self.assertEqual(
+                legacy_search_interfaces(self.db.interfaces[host.id + 9],
+                                         host),
+                InterfaceLinks().search_interfaces(
+                    [(self.db.interfaces[host.id + 9], host)])[0])
+
+        self.assertEqual(
+            dict((host.id, switch) for host, switch in zip(hosts, switches)),
+            InterfaceLinks().search_from_host_interfaces(
+                hosts, InterfaceLinks.SWITCH_ROUTER))
+
+    def test_query_by_hop_of_batch(self):
+        hosts, switches = self.build_rack(48, 3)
+
+        InterfaceLinks().search_from_host_interfaces(
+            hosts, InterfaceLinks.SWITCH_ROUTER)
+
+        # Interfaces of each patch panel and of the switch
+        self.assertEqual(4, self.db.queries)
+
+    def test_loop(self):
+        host = FakeInterface(self.db, 1, SERVER)
+        panel_a = FakeInterface(self.db, 2, PATCH_PANEL)
+        panel_b = FakeInterface(self.db, 3, PATCH_PANEL)
+        panel_c = FakeInterface(self.db, 4, PATCH_PANEL)
+        connect_front(host, panel_a)
+        connect_back(panel_a, panel_b)
+        panel_b.ligacao_front_id = panel_c.id
+        panel_c.ligacao_back_id = panel_a.id
+
+        self.assertIsNone(legacy_switch_interface(
+            host, InterfaceLinks.SWITCH_ROUTER))
+        self.assertEqual({}, InterfaceLinks().search_from_host_interfaces(
+            [host], InterfaceLinks.SWITCH_ROUTER))
+        self.assertEqual(
+            legacy_search_interfaces(panel_a, host),
+            InterfaceLinks().search_interfaces([(panel_a, host)])[0])
+
+    def test_model_methods(self):
+        hosts, switches = self.build_rack(2, 1)
+        host = Interface(id=hosts[1].id,
+                         ligacao_front_id=hosts[1].ligacao_front_id)
+
+        self.assertIs(switches[1],
+                      host.get_switch_interface_from_host_interface(True))
+        with self.assertRaises(InterfaceProtectedError):
+            host.get_switch_and_router_interface_from_host_interface(False)
+
+    def test_model_methods_not_found(self):
+        host = Interface(id=1, ligacao_front_id=None)
+        with self.assertRaises(InterfaceNotFoundError):
+            host.get_switch_and_router_interface_from_host_interface()
+
+        host = Interface(id=1, ligacao_front_id=1000)
+        with self.assertRaises(InterfaceError) as cm:
+            host.get_switch_and_router_interface_from_host_interface()
+        self.assertNotIsInstance(cm.exception, InterfaceNotFoundError)
+
+    def test_benchmark_queries(self):
+        hosts, switches = self.build_rack(48, 3)
+
+        for host in hosts:
+            legacy_switch_interface(host, InterfaceLinks.SWITCH_ROUTER)
+        legacy_queries = self.db.queries
+
+        self.db.queries = 0
+        InterfaceLinks().search_from_host_interfaces(
+            hosts, InterfaceLinks.SWITCH_ROUTER)
+
+        LOG.info('Switch interfaces of 48 hosts through 3 patch panels: '
+                 'hop by hop %s queries, in batch %s queries' %
+                 (legacy_queries, self.db.queries))
+
+        self.assertLess(self.db.queries * 10, legacy_queries)
@@ -1146,32 +1146,27 @@ class NetworkIPv4(BaseModel):
                 self.log.info(
                     u'Prefix that will be used: %s' % new_prefix)
 
-                free_nets = network.get_free_space_network([net4], nets_envs)
-
-                for free_net in free_nets:
-                    try:
-                        subnets = free_net.iter_subnets(new_prefix=new_prefix)
-                        subnet = subnets.next()
-                    except Exception:
-                        pass
-                    else:
-                        # Set octs by network generated
-                        self.oct1, self.oct2, self.oct3, self.oct4 = str(
-                            subnet.network).split('.')
-                        # Set block by network generated
-                        self.block = subnet.prefixlen
+                subnet = network.get_free_subnet(
+                    net4, nets_envs, new_prefix)
+
+                if subnet is not None:
+                    # Set octs by network generated
+                    self.oct1, self.oct2, self.oct3, self.oct4 = str(
+                        subnet.network).split('.')
+                    # Set block by network generated
+                    self.block = subnet.prefixlen
 
-                        self.broadcast = subnet.broadcast.compressed
-                        mask = subnet.netmask.exploded.split('.')
-                        self.mask_oct1 = mask[0]
-                        self.mask_oct2 = mask[1]
-                        self.mask_oct3 = mask[2]
-                        self.mask_oct4 = mask[3]
+                    self.broadcast = subnet.broadcast.compressed
+                    mask = subnet.netmask.exploded.split('.')
+                    self.mask_oct1 = mask[0]
+                    self.mask_oct2 = mask[1]
+                    self.mask_oct3 = mask[2]
+                    self.mask_oct4 = mask[3]
 
-                        if not self.network_type:
-                            self.network_type = config.id_network_type
+                    if not self.network_type:
+                        self.network_type = config.id_network_type
 
-                        return
+                    return
 
             # Checks if found any available network
             if network_found is None:
@@ -1328,6 +1323,18 @@ class Ip(BaseModel):
             self.log.error(u'Failure to delete the IP.')
             raise IpError(e, u'Failure to delete the IP')
 
+    @classmethod
+    def list_used_addresses(cls, id_network):
+        """Get allocated Ipv4 of networkIPv4 as integers
+            @return: List of integer addresses
+        """
+
+        octs = Ip.objects.filter(networkipv4__id=id_network).values_list(
+            'oct1', 'oct2', 'oct3', 'oct4')
+
+        return [(oct1 << 24) + (oct2 << 16) + (oct3 << 8) + oct4
+                for oct1, oct2, oct3, oct4 in octs]
+
     @classmethod
     def get_available_ip(cls, id_network):
         """Get a available Ipv4 for networkIPv4
@@ -1341,38 +1348,20 @@ class Ip(BaseModel):
         # Cast to API
         net4 = IPv4Network(networkipv4.networkv4)
 
-        # Find all ips ralated to network
-        ips = Ip.objects.filter(networkipv4__id=networkipv4.id)
-
-        # Cast all to API class
-        ipsv4 = set([IPv4Address(ip.ip_formated) for ip in ips])
-
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        i = 0
-        for ip in net4.iterhosts():
-
-            # Do not use some range of IPs (config)
-            i = i + 1
-            if i >= conf.IPv4_MIN and i < (net4.numhosts - conf.IPv4_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv4:
-
-                    # Use it
-                    selected_ip = ip
-
-                    # Stop generation
-                    return selected_ip
+        # Do not use some range of IPs (config)
+        selected_ip = network.get_available_address(
+            net4, cls.list_used_addresses(networkipv4.id),
+            conf.IPv4_MIN, conf.IPv4_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(
                 None, u'No IP available to NETWORK %s.' % networkipv4.id)
 
+        return selected_ip
+
     @classmethod
     def get_first_available_ip(cls, id_network, topdown=False):
         """Get a first available Ipv4 for networkIPv4
@@ -1385,35 +1374,15 @@ class Ip(BaseModel):
         # Cast to API
         net4 = IPv4Network(networkipv4.networkv4)
 
-        # Find all ips ralated to network
-        ips = Ip.objects.filter(networkipv4__id=networkipv4.id)
-
-        # Cast all to API class
-        ipsv4 = set([IPv4Address(ip.ip_formated) for ip in ips])
-
-        selected_ip = None
-
-        if topdown:
-            method = net4.iterhostsTopDown
-        else:
-            method = net4.iterhosts
-
-        # For each ip generated
-        for ip in method():
-
-            # If IP generated was not used
-            if ip not in ipsv4:
-
-                # Use it
-                selected_ip = ip
-
-                # Stop generation
-                return selected_ip
+        selected_ip = network.get_available_address(
+            net4, cls.list_used_addresses(networkipv4.id), topdown=topdown)
 
         if selected_ip is None:
             raise IpNotAvailableError(
                 None, u'No IP available to NETWORK %s.' % networkipv4.id)
 
+        return selected_ip
+
     def edit_ipv4(self, user):
         try:
 
@@ -1647,34 +1616,13 @@ class Ip(BaseModel):
                                                self.networkipv4.oct3, self.networkipv4.oct4,
                                                self.networkipv4.block))
 
-        # Find all ips ralated to network
-        ips = Ip.objects.filter(networkipv4__id=self.networkipv4.id)
-
-        # Cast all to API class
-        ipsv4 = set(
-            [(IPv4Address('%d.%d.%d.%d' % (ip.oct1, ip.oct2, ip.oct3, ip.oct4))) for ip in ips])
-
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        i = 0
-        for ip in net4.iterhosts():
-
-            # Do not use some range of IPs (config)
-            i = i + 1
-            if i >= conf.IPv4_MIN and i < (net4.numhosts - conf.IPv4_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv4:
-
-                    # Use it
-                    selected_ip = ip
-
-                    # Stop generation
-                    break
+        # Do not use some range of IPs (config)
+        selected_ip = network.get_available_address(
+            net4, Ip.list_used_addresses(self.networkipv4.id),
+            conf.IPv4_MIN, conf.IPv4_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(
@@ -2200,36 +2148,15 @@ class Ip(BaseModel):
         # Cast to API
         net4 = IPNetwork(self.networkipv4.networkv4)
 
-        # Find all ips ralated to network
-        ips = self.networkipv4.ip_set.all()
-
-        # Cast all to API class
-        ipsv4 = set([IPv4Address(ip.ip_formated) for ip in ips])
-
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        i = 0
-        for ip in net4.iterhosts():
-
-            # Do not use some range of IPs (config)
-            # IPv4_MIN = Firsts
-            # IPv4_MAX = Number minimum of Ip reserveds
-            # First IP and 2 last I
-            i = i + 1
-            if i >= conf.IPv4_MIN and i < (net4.numhosts - conf.IPv4_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv4:
-
-                    # Use it
-                    selected_ip = ip
-
-                    # Stop generation
-                    break
+        # Do not use some range of IPs (config)
+        # IPv4_MIN = Firsts
+        # IPv4_MAX = Number minimum of Ip reserveds
+        selected_ip = network.get_available_address(
+            net4, Ip.list_used_addresses(self.networkipv4.id),
+            conf.IPv4_MIN, conf.IPv4_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(None, u'No IP available to VLAN %s.' %
@@ -3458,38 +3385,32 @@ class NetworkIPv6(BaseModel):
                 self.log.info(
                     u'Prefix that will be used: %s' % new_prefix)
 
-                free_nets = network.get_free_space_network([net6], nets_envs)
-
-                for free_net in free_nets:
-                    try:
-                        subnets = free_net.iter_subnets(new_prefix=new_prefix)
-                        subnet = subnets.next()
-                    except Exception:
-                        pass
-                    else:
-
-                        # Set octs by network generated
-                        self.block1, self.block2, self.block3, self.block4,\
-                            self.block5, self.block6, self.block7, \
-                            self.block8 = str(
-                                subnet.network.exploded
-                            ).split(':')
-
-                        # Set block by network generated
-                        self.block = subnet.prefixlen
-
-                        mask = subnet.netmask.exploded.split(':')
-                        self.mask1 = mask[0]
-                        self.mask2 = mask[1]
-                        self.mask3 = mask[2]
-                        self.mask4 = mask[3]
-                        self.mask5 = mask[4]
-                        self.mask6 = mask[5]
-                        self.mask7 = mask[6]
-                        self.mask8 = mask[7]
-                        if not self.network_type:
-                            self.network_type = config.network_type
-                        return
+                subnet = network.get_free_subnet(
+                    net6, nets_envs, new_prefix)
+
+                if subnet is not None:
+                    # Set octs by network generated
+                    self.block1, self.block2, self.block3, self.block4,\
+                        self.block5, self.block6, self.block7, \
+                        self.block8 = str(
+                            subnet.network.exploded
+                        ).split(':')
+
+                    # Set block by network generated
+                    self.block = subnet.prefixlen
+
+                    mask = subnet.netmask.exploded.split(':')
+                    self.mask1 = mask[0]
+                    self.mask2 = mask[1]
+                    self.mask3 = mask[2]
+                    self.mask4 = mask[3]
+                    self.mask5 = mask[4]
+                    self.mask6 = mask[5]
+                    self.mask7 = mask[6]
+                    self.mask8 = mask[7]
+                    if not self.network_type:
+                        self.network_type = config.network_type
+                    return
 
             # Checks if found any available network
             if network_found is None:
@@ -3683,6 +3604,19 @@ class Ipv6(BaseModel):
             cls.log.error(u'Failure to search the IP.')
             raise IpError(e, u'Failure to search the IP')
 
+    @classmethod
+    def list_used_addresses(cls, id_network):
+        """Get allocated Ipv6 of networkIPv6 as integers
+            @return: List of integer addresses
+        """
+
+        blocks = Ipv6.objects.filter(networkipv6__id=id_network).values_list(
+            'block1', 'block2', 'block3', 'block4',
+            'block5', 'block6', 'block7', 'block8')
+
+        return [int(''.join(block.zfill(4) for block in ip), 16)
+                for ip in blocks]
+
     @classmethod
     def get_available_ip6(cls, id_network):
         """Get a available ip6 for network6
@@ -3698,42 +3632,21 @@ class Ipv6(BaseModel):
             cls.networkipv6.block1, cls.networkipv6.block2, cls.networkipv6.block3,
             cls.networkipv6.block4, cls.networkipv6.block5, cls.networkipv6.block6,
             cls.networkipv6.block7, cls.networkipv6.block8, cls.networkipv6.block))
-        # Find all ipv6s ralated to network
-        ips = Ipv6.objects.filter(networkipv6__id=cls.networkipv6.id)
-
-        # Cast all to API class
-        ipsv6 = set([(IPv6Address('%s:%s:%s:%s:%s:%s:%s:%s' % (
-            ip.block1, ip.block2, ip.block3, ip.block4, ip.block5, ip.block6, ip.block7, ip.block8))) for ip in ips])
 
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        # For each ip generated
-        i = 0
-        for ip in net6.iterhosts():
-
-            # Do not use some range of IPs (config)
-            i = i + 1
-            if i >= conf.IPv6_MIN and i < (net6.numhosts - conf.IPv6_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv6:
-
-                    # Use it
-                    selected_ip = ip
-
-                    return selected_ip.exploded
-
-                    # Stop generation
-                    break
+        # Do not use some range of IPs (config)
+        selected_ip = network.get_available_address(
+            net6, cls.list_used_addresses(cls.networkipv6.id),
+            conf.IPv6_MIN, conf.IPv6_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(
                 None, u'No IP6 available to NETWORK %s.' % cls.networkipv6.id)
 
+        return selected_ip.exploded
+
     @classmethod
     def get_first_available_ip6(cls, id_network, topdown=False):
         """Get a first available ip6 for network6
@@ -3747,41 +3660,17 @@ class Ipv6(BaseModel):
             cls.networkipv6.block1, cls.networkipv6.block2, cls.networkipv6.block3,
             cls.networkipv6.block4, cls.networkipv6.block5, cls.networkipv6.block6,
             cls.networkipv6.block7, cls.networkipv6.block8, cls.networkipv6.block))
-        # Find all ipv6s ralated to network
-        ips = Ipv6.objects.filter(networkipv6__id=cls.networkipv6.id)
-        for ip in ips:
-            cls.log.info('ip %s' % ip.block8)
-
-        # Cast all to API class
-        ipsv6 = set([(IPv6Address('%s:%s:%s:%s:%s:%s:%s:%s' % (
-            ip.block1, ip.block2, ip.block3, ip.block4, ip.block5, ip.block6, ip.block7, ip.block8)
-        )) for ip in ips])
-
-        selected_ip = None
-
-        if topdown:
-            method = net6.iterhostsTopDown
-        else:
-            method = net6.iterhosts
-
-        # For each ip generated
-        for ip in method():
 
-            # If IP generated was not used
-            if ip not in ipsv6:
-
-                # Use it
-                selected_ip = ip
-
-                return selected_ip.exploded
-
-                # Stop generation
-                break
+        selected_ip = network.get_available_address(
+            net6, cls.list_used_addresses(cls.networkipv6.id),
+            topdown=topdown)
 
         if selected_ip is None:
             raise IpNotAvailableError(
                 None, u'No IP6 available to NETWORK %s.' % cls.networkipv6.id)
 
+        return selected_ip.exploded
+
     def delete_ip6(self, user, id_ip):
         try:
 
@@ -4045,34 +3934,13 @@ class Ipv6(BaseModel):
         net6 = IPv6Network('%s:%s:%s:%s:%s:%s:%s:%s/%s' % (
             self.networkipv6.block1, self.networkipv6.block2, self.networkipv6.block3, self.networkipv6.block4,
             self.networkipv6.block5, self.networkipv6.block6, self.networkipv6.block7, self.networkipv6.block8, self.networkipv6.block))
-        # Find all ipv6s ralated to network
-        ips = Ipv6.objects.filter(networkipv6__id=self.networkipv6.id)
-
-        # Cast all to API class
-        ipsv6 = set([(IPv6Address('%s:%s:%s:%s:%s:%s:%s:%s' % (
-            ip.block1, ip.block2, ip.block3, ip.block4, ip.block5, ip.block6, ip.block7, ip.block8))) for ip in ips])
-
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        i = 0
-        for ip in net6.iterhosts():
-
-            # Do not use some range of IPs (config)
-            i = i + 1
-            if i >= conf.IPv6_MIN and i < (net6.numhosts - conf.IPv6_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv6:
-
-                    # Use it
-                    selected_ip = ip
-
-                    # Stop generation
-                    break
+        # Do not use some range of IPs (config)
+        selected_ip = network.get_available_address(
+            net6, Ipv6.list_used_addresses(self.networkipv6.id),
+            conf.IPv6_MIN, conf.IPv6_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(
@@ -4604,36 +4472,15 @@ class Ipv6(BaseModel):
         # Cast to API
         net6 = IPNetwork(self.networkipv6.networkv6)
 
-        # Find all ips ralated to network
-        ips = self.networkipv6.ipv6_set.all()
-
-        # Cast all to API class
-        ipsv6 = set([IPv6Address(ip.ip_formated) for ip in ips])
-
         # Get configuration
         conf = configuration.get()
 
-        selected_ip = None
-
-        # For each ip generated
-        i = 0
-        for ip in net6.iterhosts():
-
-            # Do not use some range of IPs (config)
-            # IPv6_MIN = Firsts
-            # IPv6_MAX = Number minimum of Ip reserveds
-            # First IP and 2 last I
-            i = i + 1
-            if i >= conf.IPv6_MIN and i < (net6.numhosts - conf.IPv6_MAX):
-
-                # If IP generated was not used
-                if ip not in ipsv6:
-
-                    # Use it
-                    selected_ip = ip
-
-                    # Stop generation
-                    break
+        # Do not use some range of IPs (config)
+        # IPv6_MIN = Firsts
+        # IPv6_MAX = Number minimum of Ip reserveds
+        selected_ip = network.get_available_address(
+            net6, Ipv6.list_used_addresses(self.networkipv6.id),
+            conf.IPv6_MIN, conf.IPv6_MAX)
 
         if selected_ip is None:
             raise IpNotAvailableError(None, u'No IP available to VLAN %s.' %
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import patch
+
+from networkapi.config.models import Configuration
+from networkapi.infrastructure.ipaddr import IPAddress
+from networkapi.infrastructure.ipaddr import IPv4Address
+from networkapi.infrastructure.ipaddr import IPv4Network
+from networkapi.infrastructure.ipaddr import IPv6Address
+from networkapi.infrastructure.ipaddr import IPv6Network
+from networkapi.ip.models import Ip
+from networkapi.ip.models import IpNotAvailableError
+from networkapi.ip.models import NetworkIPv4
+from networkapi.util.network import get_available_address
+from networkapi.util.network import get_first_free_address
+
+
+class FirstFreeAddressTestCase(unittest.TestCase):
+
+    def test_empty_range(self):
+        self.assertEqual(10, get_first_free_address(10, 20, []))
+        self.assertEqual(20, get_first_free_address(10, 20, [], True))
+
+    def test_gap_in_the_middle(self):
+        used = [13, 10, 11, 12, 15, 16]
+        self.assertEqual(14, get_first_free_address(10, 20, used))
+        self.assertEqual(18, get_first_free_address(10, 20, used + [20, 19],
+                                                    True))
+
+    def test_ignore_addresses_out_of_range(self):
+        used = [1, 2, 9, 10, 21, 22]
+        self.assertEqual(11, get_first_free_address(10, 20, used))
+        self.assertEqual(20, get_first_free_address(10, 20, used, True))
+
+    def test_exhausted_range(self):
+        used = range(10, 21)
+        self.assertIsNone(get_first_free_address(10, 20, used))
+        self.assertIsNone(get_first_free_address(10, 20, used, True))
+
+    def test_invalid_range(self):
+        self.assertIsNone(get_first_free_address(10, 9, []))
+
+
+class AvailableAddressTestCase(unittest.TestCase):
+
+    def test_skip_network_and_broadcast(self):
+        net = IPv4Network('10.0.0.0/30')
+        used = [int(IPv4Address('10.0.0.1'))]
+        self.assertEqual(IPv4Address('10.0.0.2'),
+                         get_available_address(net, used))
+        self.assertIsNone(get_available_address(
+            net, used + [int(IPv4Address('10.0.0.2'))]))
+
+    def test_point_to_point_network(self):
+        self.assertIsNone(
+            get_available_address(IPv4Network('10.0.0.0/31'), []))
+        self.assertIsNone(
+            get_available_address(IPv4Network('10.0.0.0/32'), []))
+
+    def assertAvailable(self, net, used, min_reserved, max_reserved,
+                        expected):
+        """expected is (with reservations, first, first top-down)."""
+
+        self.assertEqual(
+            tuple(None if ip is None else IPAddress(ip) for ip in expected),
+            (get_available_address(net, used, min_reserved, max_reserved),
+             get_available_address(net, used),
+             get_available_address(net, used, topdown=True)))
+
+    def test_ipv4(self):
+        net = IPv4Network('192.168.8.0/24')
+        base = int(net.network)
+        used = [base + i for i in range(1, 11)]
+
+        self.assertAvailable(net, [], 0, 0, (
+            '192.168.8.1', '192.168.8.1', '192.168.8.254'))
+        self.assertAvailable(net, used, 0, 0, (
+            '192.168.8.11', '192.168.8.11', '192.168.8.254'))
+        self.assertAvailable(net, used, 20, 0, (
+            '192.168.8.20', '192.168.8.11', '192.168.8.254'))
+        self.assertAvailable(
+            net, [base + i for i in range(1, 254)], 0, 1, (
+                '192.168.8.254', '192.168.8.254', '192.168.8.254'))
+        self.assertAvailable(
+            net, [base + i for i in range(1, 255) if i != 200], 3, 3, (
+                '192.168.8.200', '192.168.8.200', '192.168.8.200'))
+        self.assertAvailable(
+            net, [base + i for i in range(1, 255)], 0, 0, (None, None, None))
+
+    def test_ipv6(self):
+        net = IPv6Network('fdbe:bebe:bebe:11::/120')
+        base = int(net.network)
+
+        self.assertAvailable(net, [], 0, 0, (
+            'fdbe:bebe:bebe:11::1', 'fdbe:bebe:bebe:11::1',
+            'fdbe:bebe:bebe:11::fe'))
+        self.assertAvailable(net, [base + i for i in range(40)], 5, 0, (
+            'fdbe:bebe:bebe:11::28', 'fdbe:bebe:bebe:11::28',
+            'fdbe:bebe:bebe:11::fe'))
+        self.assertAvailable(
+            net, [base + i for i in range(256) if i not in (3, 250)], 5, 10,
+            (None, 'fdbe:bebe:bebe:11::3', 'fdbe:bebe:bebe:11::fa'))
+
+    def test_large_networks(self):
+        cases = [
+            # Almost full /16
+            (IPv4Network('10.10.0.0/16'), 65000, IPv4Address('10.10.253.233')),
+            # /64 with a contiguous allocated block at the beginning
+            (IPv6Network('fdbe:bebe:bebe:11::/64'), 20000,
+             IPv6Address('fdbe:bebe:bebe:11::4e21')),
+        ]
+        for net, allocated, expected in cases:
+            first = int(net.network) + 1
+            used = range(first, first + allocated)
+
+            self.assertEqual(expected,
+                             get_available_address(net, used, 5, 2))
+
+
+class IpGetAvailableTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.network = NetworkIPv4(
+            id=1, oct1=10, oct2=0, oct3=0, oct4=0, block=29)
+        self.conf = Configuration(IPv4_MIN=2, IPv4_MAX=1)
+        patch('networkapi.ip.models.NetworkIPv4.get_by_pk',
+              return_value=self.network).start()
+        patch('networkapi.config.models.Configuration.get',
+              return_value=self.conf).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def mock_used_addresses(self, ips):
+        patch('networkapi.ip.models.Ip.list_used_addresses',
+              return_value=[int(IPv4Address(ip)) for ip in ips]).start()
+
+    def test_get_available_ip_respects_configuration(self):
+        self.mock_used_addresses(['10.0.0.2', '10.0.0.4'])
+        self.assertEqual(IPv4Address('10.0.0.3'), Ip.get_available_ip(1))
+
+    def test_get_available_ip_given_no_ip_available(self):
+        self.mock_used_addresses(['10.0.0.%s' % i for i in range(2, 7)])
+        with self.assertRaises(IpNotAvailableError):
+            Ip.get_available_ip(1)
+
+    def test_get_first_available_ip_topdown(self):
+        self.mock_used_addresses(['10.0.0.6'])
+        self.assertEqual(IPv4Address('10.0.0.5'),
+                         Ip.get_first_available_ip(1, True))
+        self.assertEqual(IPv4Address('10.0.0.1'),
+                         Ip.get_first_available_ip(1))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import itertools
+import unittest
+
+from networkapi.infrastructure.ipaddr import IPNetwork
+from networkapi.util.network import get_free_subnet
+
+
+class FreeSubnetTestCase(unittest.TestCase):
+
+    def test_empty_network(self):
+        self.assertEqual(
+            IPNetwork('10.0.0.0/27'),
+            get_free_subnet(IPNetwork('10.0.0.0/24'), [], 27))
+
+    def test_skip_used_and_unaligned_space(self):
+        used = [IPNetwork('10.0.0.0/28'), IPNetwork('10.0.0.32/28')]
+        self.assertEqual(
+            IPNetwork('10.0.0.16/28'),
+            get_free_subnet(IPNetwork('10.0.0.0/24'), used, 28))
+        self.assertEqual(
+            IPNetwork('10.0.0.64/27'),
+            get_free_subnet(IPNetwork('10.0.0.0/24'), used, 27))
+
+    def test_ignore_networks_out_of_range(self):
+        used = [IPNetwork('10.0.1.0/24'), IPNetwork('10.0.0.0/16')]
+        self.assertEqual(
+            IPNetwork('10.0.0.0/25'),
+            get_free_subnet(IPNetwork('10.0.0.0/24'), used, 25))
+
+    def test_network_full(self):
+        used = [IPNetwork('10.0.0.0/25'), IPNetwork('10.0.0.128/26')]
+        self.assertIsNone(
+            get_free_subnet(IPNetwork('10.0.0.0/24'), used, 25))
+        self.assertIsNone(
+            get_free_subnet(IPNetwork('10.0.0.0/24'),
+                            [IPNetwork('10.0.0.0/24')], 30))
+
+    def test_invalid_prefix(self):
+        self.assertIsNone(get_free_subnet(IPNetwork('10.0.0.0/24'), [], 23))
+        self.assertIsNone(get_free_subnet(IPNetwork('10.0.0.0/24'), [], 33))
+
+    def test_ipv6(self):
+        net = IPNetwork('fdbe:bebe:bebe::/48')
+        used = [IPNetwork('fdbe:bebe:bebe::/52'),
+                IPNetwork('fdbe:bebe:bebe:1000::/56')]
+
+        self.assertEqual(IPNetwork('fdbe:bebe:bebe:1100::/56'),
+                         get_free_subnet(net, used, 56))
+        self.assertEqual(IPNetwork('fdbe:bebe:bebe:1100::/64'),
+                         get_free_subnet(net, used, 64))
+        self.assertEqual(IPNetwork('fdbe:bebe:bebe:2000::/52'),
+                         get_free_subnet(net, used, 52))
+
+    def test_many_networks(self):
+        net = IPNetwork('10.0.0.0/8')
+        subnets = list(itertools.islice(net.iter_subnets(new_prefix=24),
+                                        20000))
+        used = subnets[:12345] + subnets[12346:]
+
+        self.assertEqual(IPNetwork('10.48.57.0/24'),
+                         get_free_subnet(net, used, 24))
+        self.assertEqual(IPNetwork('10.78.32.0/23'),
+                         get_free_subnet(net, used, 23))
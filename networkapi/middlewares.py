@@ -15,10 +15,11 @@
 # limitations under the License.
 import logging
 
+from django.conf import settings
+
 from networkapi.api_rest.authentication import BasicAuthentication
 from networkapi.extra_logging import local
 from networkapi.rest import RestResource
-# from django.conf import settings
 
 
 class SQLLogMiddleware(object):
@@ -32,6 +33,13 @@ class SQLLogMiddleware(object):
         for q in connection.queries:
             self.log.debug(
                 u'Query: %s, Time spent: %s', q['sql'], q['time'])
+
+        # Queries are recorded by django only in debug mode
+        if settings.DEBUG:
+            self.log.debug(u'Request %s executed %s queries',
+                           request.get_full_path(), len(connection.queries))
+            response['X-Query-Count'] = len(connection.queries)
+
         return response
 
 
@@ -73,6 +81,8 @@ class TrackingRequestOnThreadLocalMiddleware(object):
                 user = RestResource.authenticate_user(request)
 
             if user is not None:
+                # Views and legacy resources reuse the authenticated user
+                request.user = user
                 ip = self._get_ip(request)
                 context = local.request_context
                 identity = local.request_id
@@ -14,10 +14,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from django.db.models.signals import post_delete
+from django.db.models.signals import post_init
 from django.db.models.signals import post_save
 from django.db.models.signals import pre_delete
 from django.db.models.signals import pre_save
 
+from networkapi.models.models_signal_receiver import audit_post_init
 from networkapi.models.models_signal_receiver import audit_post_save
 from networkapi.models.models_signal_receiver import audit_pre_delete
 from networkapi.models.models_signal_receiver import audit_pre_save
@@ -26,3 +28,4 @@ from networkapi.models.models_signal_receiver import audit_pre_save
 pre_save.connect(audit_pre_save)
 post_save.connect(audit_post_save)
 pre_delete.connect(audit_pre_delete)
+post_init.connect(audit_post_init)
@@ -15,6 +15,8 @@
 # limitations under the License.
 import logging
 import re
+import threading
+from contextlib import contextmanager
 
 from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
@@ -29,6 +31,12 @@ MODEL_LIST = set()
 LOG = logging.getLogger(__name__)
 DEFAULT_CACHE_TIMEOUT = 120
 
+# Event logs kept by audit_buffer are saved when this size is reached
+AUDIT_BUFFER_SIZE = 500
+
+# Event logs of the current thread waiting to be saved
+_audit_buffer = threading.local()
+
 
 def get_cache_key_for_instance(instance, cache_prefix='networkapi_event_log'):
 
@@ -69,6 +77,56 @@ def to_dict(obj):
     return state
 
 
+def snapshot(instance):
+    """Return values of the concrete fields of instance, as loaded."""
+
+    return dict((field.attname, instance.__dict__.get(field.attname))
+                for field in instance._meta.fields
+                if field.attname in instance.__dict__)
+
+
+def get_snapshot_value(field, value):
+    """Returns value of field in the form of get_value, from the value
+    kept in a snapshot."""
+
+    if field.rel is None or value is None:
+        return value
+
+    try:
+        related = field.rel.to._default_manager.get(
+            **{field.rel.field_name: value})
+        return {'id': related.id, 'value': related.__unicode__()}
+    except:
+        return value
+
+
+def changed_states(instance):
+    """Returns old and new states of the fields of instance changed since it
+    was loaded, in the form of to_dict, or None when instance has no
+    snapshot to compare.
+
+    Many to many fields are not changed by save, so they are not compared.
+    """
+
+    old_values = getattr(instance, '_audit_state', None)
+    if old_values is None or instance._state.adding:
+        return None
+
+    old_state = {}
+    new_state = {}
+    for field in instance._meta.fields:
+        if field.attname not in old_values or \
+                field.attname not in instance.__dict__:
+            return None
+
+        old_value = old_values[field.attname]
+        if old_value != instance.__dict__[field.attname]:
+            old_state[field.name] = get_snapshot_value(field, old_value)
+            new_state[field.name] = get_value(instance, field.name)
+
+    return old_state, new_state
+
+
 def dict_diff(old, new):
 
     keys = set(old.keys() + new.keys())
@@ -121,10 +179,18 @@ def save_audit(instance, operation, kwargs={}):
     try:
         persist_audit = True
 
-        new_state = to_dict(instance)
-        old_state = {}
+        states = None
+        if operation == EventLog.CHANGE and not m2m_change:
+            states = changed_states(instance)
+
+        if states is not None:
+            old_state, new_state = states
+        else:
+            new_state = to_dict(instance)
+            old_state = {}
         try:
-            if operation == EventLog.CHANGE and instance.pk:
+            if operation == EventLog.CHANGE and instance.pk and \
+                    states is None:
                 if not m2m_change:
                     old_state = to_dict(
                         instance.__class__.objects.get(pk=instance.pk))
@@ -206,13 +272,9 @@ def save_audit(instance, operation, kwargs={}):
                     event['audit_request'] = audit_request
                     # save the event log
                     if audit_request:
-                        EventLog.log(audit_request.user, event)
-                        if LOG_QUEUE:
-                            EventLogQueue.log(audit_request.user, event)
+                        log_event(audit_request.user, event)
                     else:
-                        EventLog.log(None, event)
-                        if LOG_QUEUE:
-                            EventLogQueue.log(None, event)
+                        log_event(None, event)
 
             else:
                 # obj_description = (instance and unicode(instance) and '')[:100]
@@ -231,17 +293,65 @@ def save_audit(instance, operation, kwargs={}):
                 event['id_objeto'] = instance.pk
                 event['audit_request'] = audit_request
                 if audit_request:
-                    EventLog.log(audit_request.user, event)
-                    if LOG_QUEUE:
-                        EventLogQueue.log(audit_request.user, event)
+                    log_event(audit_request.user, event)
                 else:
-                    EventLog.log(None, event)
-                    if LOG_QUEUE:
-                        EventLogQueue.log(None, event)
+                    log_event(None, event)
     except:
         LOG.error(u'Error registering auditing to %s: (%s) %s',
                   repr(instance), type(instance), getattr(instance, '__dict__', None), exc_info=True)
 
+
+def log_event(usuario, event):
+    """Saves event log, or keeps it when inside audit_buffer."""
+
+    events = getattr(_audit_buffer, 'events', None)
+    if events is None:
+        EventLog.log(usuario, event)
+        if LOG_QUEUE:
+            EventLogQueue.log(usuario, event)
+        return
+
+    events.append((usuario, dict(event)))
+    if len(events) >= AUDIT_BUFFER_SIZE:
+        flush_audit_buffer()
+
+
+def flush_audit_buffer():
+    """Saves event logs kept by audit_buffer with a single insert."""
+
+    events = getattr(_audit_buffer, 'events', None)
+    if not events:
+        return
+
+    _audit_buffer.events = []
+    EventLog.log_many(events)
+    if LOG_QUEUE:
+        EventLogQueue.log_many(events)
+
+
+@contextmanager
+def audit_buffer():
+    """Keeps event logs of the current thread and saves them together when
+    the outermost block exits.
+
+    Use it inside the transaction of the changes, so event logs are
+    committed or rolled back with them.
+    """
+
+    outermost = getattr(_audit_buffer, 'events', None) is None
+    if outermost:
+        _audit_buffer.events = []
+    try:
+        yield
+    finally:
+        if outermost:
+            try:
+                flush_audit_buffer()
+            except:
+                LOG.error(u'Error saving buffered auditing', exc_info=True)
+            finally:
+                _audit_buffer.events = None
+
 ###################
 # SIGNALS         #
 ###################
@@ -291,6 +401,20 @@ def audit_post_save(sender, instance, created, **kwargs):
     if created:
         save_audit(instance, EventLog.ADD)
 
+    instance._audit_state = snapshot(instance)
+
+
+def audit_post_init(sender, instance, **kwargs):
+    """Keeps loaded state of instance, so changes are audited without
+    loading it again."""
+
+    from networkapi.models.BaseModel import BaseModel
+
+    if (not issubclass(instance.__class__, BaseModel)):
+        return
+
+    instance._audit_state = snapshot(instance)
+
 
 def handle_unicode(s):
     if isinstance(s, basestring):
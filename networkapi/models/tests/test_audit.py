@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import patch
+
+from networkapi.eventlog.models import EventLog
+from networkapi.models.models_signal_receiver import audit_buffer
+from networkapi.models.models_signal_receiver import changed_states
+from networkapi.models.models_signal_receiver import save_audit
+from networkapi.system.models import Variable
+
+
+def loaded_variable(**kwargs):
+    """Returns variable as it is after being loaded from database."""
+
+    variable = Variable(**kwargs)
+    variable._state.adding = False
+    return variable
+
+
+class AuditTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.log = patch(
+            'networkapi.models.models_signal_receiver.EventLog.log').start()
+        self.log_many = patch(
+            'networkapi.models.models_signal_receiver.EventLog.log_many'
+        ).start()
+        self.get = patch.object(Variable.objects, 'get',
+                                side_effect=AssertionError).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_changed_states_from_loaded_state(self):
+        variable = loaded_variable(id=1, name='var', value='1',
+                                   description='desc')
+        variable.value = '2'
+
+        self.assertEqual(({'value': '1'}, {'value': '2'}),
+                         changed_states(variable))
+
+    def test_changed_states_without_loaded_state(self):
+        variable = Variable(id=1, name='var', value='1')
+        self.assertIsNone(changed_states(variable))
+
+    def test_change_audited_without_loading_instance(self):
+        variable = loaded_variable(id=1, name='var', value='1',
+                                   description='desc')
+        variable.value = '2'
+
+        save_audit(variable, EventLog.CHANGE)
+
+        self.assertFalse(self.get.called)
+        event = self.log.call_args[0][1]
+        self.assertEqual('Alterar', event['acao'])
+        self.assertEqual({'value': b'1'}, event['parametro_anterior'])
+        self.assertEqual({'value': b'2'}, event['parametro_atual'])
+
+    def test_unchanged_instance_is_not_audited(self):
+        variable = loaded_variable(id=1, name='var', value='1')
+
+        save_audit(variable, EventLog.CHANGE)
+
+        self.assertFalse(self.log.called)
+
+    def test_buffered_events(self):
+        with audit_buffer():
+            with audit_buffer():
+                for value in ('2', '3', '4'):
+                    variable = loaded_variable(id=1, name='var', value='1')
+                    variable.value = value
+                    save_audit(variable, EventLog.CHANGE)
+            self.assertFalse(self.log_many.called)
+
+        self.assertFalse(self.log.called)
+        self.assertEqual(1, self.log_many.call_count)
+        events = self.log_many.call_args[0][0]
+        self.assertEqual([b'2', b'3', b'4'],
+                         [event['parametro_atual']['value']
+                          for user, event in events])
+
+    def test_buffered_events_saved_on_error(self):
+        with self.assertRaises(ValueError):
+            with audit_buffer():
+                variable = loaded_variable(id=1, name='var', value='1')
+                variable.value = '2'
+                save_audit(variable, EventLog.CHANGE)
+                raise ValueError()
+
+        self.assertEqual(1, self.log_many.call_count)
+
+        save_audit(variable, EventLog.DELETE)
+        self.assertEqual(1, self.log.call_count)
@@ -17,6 +17,7 @@ import logging
 import os
 import re
 from time import sleep
+from time import time
 
 from django.template import Context
 from django.template import Template
@@ -46,7 +47,6 @@ class Generic(BasePlugin):
 
     MAX_TRIES = 10
     RETRY_WAIT_TIME = 5
-    WAIT_FOR_CLI_RETURN = 1
     CURRENTLY_BUSY_WAIT = 'Currently busy with copying a file'
     INVALID_REGEX = '([Ii]nvalid)|overlaps with'
     WARNING_REGEX = 'config ignored|Warning'
@@ -277,16 +277,20 @@ class Generic(BasePlugin):
         if wait_str_failed_regex is None:
             wait_str_failed_regex = self.ERROR_REGEX
 
+        deadline = time() + self.RECV_TIMEOUT
         string_ok = 0
         recv_string = ''
+        partial_line = ''
         while not string_ok:
-            while not self.channel.recv_ready():
-                sleep(self.WAIT_FOR_CLI_RETURN)
+            chunk = self.recv_chunk(deadline)
+            recv_string += chunk
+            file_name_string = self.removeDisallowedChars(chunk)
 
-            recv_string = self.channel.recv(9999)
-            file_name_string = self.removeDisallowedChars(recv_string)
+            # A line split between chunks is checked again when complete
+            received = partial_line + chunk
+            partial_line = received[received.rfind('\n') + 1:]
 
-            for output_line in recv_string.splitlines():
+            for output_line in received.splitlines():
                 if re.search(self.CURRENTLY_BUSY_WAIT, output_line):
                     log.warning('Need to wait - Switch busy: %s' % output_line)
                     raise exceptions.CurrentlyBusyErrorException()
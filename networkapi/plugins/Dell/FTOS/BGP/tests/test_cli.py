@@ -236,27 +236,21 @@ class CliPluginTestCaseSuccess(TestCase):
         string = plugin._wait_string('ok')
 
         self.assertEqual(plugin.channel.recv.call_count, 2)
-        self.assertEqual(string, 'ok')
-
-    def test_wait_string_sleep(self):
-        sleep_mock = patch(
-            'networkapi.plugins.Dell.FTOS.BGP.Cli.sleep').start()
+        self.assertEqual(string, 'testok')
 
+    def test_wait_string_select(self):
         plugin = Generic()
 
         plugin.channel = Mock()
         plugin.channel.recv.side_effect = ['ok']
         plugin.channel.recv_ready.side_effect = [False, True]
 
-        plugin._wait_string('ok')
-
-        sleep_mock.assert_called_once_with(1)
-        self.assertEqual(sleep_mock.call_count, 1)
+        with patch('networkapi.plugins.base.select.select') as select_mock:
+            plugin._wait_string('ok')
 
-    def test_wait_string_2_sleep(self):
+        select_mock.assert_called_once_with([plugin.channel], [], [], 0.1)
 
-        sleep_mock = patch(
-            'networkapi.plugins.Dell.FTOS.BGP.Cli.sleep').start()
+    def test_wait_string_2_select(self):
 
         plugin = Generic()
 
@@ -264,10 +258,24 @@ class CliPluginTestCaseSuccess(TestCase):
         plugin.channel.recv.side_effect = ['ok']
         plugin.channel.recv_ready.side_effect = [False, False, True]
 
-        plugin._wait_string('ok')
+        with patch('networkapi.plugins.base.select.select') as select_mock:
+            plugin._wait_string('ok')
+
+        select_mock.assert_called_with([plugin.channel], [], [], 0.1)
+        self.assertEqual(select_mock.call_count, 2)
+
+    def test_wait_string_line_split_between_chunks(self):
+
+        plugin = Generic()
+
+        plugin.channel = Mock()
+        plugin.channel.recv.side_effect = ['1024 bytes succ',
+                                           'essfully copied\r\n']
 
-        sleep_mock.assert_called_with(1)
-        self.assertEqual(sleep_mock.call_count, 2)
+        string = plugin._wait_string('bytes successfully copied')
+
+        self.assertEqual(plugin.channel.recv.call_count, 2)
+        self.assertEqual(string, '1024 bytes successfully copied\r\n')
 
     def test_copy_script_file_to_config(self):
 
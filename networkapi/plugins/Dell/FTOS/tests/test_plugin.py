@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock import Mock
+from mock import patch
+
+from networkapi.plugins.Dell.FTOS.plugin import FTOS
+
+
+class WaitStringTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patch('networkapi.util.decorators.get_variable',
+              return_value='0').start()
+
+        self.plugin = FTOS(equipment_access=Mock())
+        self.plugin.channel = Mock()
+        self.plugin.channel.recv_ready.return_value = True
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_returns_all_chunks(self):
+        self.plugin.channel.recv.side_effect = ['1024 bytes succ',
+                                                'essfully copied\r\n']
+
+        recv = self.plugin.waitString('bytes successfully copied')
+
+        self.assertEqual('1024 bytes successfully copied\r\n', recv)
+
+    def test_ensure_privilege_level_split_between_chunks(self):
+        self.plugin.channel.recv.side_effect = [
+            'switch#', 'Current privi', 'lege level is 15\r\nswitch#']
+
+        self.plugin.ensure_privilege_level()
+
+        self.assertEqual(['\n', 'show privilege\n'],
+                         [call[0][0] for call in
+                          self.plugin.channel.send.call_args_list])
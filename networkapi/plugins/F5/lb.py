@@ -1,14 +1,58 @@
 # -*- coding: utf-8 -*-
 import logging
+import os
+import stat
+from contextlib import contextmanager
+from threading import Lock
 from time import sleep
+from time import time
 
 import bigsuds
 
 from networkapi.plugins import exceptions as base_exceptions
+from networkapi.settings import F5_SESSION_IDLE_TIME
+from networkapi.settings import F5_SESSION_POOL_SIZE
+from networkapi.settings import F5_WSDL_CACHE_DIR
 from networkapi.system.facade import get_value as get_variable
 
 log = logging.getLogger(__name__)
 
+# Idle sessions are checked with the device before being reused after
+# this many seconds
+SESSION_CHECK_TIME = 10
+
+# Session pools by device and credentials
+_pools = dict()
+_pools_lock = Lock()
+
+
+def get_wsdl_cache_dir():
+    """Return directory of the WSDL cache, created private to the user of
+    the process, or None to not cache WSDLs when it is not configured or is
+    not private.
+    """
+
+    if not F5_WSDL_CACHE_DIR:
+        return None
+
+    cache_dir = os.path.expanduser(F5_WSDL_CACHE_DIR)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, 0700)
+        cache_stat = os.stat(cache_dir)
+    except OSError, e:
+        log.warning('WSDLs not cached, unable to use %s: %s' %
+                    (cache_dir, e))
+        return None
+
+    if cache_stat.st_uid != os.getuid() or \
+            cache_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        log.warning('WSDLs not cached, %s is not private to the user of '
+                    'the application' % cache_dir)
+        return None
+
+    return cache_dir
+
 
 class Lb(object):
 
@@ -18,12 +62,14 @@ class Lb(object):
         self._username = username
         self._password = password
         self._time_reconn = 10
+        self._transaction_timeout = None
 
         try:
             self._channel = bigsuds.BIGIP(
                 hostname=self._hostname,
                 username=self._username,
-                password=self._password
+                password=self._password,
+                cachedir=get_wsdl_cache_dir()
             )
 
         except Exception, e:
@@ -64,8 +110,108 @@ class Lb(object):
                     'There are too many existing user sessions. '
                     'Trying again in %s seconds' % self._time_reconn)
                 sleep(self._time_reconn)
-                self.get_session()
+                return self.get_session()
             else:
                 raise e
         else:
             return channel
+
+    def is_alive(self):
+        """Check if the device still answers to this session."""
+
+        try:
+            self._channel.System.SystemInfo.get_version()
+        except Exception, e:
+            log.warning('Session of %s is not valid anymore: %s' %
+                        (self._hostname, e))
+            return False
+        return True
+
+    def set_transaction_timeout(self, timeout):
+        """Set transaction timeout once for each session."""
+
+        if self._transaction_timeout != timeout:
+            self._channel.System.Session.set_transaction_timeout(timeout)
+            self._transaction_timeout = timeout
+
+
+class LbPool(object):
+
+    """Idle sessions of a device, reused by the plugin calls of the process
+    instead of connecting and creating a new session for each call.
+    """
+
+    def __init__(self, hostname, username, password, session=True,
+                 size=F5_SESSION_POOL_SIZE, idle_time=F5_SESSION_IDLE_TIME):
+
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.session_id = session
+        self.size = size
+        self.idle_time = idle_time
+        self._idle = list()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Return the last released valid session or a new one."""
+
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                lb, released = self._idle.pop()
+
+            idle = time() - released
+            if idle > self.idle_time:
+                log.info('Discarding session of %s idle for %.0fs' %
+                         (self.hostname, idle))
+                continue
+            if idle > SESSION_CHECK_TIME and not lb.is_alive():
+                continue
+
+            log.info('Reusing session of %s' % self.hostname)
+            return lb
+
+        return Lb(self.hostname, self.username, self.password,
+                  self.session_id)
+
+    def release(self, lb):
+        """Keep session to be reused while there is room in the pool."""
+
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((lb, time()))
+
+    @contextmanager
+    def session(self):
+        """Lend a session, sessions of failed calls are not reused."""
+
+        lb = self.acquire()
+        yield lb
+        self.release(lb)
+
+    def clear(self):
+        with self._lock:
+            self._idle = list()
+
+
+def get_pool(hostname, username, password, session=True):
+    """Return the session pool of the process for a device."""
+
+    key = (hostname, username, password, session)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = LbPool(hostname, username, password, session)
+            _pools[key] = pool
+    return pool
+
+
+def clear_pools():
+    """Forget every idle session of the process."""
+
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.clear()
+        _pools.clear()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from mock import MagicMock
+from mock import patch
+
+from networkapi.plugins import exceptions as base_exceptions
+from networkapi.plugins.F5 import lb
+from networkapi.plugins.F5 import util
+
+
+class StubBIGIP(object):
+
+    """iControl endpoint answering the calls made by Lb."""
+
+    instances = list()
+
+    def __init__(self, session_id=None, **kwargs):
+        self.session_id = session_id
+        self.alive = True
+        self.System = MagicMock()
+        self.System.SystemInfo.get_version.side_effect = self.get_version
+        self.System.Session.get_session_timeout.return_value = 60
+        StubBIGIP.instances.append(self)
+
+    def get_version(self):
+        if not self.alive:
+            raise Exception('Session expired')
+        return 'BIG-IP_v11.5.1'
+
+    def with_session_id(self):
+        return StubBIGIP(session_id=len(StubBIGIP.instances))
+
+
+class Plugin(object):
+
+    @util.connection
+    def call(self, obj, fail=False):
+        if fail:
+            raise ValueError('Command failed')
+        return self._lb
+
+    @util.connection
+    def nested_call(self, obj):
+        current = self._lb
+        self.call(obj)
+        return current is self._lb
+
+
+def equipment():
+    access = MagicMock(fqdn='lb.test', user='user', password='pass')
+    queryset = MagicMock()
+    queryset.filter.return_value.uniqueResult.return_value = access
+    return {'access': queryset}
+
+
+class LbPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        StubBIGIP.instances = list()
+        patch('networkapi.plugins.F5.lb.bigsuds.BIGIP', StubBIGIP).start()
+        patch('networkapi.plugins.F5.lb.get_variable',
+              return_value='60').start()
+        self.time = patch('networkapi.plugins.F5.lb.time',
+                          return_value=1000.0).start()
+
+    def tearDown(self):
+        patch.stopall()
+        lb.clear_pools()
+
+    def test_reuse_session(self):
+        plugin = Plugin()
+        first = plugin.call(equipment())
+        self.assertIs(first, plugin.call(equipment()))
+        # Device connection and one session
+        self.assertEqual(2, len(StubBIGIP.instances))
+        first._channel.System.Session.set_transaction_timeout\
+            .assert_called_once_with(60)
+        self.assertIsNone(getattr(plugin, '_lb', None))
+
+    def test_failed_call_discards_session(self):
+        plugin = Plugin()
+        first = plugin.call(equipment())
+        with self.assertRaises(ValueError):
+            plugin.call(equipment(), fail=True)
+        self.assertIsNot(first, plugin.call(equipment()))
+
+    def test_nested_calls_use_their_own_session(self):
+        plugin = Plugin()
+        self.assertTrue(plugin.nested_call(equipment()))
+        pool = lb.get_pool('lb.test', 'user', 'pass')
+        self.assertEqual(2, len(pool._idle))
+
+    def test_idle_expiry(self):
+        plugin = Plugin()
+        first = plugin.call(equipment())
+        self.time.return_value += lb.F5_SESSION_IDLE_TIME + 1
+        self.assertIsNot(first, plugin.call(equipment()))
+
+    def test_health_check(self):
+        plugin = Plugin()
+        first = plugin.call(equipment())
+        self.time.return_value += lb.SESSION_CHECK_TIME + 1
+        self.assertIs(first, plugin.call(equipment()))
+
+        self.time.return_value += lb.SESSION_CHECK_TIME + 1
+        first._channel.alive = False
+        self.assertIsNot(first, plugin.call(equipment()))
+
+    def test_pool_size(self):
+        pool = lb.LbPool('lb.test', 'user', 'pass', size=1)
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual([first], [item[0] for item in pool._idle])
+
+    def test_connection_error(self):
+        with patch('networkapi.plugins.F5.lb.bigsuds.BIGIP',
+                   side_effect=IOError):
+            with self.assertRaises(base_exceptions.CommandErrorException):
+                lb.get_pool('lb.test', 'user', 'pass').acquire()
+
+
+class WsdlCacheDirTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.parent = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.parent, 'wsdl')
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.parent)
+
+    def test_not_configured(self):
+        patch.object(lb, 'F5_WSDL_CACHE_DIR', None).start()
+
+        self.assertIsNone(lb.get_wsdl_cache_dir())
+
+    def test_created_private(self):
+        patch.object(lb, 'F5_WSDL_CACHE_DIR', self.cache_dir).start()
+
+        self.assertEqual(self.cache_dir, lb.get_wsdl_cache_dir())
+        self.assertEqual(0, os.stat(self.cache_dir).st_mode &
+                         (stat.S_IRWXG | stat.S_IRWXO))
+
+    def test_not_private(self):
+        patch.object(lb, 'F5_WSDL_CACHE_DIR', self.cache_dir).start()
+        os.mkdir(self.cache_dir)
+        os.chmod(self.cache_dir, 0o777)
+
+        self.assertIsNone(lb.get_wsdl_cache_dir())
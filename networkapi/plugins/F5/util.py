@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 
 import copy
 import logging
+from contextlib import contextmanager
 from functools import wraps
 
 import bigsuds
@@ -27,6 +28,19 @@ def logger(func):
     return inner
 
 
+@contextmanager
+def lb_session(plugin, access, session=True):
+    """Lend a pooled session of the device of access to plugin._lb."""
+
+    previous = getattr(plugin, '_lb', None)
+    try:
+        pool = lb.get_pool(access.fqdn, access.user, access.password, session)
+        with pool.session() as plugin._lb:
+            yield plugin._lb
+    finally:
+        plugin._lb = previous
+
+
 def transation(func):
     @wraps(func)
     def inner(self, *args, **kwargs):
@@ -34,13 +48,13 @@ def transation(func):
             try:
                 access = args[0].get('access').filter(
                     tipo_acesso__protocolo='https').uniqueResult()
-                self._lb = lb.Lb(access.fqdn, access.user, access.password)
-                if not kwargs.__contains__('transation') or kwargs['transation']:
-                    log.info('Transaction Started')
-                    with bigsuds.Transaction(self._lb._channel):
+                with lb_session(self, access):
+                    if not kwargs.__contains__('transation') or kwargs['transation']:
+                        log.info('Transaction Started')
+                        with bigsuds.Transaction(self._lb._channel):
+                            return func(self, *args, **kwargs)
+                    else:
                         return func(self, *args, **kwargs)
-                else:
-                    return func(self, *args, **kwargs)
             except bigsuds.OperationFailed, e:
                 log.error(e)
                 raise base_exceptions.CommandErrorException(e)
@@ -58,9 +72,9 @@ def connection(func):
         try:
             access = args[0].get('access').filter(
                 tipo_acesso__protocolo='https').uniqueResult()
-            self._lb = lb.Lb(access.fqdn, access.user, access.password)
-            self._lb._channel.System.Session.set_transaction_timeout(60)
-            return func(self, *args, **kwargs)
+            with lb_session(self, access):
+                self._lb.set_transaction_timeout(60)
+                return func(self, *args, **kwargs)
         except bigsuds.OperationFailed, e:
             log.error(e)
             raise base_exceptions.CommandErrorException(e)
@@ -73,8 +87,8 @@ def connection_simple(func):
         try:
             access = args[0].get('access').filter(
                 tipo_acesso__protocolo='https').uniqueResult()
-            self._lb = lb.Lb(access.fqdn, access.user, access.password, False)
-            return func(self, *args, **kwargs)
+            with lb_session(self, access, False):
+                return func(self, *args, **kwargs)
         except bigsuds.OperationFailed, e:
             log.error(e)
             raise base_exceptions.CommandErrorException(e)
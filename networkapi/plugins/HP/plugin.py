@@ -18,6 +18,7 @@ import re
 import logging
 import string
 from time import sleep
+from time import time
 
 from networkapi.plugins import exceptions
 from networkapi.plugins.base import BasePlugin
@@ -101,23 +102,26 @@ class HPE(BasePlugin):
 
         confirm_regex = "[Y/N]"
         confirm_command = 'Y'
+        deadline = time() + self.RECV_TIMEOUT
         string_ok = 0
         recv_string = ''
         while not string_ok:
-            while not self.channel.recv_ready():
-                sleep(1)
-            recv_string = self.channel.recv(9999)
-            file_name_string = self.removeDisallowedChars(recv_string)
-            if re.search(wait_str_failed_regex, recv_string):
-                log.error('Equipment raised INVALID error: %s' % recv_string)
+            start = max(0, len(recv_string) - self.RECV_MATCH_OVERLAP)
+            chunk = self.recv_chunk(deadline)
+            recv_string += chunk
+            new_string = recv_string[start:]
+            file_name_string = self.removeDisallowedChars(new_string)
+            if re.search(wait_str_failed_regex, new_string):
+                log.error('Equipment raised INVALID error: %s' % new_string)
                 raise exceptions.InvalidCommandException(file_name_string)
-            elif re.search(wait_str_invalid_regex, recv_string):
-                log.error('Equipment raised Failed error: %s' % recv_string)
+            elif re.search(wait_str_invalid_regex, new_string):
+                log.error('Equipment raised Failed error: %s' % new_string)
                 raise exceptions.CommandErrorException(file_name_string)
-            elif re.search(wait_str_ok_regex, recv_string):
-                log.debug('Equipment output: %s' % recv_string)
+            elif re.search(wait_str_ok_regex, new_string):
+                log.debug('Equipment output: %s' % new_string)
                 string_ok = 1
-            elif re.search(confirm_regex, recv_string):
+            # Answer each confirmation only once
+            elif re.search(confirm_regex, chunk):
                 self.channel.send('%s\n' % confirm_command)
 
         return recv_string
\ No newline at end of file
@@ -16,21 +16,39 @@
 
 import logging
 import json
+import threading
+from collections import OrderedDict
+from time import time
 from enum import Enum
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import HTTPError
 
 from django.core.exceptions import ObjectDoesNotExist
 
+from networkapi.distributedlock import acquire_locks
+from networkapi.distributedlock import distributedlock
+from networkapi.distributedlock import LOCK_ODL_NODE
+from networkapi.distributedlock import release_locks
 from networkapi.plugins import exceptions
 from networkapi.plugins.SDN.base import BaseSdnPlugin
 from networkapi.equipamento.models import EquipamentoAcesso
 from networkapi.plugins.SDN.ODL.flows.acl import AclFlowBuilder
+from networkapi.plugins.SDN.ODL.flows.reconciler import FlowsReconciler
+from networkapi.settings import DEPLOY_WORKERS
+from networkapi.system.exceptions import VariableDoesNotExistException
+from networkapi.system.facade import get_value
+from networkapi.util.fanout import fan_out
 
 log = logging.getLogger(__name__)
 
+# Nodes ids of each controller, shared by plugins of the same controller
+_nodes_cache = {}
+_nodes_cache_lock = threading.Lock()
+_session_lock = threading.Lock()
+
 
 class FlowTypes(Enum):
     """ Inner class that holds the Enumeration of flow types """
@@ -44,6 +62,13 @@ class ODLPlugin(BaseSdnPlugin):
 
     versions = ["BERYLLIUM", "BORON", "CARBON", "NITROGEN"]
 
+    # Seconds the nodes ids of a controller are reused without asking it
+    NODES_CACHE_TTL = 10
+
+    # Variable with the ids, separated by comma, of the environments whose
+    # controller and switches match port ranges with Nicira masks
+    PORT_MASKS_VARIABLE = 'sdn_port_masks_environments'
+
     def __init__(self, **kwargs):
 
         super(ODLPlugin, self).__init__(**kwargs)
@@ -65,54 +90,145 @@ class ODLPlugin(BaseSdnPlugin):
     def add_flow(self, data=None, flow_id=0, flow_type=FlowTypes.ACL, nodes_ids=[]):
 
         if flow_type == FlowTypes.ACL:
-            builder = AclFlowBuilder(data, self.environment, version=self.version)
+            builder = AclFlowBuilder(data, self.environment, version=self.version,
+                                     port_masks=self._uses_port_masks())
 
             flows_set = builder.build()
+
+        if nodes_ids == []:
+            nodes_ids = self._get_nodes_ids()
+
+        locks = acquire_locks([self._node_lock_key(node_id)
+                               for node_id in nodes_ids])
         try:
+            tables = fan_out([(node_id, node_id) for node_id in nodes_ids],
+                             self._read_node_flows)
+
+            # Flows are added to the table of each node while they are
+            # built, replacing the current ones with the same id
+            added = False
             for flows in flows_set:
                 for flow in flows['flow']:
+                    added = True
+                    for table in tables.itervalues():
+                        table[flow['id']] = flow
 
-                    self._flow(flow_id=flow['id'],
-                               method='put',
-                               data=json.dumps({'flow': [flow]}),
-                               nodes_ids=nodes_ids)
-        except HTTPError as e:
-            raise exceptions.CommandErrorException(
-                                msg=self._parse_errors(e.response.json()))
+            if added:
+                fan_out(tables.items(), self._put_flows)
+        finally:
+            release_locks(locks)
 
+    def _read_node_flows(self, node_id, _):
+        """ Returns OrderedDict of the flows of table 0 of a node by id """
+
+        return OrderedDict((flow['id'], flow) for flow in
+                           self._table_flows(self._get_table(node_id)))
 
     def del_flow(self, flow_id=0, nodes_ids=[]):
-        return self._flow(flow_id=flow_id, method='delete', nodes_ids=nodes_ids)
+
+        if nodes_ids == []:
+            nodes_ids = self._get_nodes_ids()
+
+        return_flows = []
+        for node_id in nodes_ids:
+            with self._node_lock(node_id):
+                return_flows.extend(self._flow(flow_id=flow_id,
+                                               method='delete',
+                                               nodes_ids=[node_id]))
+
+        return return_flows
 
 
     def update_all_flows(self, data, flow_type=FlowTypes.ACL):
-        current_flows = self.get_flows()
 
-        for node in current_flows.keys():
+        if flow_type == FlowTypes.ACL:
+            builder = AclFlowBuilder(data, self.environment, version=self.version,
+                                     port_masks=self._uses_port_masks())
+            reconciler = FlowsReconciler(builder.build())
+
+        def update_node(node, reconciler):
             log.info("Starting update all flows for node %s"%node)
 
-            if flow_type == FlowTypes.ACL:
-                builder = AclFlowBuilder(data, self.environment, version=self.version)
-                new_flows_set = builder.build()
+            with self._node_lock(node):
+                #Makes a diff
+                current = self._table_flows(self._get_table(node))
+                operations = reconciler.diff(current)
 
-            #Makes a diff
-            operations = self._diff_flows(current_flows[node], new_flows_set)
+                try:
+                    self._write_flows(node, current,
+                                      insert=operations["insert"] +
+                                      operations["update"],
+                                      delete=operations["delete"])
 
-            try:
-                for flow in operations["delete"]:
-                    self.del_flow(flow_id=flow['id'], nodes_ids=[node])
+                except exceptions.CommandErrorException as e:
+                    log.error("ERROR while updating all flows: %s" %
+                              e.detail)
+                    raise
+
+        fan_out([(node_id, reconciler) for node_id in self._get_nodes_ids()],
+                update_node)
+
+    def _node_lock(self, node_id):
+        """ Lock of the flows of a node, held while its table is read and
+        written back, so writes of other tasks are not lost
+        """
+
+        return distributedlock(self._node_lock_key(node_id))
+
+    def _uses_port_masks(self):
+        """ Returns if flows of the environment of the plugin can match
+            masked port blocks. Port ranges are expanded port by port when
+            the variable does not list it.
+        """
+
+        try:
+            environments = get_value(self.PORT_MASKS_VARIABLE)
+        except VariableDoesNotExistException:
+            return False
+
+        return str(self.environment) in [
+            env.strip() for env in environments.split(',')]
+
+    def _node_lock_key(self, node_id):
+        return LOCK_ODL_NODE % (self._get_host(), node_id)
 
-                for flow in operations["insert"]:
-                    self._flow(flow_id=flow['id'],
-                               method='put',
-                               data=json.dumps({'flow': [flow]}),
-                               nodes_ids=[node])
+    def _write_flows(self, node_id, current, insert=None, delete=None):
+        """ Writes table 0 of a node with a single request, must be called
+        holding the lock of the node.
+
+        The flows of the table are the current ones, without the deleted
+        ones and with the inserted ones added or replaced by id, so the
+        controller only sends to the switch the flows that changed.
+        """
 
-            except Exception as e:
-                message = self._parse_errors(e.response.json())
-                log.error("ERROR while updating all flows: %s" % message)
-                raise exceptions.CommandErrorException(msg=message)
+        if not insert and not delete:
+            return
+
+        flows = OrderedDict((flow['id'], flow) for flow in current)
+        for flow in delete or []:
+            flows.pop(flow['id'], None)
+        for flow in insert or []:
+            flows[flow['id']] = flow
+
+        return self._put_flows(node_id, flows)
+
+    def _put_flows(self, node_id, flows):
+        """ Replaces table 0 of a node by the flows of OrderedDict flows,
+        must be called holding the lock of the node
+        """
 
+        if not flows:
+            return self._delete_table(node_id)
+
+        data = {'flow-node-inventory:table': [{'id': 0,
+                                               'flow': flows.values()}]}
+        try:
+            return self._request(method='put',
+                                 path=self._table_path(node_id),
+                                 data=json.dumps(data), contentType='json')
+        except HTTPError as e:
+            raise exceptions.CommandErrorException(
+                msg=self._parse_errors(e.response.json()))
 
     def flush_flows(self):
         nodes_ids = self._get_nodes_ids()
@@ -120,21 +236,21 @@ class ODLPlugin(BaseSdnPlugin):
         #     raise exceptions.ControllerInventoryIsEmpty(msg="No nodes found")
 
         for node_id in nodes_ids:
-            try:
-                path = "/restconf/config/opendaylight-inventory:nodes/node/" \
-                       "%s/flow-node-inventory:table/0/" % node_id
+            with self._node_lock(node_id):
+                self._delete_table(node_id)
 
-                self._request(
-                    method="delete", path=path, contentType='json'
-                )
-            except HTTPError as e:
-                if e.response.status_code == 404:
-                    pass
-                else:
-                    raise exceptions.CommandErrorException(
-                        msg=self._parse_errors(e.response.json()))
-            except Exception as e:
-                raise e
+    def _delete_table(self, node_id):
+        """ Removes table 0 of a node with all its flows """
+
+        try:
+            self._request(
+                method="delete", path=self._table_path(node_id),
+                contentType='json'
+            )
+        except HTTPError as e:
+            if e.response.status_code != 404:
+                raise exceptions.CommandErrorException(
+                    msg=self._parse_errors(e.response.json()))
 
     def _parse_errors(self, err_json):
         """ Generic message creator to format errors """
@@ -189,30 +305,58 @@ class ODLPlugin(BaseSdnPlugin):
 
         flows_list = {}
         for node_id in nodes_ids:
-            try:
-                path = "/restconf/config/opendaylight-inventory:nodes/node/" \
-                       "%s/flow-node-inventory:table/0/" % (node_id)
+            flows_list[node_id] = self._get_table(node_id)
 
-                inventory = self._request(
-                    method="get",
-                    path=path,
-                    contentType='json'
-                )
+        return flows_list
 
-                flows_list[node_id] = inventory["flow-node-inventory:table"]
+    def _get_table(self, node_id):
+        """ Returns table 0 of a node as sent by the controller, a list
+        with the table, or an empty list if the node has no flows
+        """
 
-            except HTTPError as e:
-                if e.response.status_code == 404:
-                    flows_list[node_id] = []
-                else:
-                    raise exceptions.CommandErrorException(
-                        msg=self._parse_errors(e.response.json()))
-            except Exception as e:
-                raise e
+        try:
+            inventory = self._request(
+                method="get",
+                path=self._table_path(node_id),
+                contentType='json'
+            )
 
-        return flows_list
+            return inventory["flow-node-inventory:table"]
+
+        except HTTPError as e:
+            if e.response.status_code == 404:
+                return []
+            raise exceptions.CommandErrorException(
+                msg=self._parse_errors(e.response.json()))
+
+    def _table_flows(self, table):
+        """ Returns the flows of a table returned by _get_table """
+
+        if table == []:
+            return []
+        return table[0].get('flow', [])
+
+    def _table_path(self, node_id):
+        return "/restconf/config/opendaylight-inventory:nodes/node/" \
+               "%s/flow-node-inventory:table/0/" % node_id
 
     def _get_nodes_ids(self):
+        """ Returns the nodes ids of the controller, asking it at most
+        once in NODES_CACHE_TTL seconds
+        """
+
+        host = self._get_host()
+        with _nodes_cache_lock:
+            cached = _nodes_cache.get(host)
+        if cached is not None and time() - cached[0] < self.NODES_CACHE_TTL:
+            return list(cached[1])
+
+        nodes_ids = self._fetch_nodes_ids()
+        with _nodes_cache_lock:
+            _nodes_cache[host] = (time(), nodes_ids)
+        return list(nodes_ids)
+
+    def _fetch_nodes_ids(self):
         #TODO: We need to check on newer versions (later to Berylliun) if the
         # check on both config and operational is still necessary
         path1 = "/restconf/config/network-topology:network-topology/topology/flow:1/"
@@ -282,7 +426,7 @@ class ODLPlugin(BaseSdnPlugin):
 
         try:
             # Raises AttributeError if method is not valid
-            func = getattr(requests, params["method"])
+            func = getattr(self._get_session(), params["method"])
             request = func(
                 uri,
                 auth=self._get_auth(),
@@ -309,6 +453,27 @@ class ODLPlugin(BaseSdnPlugin):
                       'ie: GET, POST, PUT, DELETE')
 
 
+    def _get_session(self):
+        """ Returns the HTTP session of the plugin, keeping connections to
+        the controller open between requests, one for each worker pushing
+        flows to nodes
+        """
+
+        with _session_lock:
+            if getattr(self, '_session', None) is None:
+                adapter = HTTPAdapter(pool_maxsize=DEPLOY_WORKERS)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+        return self._session
+
+    def __getstate__(self):
+        # Plugins are pickled to async tasks, connections are not sent
+        state = self.__dict__.copy()
+        state.pop('_session', None)
+        return state
+
     def _get_auth(self):
         return self._basic_auth()
 
@@ -352,68 +517,3 @@ class ODLPlugin(BaseSdnPlugin):
             log.error('Access type %s not found for equipment %s.' %
                       ('https', self.equipment.nome))
             raise exceptions.InvalidEquipmentAccessException()
-
-    def _diff_flows(self, current_data, new_data):
-        #This function compares the current applied data with the desired new data
-        #returning a dict containing
-        # operation: the action that should be taken (delete or insert)
-        # flow: the flow that should be manipulated
-
-        if current_data != []:
-            current_data=current_data[0]['flow']
-
-        #turn lists into dicts and merge ids
-        ids_merged = []
-        new = {}
-        current = {}
-
-        for new_flows in new_data:
-            for new_flow in new_flows['flow']:
-                new[new_flow['id']] = new_flow
-                ids_merged.append(new_flow['id'])
-        for current_flow in current_data:
-            current[current_flow['id']] = current_flow
-            if ids_merged.count(current_flow['id'])==0:
-                ids_merged.append(current_flow['id'])
-
-        operations={"delete":[], "insert":[]} #update is also an insertion
-
-        ids_merged.sort()
-        for id in ids_merged:
-            if not id in new:
-                operations["delete"].append(current[id])
-                log.debug("flow id %s will be deleted"%id)
-            else:
-                if not id in current:
-                    operations["insert"].append(new[id])
-                    log.debug("flow id %s will be inserted" % id)
-                elif self.assertDictsEqual(new[id], current[id])==False:
-                    operations["insert"].append(new[id])
-                    log.debug("flow id %s will be updated" % id)
-
-        return operations
-
-    def assertDictsEqual(self, d1, d2):
-        for k in d1.keys():
-            if not d2.has_key(k):
-                log.debug("%s key missing" % k)
-                return False
-            else:
-                if type(d1[k]) is dict:
-                    if self.assertDictsEqual(d1[k], d2[k]) == False:
-                        return False
-                else:
-                    #TODO: ignore cookie is a workaround for a unknown problem when
-                    # diffing cookies
-                    if "%s"%k=="cookie":
-                        # ignoring cookie for now"
-                        pass
-                    elif type(d1[k]) == int or type(d2[k])==int:
-                        if "%s"%d1[k] != "%s"%d2[k]:
-                            log.debug("%s differs: %s - %s" % (k, d1[k], d2[k]))
-                            return False
-                    else:
-                        if d1[k] != d2[k]:
-                            log.debug ("%s differs: %s - %s"%(k, d1[k], d2[k]))
-                            return False
-        return True
@@ -18,11 +18,12 @@
 from networkapi.plugins.SDN.ODL.utils.cookie_handler import CookieHandler
 from networkapi.plugins.SDN.ODL.utils.tcp_control_bits import TCPControlBits
 from networkapi.plugins.SDN.ODL.utils.odl_plugin_masks import ODLPluginMasks
+from networkapi.plugins.SDN.ODL.utils.port_masks import PORT_MASK_EXACT
+from networkapi.plugins.SDN.ODL.utils.port_masks import to_port_masks
 
 import re
 import logging
 from json import dumps
-from copy import deepcopy
 
 to_str_id = ODLPluginMasks.to_str_id
 to_str_id_both = ODLPluginMasks.to_str_id_both
@@ -74,9 +75,19 @@ class AclFlowBuilder(object):
     PRIORITY_DEFAULT = 65000
     TABLE = 0
     ALLOWED_FLOWS_SIZE = 5
+
+    # Maximum number of flows built from the port ranges of one rule
     MAX_RANGE_LENGTH = 120
 
-    def __init__(self, data, environment=0, version="BERYLLIUM"):
+    # Masked ports are matched with Nicira extensions, OpenFlow matches of
+    # TCP and UDP ports have no mask. Controllers and switches without the
+    # extension reject them, so ranges are expanded port by port unless
+    # port_masks is set
+    EXTENSION_LIST = "openflowplugin-extension-general:extension-list"
+    NICIRA_MATCH = "openflowplugin-extension-nicira-match:"
+
+    def __init__(self, data, environment=0, version="BERYLLIUM",
+                 port_masks=False):
 
         self.raw_data = data  # Original data
         self.flows = {"flow": []}  # Processed data
@@ -86,24 +97,11 @@ class AclFlowBuilder(object):
         self.environment = int(environment)
 
         self.version = version
+        self.port_masks = port_masks
         self.dumped_rule = None  # Actual processing rule in json format
 
-        self._reset_control_members()
-
         logging.basicConfig(format=self.LOG_FORMAT, level=logging.DEBUG)
 
-    def _reset_control_members(self):
-
-        # Used to build double ranges
-        self.current_src_port = None
-        self.current_dst_port = None
-
-        # Used to build simple ranges
-        self.current_src_or_dst_port = None
-
-        # Used to control flows generation for one rule
-        self.generated_all_flows_from_rule = False
-
     def _clear_flows(self):
         """ Clear flows variable to avoid huge object in memory """
         self.flows["flow"] = []
@@ -121,22 +119,28 @@ class AclFlowBuilder(object):
             yield flows_ids, dumps(flows)
 
     def build(self):
-        """ Verifies input data and build flows for OpenDayLight controller """
+        """ Verifies input data and build flows for OpenDayLight controller
+
+            Flows are yielded in chunks of ALLOWED_FLOWS_SIZE flows, the
+            last built flow first.
+        """
 
         if Tokens.kind in self.raw_data and Tokens.rules in self.raw_data:
             logging.info("Building ACL Json: %s", self.raw_data["kind"])
 
             for rule in self.raw_data[Tokens.rules]:
 
-                for current_flows in self._build_rule(rule):
+                for flow in self._build_rule(rule):
 
-                    if len(current_flows["flow"]) == self.ALLOWED_FLOWS_SIZE:
+                    self.flows["flow"].insert(0, flow)
 
-                        yield current_flows
+                    if len(self.flows["flow"]) == self.ALLOWED_FLOWS_SIZE:
+
+                        yield {"flow": self.flows["flow"]}
                         self._clear_flows()
 
             if len(self.flows["flow"]) > 0:
-                yield self.flows
+                yield {"flow": self.flows["flow"]}
                 self._clear_flows()
 
         else:
@@ -149,40 +153,33 @@ class AclFlowBuilder(object):
 
         self.dumped_rule = dumps(rule, sort_keys=True)
 
-        self._reset_control_members()
-
-        while not self.generated_all_flows_from_rule:
+        # Assigns the id of the current ACL
+        flow = {Tokens.id_: rule[Tokens.id_]}
 
-            # Assigns the id of the current ACL
-            # We always insert in the head of the list to simplify the access
-            # to the current index
+        # Flow table and priority
+        flow["table_id"] = self.TABLE
 
-            self.flows["flow"].insert(0, {Tokens.id_: rule[Tokens.id_]})
+        self._build_description(rule, flow)
+        self._build_match(rule, flow)
+        self._build_action(rule, flow)
+        self._build_cookie(rule, flow)
+        self._build_sequence(rule, flow)
 
-            # Flow table and priority
-            self.flows["flow"][0]["table_id"] = self.TABLE
+        for flow in self._build_protocol(rule, flow):
+            yield flow
 
-            self._build_description(rule)
-            self._build_match(rule)
-            self._build_action(rule)
-            self._build_cookie(rule)
-            self._build_sequence(rule)
-            self._build_protocol(rule)
-
-            yield self.flows
-
-    def _build_description(self, rule):
+    def _build_description(self, rule, flow):
         """ Builds the flow name field using OpenDayLight json format """
 
         if Tokens.description not in rule:
             rule[Tokens.description] = ""
 
-        self.flows["flow"][0]["flow-name"] = rule[Tokens.description]
+        flow["flow-name"] = rule[Tokens.description]
 
-    def _build_match(self, rule):
+    def _build_match(self, rule, flow):
         """ Builds the match field that identifies the ACL rule """
 
-        self.flows["flow"][0]["match"] = {
+        flow["match"] = {
             "ethernet-match": {
                 "ethernet-type": {
                     "type": 2048
@@ -192,19 +189,18 @@ class AclFlowBuilder(object):
 
         if Tokens.destination in rule and Tokens.source in rule:
 
-            self.flows["flow"][0]["match"]["ipv4-destination"] = \
-                rule[Tokens.destination]
-            self.flows["flow"][0]["match"]["ipv4-source"] = rule[Tokens.source]
+            flow["match"]["ipv4-destination"] = rule[Tokens.destination]
+            flow["match"]["ipv4-source"] = rule[Tokens.source]
 
         else:
             logging.error(self.MALFORMED_MESSAGE % self.dumped_rule)
             raise ValueError(self.MALFORMED_MESSAGE % self.dumped_rule)
 
-    def _build_action(self, rule):
+    def _build_action(self, rule, flow):
         """ Builds the Openflow actions to a flow """
 
         if Tokens.action in rule and rule[Tokens.action] == "permit":
-            self.flows["flow"][0]["instructions"] = {
+            flow["instructions"] = {
                 "instruction": [{
                     "order": 0,
                     "apply-actions": {
@@ -218,23 +214,23 @@ class AclFlowBuilder(object):
                 }]
             }
 
-    def _build_cookie(self, rule):
+    def _build_cookie(self, rule, flow):
         """ Builds optional 64-bits field named cookie """
 
         id_rule = rule[Tokens.id_]
         cookie_handler = CookieHandler(id_rule, self.environment)
-        self.flows["flow"][0][Tokens.cookie] = cookie_handler.cookie
+        flow[Tokens.cookie] = cookie_handler.cookie
 
-    def _build_sequence(self, rule):
+    def _build_sequence(self, rule, flow):
         """ Build sequence field to set flow priority """
 
         # if Tokens.sequence in rule:
-        #     self.flows["flow"][0]["priority"] = rule[Tokens.sequence]
+        #     flow["priority"] = rule[Tokens.sequence]
         # else:
-        self.flows["flow"][0]["priority"] = self.PRIORITY_DEFAULT
+        flow["priority"] = self.PRIORITY_DEFAULT
 
-    def _build_protocol(self, rule):
-        """ Identifies the protocol of the ACL rule """
+    def _build_protocol(self, rule, flow):
+        """ Identifies the protocol of the ACL rule and returns its flows """
 
         if Tokens.protocol not in rule:
             message = "Missing %s field:\n%s" % (Tokens.protocol,
@@ -244,37 +240,35 @@ class AclFlowBuilder(object):
 
         else:
             if rule[Tokens.protocol] == "tcp":
-                self._build_tcp(rule)
+                return self._build_tcp(rule, flow)
             elif rule[Tokens.protocol] == "udp":
-                self._build_udp(rule)
+                return self._build_udp(rule, flow)
             elif rule[Tokens.protocol] == "icmp":
-                self._build_icmp(rule)
+                return self._build_icmp(rule, flow)
             elif rule[Tokens.protocol] == "ip":
-                self.generated_all_flows_from_rule = True
-                pass  # It is not necessary to process a IP protocol
+                return [flow]  # It is not necessary to process a IP protocol
             else:
                 message = "Unknown protocol '%s'" % rule[Tokens.protocol]
                 logging.error(self.MALFORMED_MESSAGE % message)
                 raise ValueError(self.MALFORMED_MESSAGE % message)
 
-    def _build_tcp(self, rule):
-        """ Builds a TCP flow based on OpenDayLight json format """
+    def _build_tcp(self, rule, flow):
+        """ Builds TCP flows based on OpenDayLight json format """
 
-        self._set_flow_ip_protocol(6)
-        self._set_tcp_flags(rule)
-        self._check_source_and_destination_ports(rule, "tcp")
+        self._set_flow_ip_protocol(flow, 6)
+        self._set_tcp_flags(rule, flow)
+        return self._build_transport_ports(rule, flow, "tcp")
 
-    def _build_udp(self, rule):
-        """ Builds a UDP flow based on OpenDayLight json format """
+    def _build_udp(self, rule, flow):
+        """ Builds UDP flows based on OpenDayLight json format """
 
-        self._set_flow_ip_protocol(17)
-        self._check_source_and_destination_ports(rule, "udp")
+        self._set_flow_ip_protocol(flow, 17)
+        return self._build_transport_ports(rule, flow, "udp")
 
-    def _build_icmp(self, rule):
+    def _build_icmp(self, rule, flow):
         """ Builds ICMP protocol acl using OpenDayLight json format """
 
-        self._set_flow_ip_protocol(1)
-        self.generated_all_flows_from_rule = True
+        self._set_flow_ip_protocol(flow, 1)
 
         if Tokens.icmp_options in rule:
 
@@ -283,7 +277,7 @@ class AclFlowBuilder(object):
 
                 icmp_options = rule[Tokens.icmp_options]
 
-                self.flows["flow"][0]["match"]["icmpv4-match"] = {
+                flow["match"]["icmpv4-match"] = {
                     "icmpv4-code": icmp_options[Tokens.icmp_code],
                     "icmpv4-type": icmp_options[Tokens.icmp_type]
                 }
@@ -297,42 +291,16 @@ class AclFlowBuilder(object):
             logging.error(self.MALFORMED_MESSAGE % message)
             raise ValueError(self.MALFORMED_MESSAGE % message)
 
-    def _set_flow_ip_protocol(self, protocol_n):
+        return [flow]
+
+    def _set_flow_ip_protocol(self, flow, protocol_n):
         """ Sets the IP protocol number inside given flow """
 
-        self.flows["flow"][0]["match"]["ip-match"] = {
+        flow["match"]["ip-match"] = {
             "ip-protocol": protocol_n
         }
 
-    def _check_source_and_destination_ports(self, rule, protocol):
-        """ Checks source and destination options inside json """
-
-        l4_options = rule.get(Tokens.l4_options, {})
-
-        #this if is an temporary solution
-        if self._calc_length_of_range(rule)>self.MAX_RANGE_LENGTH:
-            logging.warning("Max range lenght reached. A more permissive flow will be used.")
-            self.generated_all_flows_from_rule = True
-
-        elif l4_options.get(Tokens.src_port_op) == Tokens.range and \
-           l4_options.get(Tokens.dst_port_op) == Tokens.range:
-            self._build_double_range(rule, protocol)
-
-        elif l4_options.get(Tokens.src_port_op) == Tokens.range:
-            self._build_simple_range(rule, protocol,
-                                     Tokens.src_port,
-                                     Tokens.src_port_end)
-
-        elif l4_options.get(Tokens.dst_port_op) == Tokens.range:
-            self._build_simple_range(rule, protocol,
-                                     Tokens.dst_port,
-                                     Tokens.dst_port_end)
-        else:
-            self._build_transport_source_ports(rule, protocol)
-            self._build_transport_destination_ports(rule, protocol)
-            self.generated_all_flows_from_rule = True
-
-    def _set_tcp_flags(self, rule):
+    def _set_tcp_flags(self, rule, flow):
         """ Sets the flags inside given flow """
 
         l4_options = rule.get(Tokens.l4_options, {})
@@ -343,288 +311,134 @@ class AclFlowBuilder(object):
             tcp_flags = TCPControlBits(flags).to_int()
 
             if self.version in ["BERYLLIUM"]:
-                self.flows["flow"][0]["match"]["tcp-flag-match"] = {
+                flow["match"]["tcp-flag-match"] = {
                     "tcp-flag": tcp_flags,
                 }
             elif self.version in ["BORON", "CARBON", "NITROGEN"]:
-                self.flows["flow"][0]["match"]["tcp-flags-match"] = {
+                flow["match"]["tcp-flags-match"] = {
                     "tcp-flags": tcp_flags,
                 }
 
-    def _build_simple_range(self, rule, protocol, start, end):
-        """ Builds a TCP|UDP flows when ACL has Src and Dst ranges."""
-
-        port_end = int(rule[Tokens.l4_options][end])
-
-        if self.current_src_or_dst_port is not None:
-
-            # Assigns if the last iteration made flows array to reach
-            # ALLOWED_FLOWS_SIZE before reach the last port in range
-            port_start = self.current_src_or_dst_port
-        else:
-
-            # Assigns if it is the first time building range for rule
-            port_start = int(rule[Tokens.l4_options][start])
-
-        for port in xrange(port_start, port_end + 1):
-
-            # Do this to avoid change the first port of range in orig rule
-            # We use it to update each flow description field
-            rule_copy = deepcopy(rule)
-            rule_copy[Tokens.l4_options][start] = str(port)
-
-            self._build_transport_source_ports(rule_copy, protocol)
-            self._build_transport_destination_ports(rule_copy, protocol)
-            self._build_id_and_description_when_simple_range(
-                rule, port,
-                rule[Tokens.l4_options][start],
-                port_end)
-
-            if port == port_end:
-                # If we finished to build all ports in range,
-                # set variable below to True to avoid rebuild
-                # the same rule
-                self.generated_all_flows_from_rule = True
-                return
-
-            if len(self.flows["flow"]) == self.ALLOWED_FLOWS_SIZE:
-                # If flows array reach ALLOWED_FLOWS_SIZE, we stop to
-                # build and save actual state
-                self.current_src_or_dst_port = port + 1
-                return
-
-            self._insert_new_flow_when_single_range(port, port_end)
-
-    def _build_double_range(self, rule, protocol):
-        """ Builds a TCP|UDP flows when ACL has Src or Dst ranges."""
-
-        l4_options = rule[Tokens.l4_options]
-
-        src_port_end = int(l4_options[Tokens.src_port_end])
-        dst_port_end = int(l4_options[Tokens.dst_port_end])
-
-        if self.current_src_port is not None \
-           and self.current_dst_port is not None:
-
-            # Assigns if the last iteration made flows array to reach
-            # ALLOWED_FLOWS_SIZE before reach the last port in range
-            src_port_start = self.current_src_port
-            dst_port_start = self.current_dst_port
-        else:
-
-            # Assigns if it is the first time building range for rule
-            src_port_start = int(l4_options[Tokens.src_port])
-            dst_port_start = int(l4_options[Tokens.dst_port])
-
-        if dst_port_start > dst_port_end:
-            src_port_start += 1
-            dst_port_start = int(l4_options[Tokens.dst_port])
-
-        for src_port in xrange(src_port_start, src_port_end + 1):
-            for dst_port in xrange(dst_port_start, dst_port_end + 1):
-
-                # Do this to avoid change the first port of range
-                # in original rule.
-                # We use it to update each flow description field
-
-                rule_copy = deepcopy(rule)
-                rule_copy[Tokens.l4_options][Tokens.src_port] = str(src_port)
-                rule_copy[Tokens.l4_options][Tokens.dst_port] = str(dst_port)
-
-                self._build_transport_source_ports(rule_copy, protocol)
-                self._build_transport_destination_ports(rule_copy, protocol)
-                self._build_id_and_description_when_double_range(
-                    rule, src_port, dst_port)
-
-                if src_port == src_port_end and dst_port == dst_port_end:
-                    # If we finished to build all ports in range,
-                    # set variable below to True to avoid rebuild
-                    # the same rule
-                    self.generated_all_flows_from_rule = True
-                    return
-
-                if dst_port == dst_port_end:
-                    # When state is save, make sure that in next iteration
-                    # of src ranges all related destination ports will be
-                    # built together
-                    dst_port_start = int(l4_options[Tokens.dst_port])
-
-                if len(self.flows["flow"]) == self.ALLOWED_FLOWS_SIZE:
-                    # If flows array reach ALLOWED_FLOWS_SIZE, we stop to
-                    # build and save actual state
-                    self.current_src_port = src_port
-                    self.current_dst_port = dst_port + 1
-                    return
-
-                self._insert_new_flow_when_double_range(src_port, src_port_end,
-                                                        dst_port, dst_port_end)
-
-    def _insert_new_flow_when_single_range(self, port, port_end):
-        """ Check inside single range if still exists ports to build
-            allocating one flow more
-        """
-
-        if port < port_end:
-            self._insert_new_flow()
-
-    def _insert_new_flow_when_double_range(self, src_port, src_port_end,
-                                           dst_port, dst_port_end):
-        """ Check inside double range if still exists ports to build
-            allocating one flow more
+    def _get_port_masks(self, rule, operation, start, end):
+        """ Returns the (port, mask) pairs of source or destination ports,
+            or [None] when the rule does not match these ports. Without
+            port_masks every port of a range has its own exact pair.
         """
 
-        if src_port < src_port_end or dst_port < dst_port_end:
-            self._insert_new_flow()
-
-    def _insert_new_flow(self):
-        """ Create deep copy of last flow built in the head of the list
-            to simplify the access to the current index when building next
-            port.
-        """
+        l4_options = rule.get(Tokens.l4_options, {})
 
-        self.flows["flow"].insert(0, deepcopy(self.flows["flow"][0]))
+        if l4_options.get(operation) == Tokens.range:
+            if self.port_masks:
+                return to_port_masks(l4_options[start], l4_options[end])
+            return [(port, PORT_MASK_EXACT) for port in
+                    xrange(int(l4_options[start]), int(l4_options[end]) + 1)]
+        elif operation in l4_options:
+            return [(l4_options[start], PORT_MASK_EXACT)]
+        else:
+            return [None]
 
-    def _build_id_and_description_when_simple_range(
-            self, rule, port, port_start, port_end):
-        """ Builds custom id and description for flows generated
-            by ACL that have Src range or Dst range.
+    def _build_transport_ports(self, rule, flow, protocol):
+        """ Builds TCP|UDP flows for every source and destination
+            (port, mask) pairs of the rule.
         """
 
-        self._build_id_when_only_src_or_dst_range(rule, port)
-        self._build_id_when_src_eq_and_dst_range(rule, port)
-        self._build_id_when_src_range_and_dst_eq(rule, port)
+        src_masks = self._get_port_masks(rule, Tokens.src_port_op,
+                                         Tokens.src_port, Tokens.src_port_end)
+        dst_masks = self._get_port_masks(rule, Tokens.dst_port_op,
+                                         Tokens.dst_port, Tokens.dst_port_end)
 
-        self._build_description_when_only_src_or_dst_range(
-            rule, port_start, port_end)
-        self._build_description_when_src_range_and_dst_eq(
-            rule, port_start, port_end)
-        self._build_description_when_src_eq_and_dst_range(
-            rule, port_start, port_end)
+        #this if is an temporary solution
+        if len(src_masks) * len(dst_masks) > self.MAX_RANGE_LENGTH:
+            logging.warning("Max range lenght reached. A more permissive flow will be used.")
+            yield flow
+            return
+
+        for src_mask in src_masks:
+            for dst_mask in dst_masks:
+
+                # Do this to avoid change the same flow in every port. Only
+                # the flow and its match are changed, the other fields are
+                # shared by the flows of the rule
+                flow_copy = dict(flow, match=dict(flow["match"]))
+
+                if src_mask is not None:
+                    self._build_transport_port(flow_copy, protocol, "source",
+                                               *src_mask)
+                if dst_mask is not None:
+                    self._build_transport_port(flow_copy, protocol,
+                                               "destination", *dst_mask)
+
+                self._build_id_and_description(rule, flow_copy,
+                                               src_mask, dst_mask)
+
+                yield flow_copy
+
+    def _build_transport_port(self, flow, protocol, direction, port, mask):
+        """ Builds transport (TCP | UDP) port match of one (port, mask) """
+
+        if mask == PORT_MASK_EXACT:
+            flow["match"]["%s-%s-port" % (protocol, direction)] = str(port)
+            return
+
+        field = "nxm-of-%s-%s" % (protocol,
+                                  "src" if direction == "source" else "dst")
+        flow["match"].setdefault(self.EXTENSION_LIST, []).append({
+            "extension-key": self.NICIRA_MATCH + field + "-key",
+            "extension": {
+                self.NICIRA_MATCH + field: {
+                    "port": int(port),
+                    "mask": mask
+                }
+            }
+        })
 
-    def _build_id_and_description_when_double_range(
-            self, rule, src_port, dst_port):
+    def _build_id_and_description(self, rule, flow, src_mask, dst_mask):
         """ Builds custom id and description for flows generated
-            by ACL that have Src range and Dst range.
+            by ACL that have Src range or Dst range. Each flow is identified
+            by the first port of its (port, mask) pairs.
         """
 
-        self._build_id_when_src_range_and_dst_range(rule, src_port, dst_port)
-        self._build_description_when_src_range_and_dst_range(rule)
-
-    def _build_description_when_src_eq_and_dst_range(
-            self, rule, port_start, port_end):
+        l4_options = rule.get(Tokens.l4_options, {})
+        src_op = l4_options.get(Tokens.src_port_op)
+        dst_op = l4_options.get(Tokens.dst_port_op)
 
-        l4_options = rule[Tokens.l4_options]
-        if l4_options.get(Tokens.src_port_op) == Tokens.eq and \
-           l4_options.get(Tokens.dst_port_op) == Tokens.range:
+        if src_op == Tokens.range and dst_op == Tokens.range:
 
-            self.flows["flow"][0]["flow-name"] = to_str_description_both(
+            flow["id"] = to_str_id_both(
+                rule[Tokens.id_], src_mask[0], dst_mask[0])
+            flow["flow-name"] = to_str_description_both(
                 rule[Tokens.description],
-                rule[Tokens.l4_options].get(Tokens.src_port),
-                rule[Tokens.l4_options].get(Tokens.src_port),
-                port_start, port_end)
-
-    def _build_description_when_src_range_and_dst_eq(
-            self, rule, port_start, port_end):
+                l4_options[Tokens.src_port], l4_options[Tokens.src_port_end],
+                l4_options[Tokens.dst_port], l4_options[Tokens.dst_port_end])
 
-        l4_options = rule[Tokens.l4_options]
-        if l4_options.get(Tokens.src_port_op) == Tokens.range and \
-           l4_options.get(Tokens.dst_port_op) == Tokens.eq:
+        elif src_op == Tokens.range and dst_op == Tokens.eq:
 
-            self.flows["flow"][0]["flow-name"] = to_str_description_both(
+            flow["id"] = to_str_id_both(
+                rule[Tokens.id_], src_mask[0], l4_options[Tokens.dst_port])
+            flow["flow-name"] = to_str_description_both(
                 rule[Tokens.description],
-                port_start, port_end,
-                rule[Tokens.l4_options].get(Tokens.dst_port),
-                rule[Tokens.l4_options].get(Tokens.dst_port))
-
-    def _build_description_when_only_src_or_dst_range(
-            self, rule, port_start, port_end):
-
-        self.flows["flow"][0]["flow-name"] = to_str_description(
-            rule[Tokens.description],
-            port_start, port_end)
-
-    def _build_description_when_src_range_and_dst_range(self, rule):
-
-        self.flows["flow"][0]["flow-name"] = to_str_description_both(
-            rule[Tokens.description],
-            rule[Tokens.l4_options][Tokens.src_port],
-            rule[Tokens.l4_options][Tokens.src_port_end],
-            rule[Tokens.l4_options][Tokens.dst_port],
-            rule[Tokens.l4_options][Tokens.dst_port_end])
-
-    def _build_id_when_src_eq_and_dst_range(self, rule, port):
+                l4_options[Tokens.src_port], l4_options[Tokens.src_port_end],
+                l4_options[Tokens.dst_port], l4_options[Tokens.dst_port])
 
-        l4_options = rule[Tokens.l4_options]
-        if l4_options.get(Tokens.src_port_op) == Tokens.eq and \
-           l4_options.get(Tokens.dst_port_op) == Tokens.range:
+        elif src_op == Tokens.eq and dst_op == Tokens.range:
 
-            self.flows["flow"][0]["id"] = to_str_id_both(
-                rule[Tokens.id_],
-                rule[Tokens.l4_options][Tokens.src_port],
-                port)
-
-    def _build_id_when_src_range_and_dst_eq(self, rule, port):
-
-        l4_options = rule[Tokens.l4_options]
-        if l4_options.get(Tokens.src_port_op) == Tokens.range and \
-           l4_options.get(Tokens.dst_port_op) == Tokens.eq:
-
-            self.flows["flow"][0]["id"] = to_str_id_both(
-                rule[Tokens.id_],
-                port,
-                rule[Tokens.l4_options][Tokens.dst_port])
-
-    def _build_id_when_only_src_or_dst_range(self, rule, port):
-
-        self.flows["flow"][0]["id"] = to_str_id(
-            rule[Tokens.id_],
-            port)
-
-    def _build_id_when_src_range_and_dst_range(self, rule, src_port, dst_port):
-
-        self.flows["flow"][0]["id"] = to_str_id_both(
-            rule[Tokens.id_],
-            src_port, dst_port)
-
-    def _build_transport_source_ports(self, rule, protocol):
-        """ Builds source ports for transport protocols TCP or UDP """
-
-        l4_options = rule.get(Tokens.l4_options, {})
-        if Tokens.src_port_op in l4_options:
-            prefix = protocol + "-source-port"
-            self._build_transport_ports(rule, prefix, Tokens.src_port_op,
-                                        Tokens.src_port,
-                                        Tokens.src_port_end)
-
-    def _build_transport_destination_ports(self, rule, protocol):
-        """ Builds destination ports for transport protocols TCP or UDP """
-
-        l4_options = rule.get(Tokens.l4_options, {})
-        if Tokens.dst_port_op in l4_options:
-            prefix = protocol + "-destination-port"
-            self._build_transport_ports(rule, prefix, Tokens.dst_port_op,
-                                        Tokens.dst_port, Tokens.dst_port_end)
-
-    def _build_transport_ports(self, rule, prefix, operation, start, end):
-        """ Builds transport (TCP | UDP) protocols json data """
-
-        self.flows["flow"][0]["match"][prefix] = \
-            rule[Tokens.l4_options][start]
-
-    def _calc_length_of_range(self, rule):
-        l4_options = rule.get(Tokens.l4_options, {})
-        src_range=1
-        dst_range=1
+            flow["id"] = to_str_id_both(
+                rule[Tokens.id_], l4_options[Tokens.src_port], dst_mask[0])
+            flow["flow-name"] = to_str_description_both(
+                rule[Tokens.description],
+                l4_options[Tokens.src_port], l4_options[Tokens.src_port],
+                l4_options[Tokens.dst_port], l4_options[Tokens.dst_port_end])
 
-        if l4_options.get(Tokens.src_port_op) == Tokens.range:
-            src_port_start = int(l4_options[Tokens.src_port])
-            src_port_end = int(l4_options[Tokens.src_port_end])
-            src_range=src_port_end-src_port_start+1
+        elif src_op == Tokens.range:
 
-        if l4_options.get(Tokens.dst_port_op) == Tokens.range:
-            dst_port_start = int(l4_options[Tokens.dst_port])
-            dst_port_end = int(l4_options[Tokens.dst_port_end])
-            dst_range=dst_port_end-dst_port_start+1
+            flow["id"] = to_str_id(rule[Tokens.id_], src_mask[0])
+            flow["flow-name"] = to_str_description(
+                rule[Tokens.description],
+                l4_options[Tokens.src_port], l4_options[Tokens.src_port_end])
 
-        return src_range * dst_range
+        elif dst_op == Tokens.range:
 
+            flow["id"] = to_str_id(rule[Tokens.id_], dst_mask[0])
+            flow["flow-name"] = to_str_description(
+                rule[Tokens.description],
+                l4_options[Tokens.dst_port], l4_options[Tokens.dst_port_end])
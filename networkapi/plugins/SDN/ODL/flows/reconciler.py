@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class FlowsReconciler(object):
+    """ Compares the flows of nodes with the desired flows of an ACL.
+
+        Desired flows are indexed by id and reduced to signatures once, so
+        each node is diffed in time linear to its number of flows.
+        Signatures are 64 bits hashes, a changed flow is taken as equal
+        only in the unlikely case of a hash collision.
+    """
+
+    # Cookies answered by the controller differ from the ones sent, so they
+    # are not compared
+    IGNORED_FIELDS = frozenset(["cookie"])
+
+    def __init__(self, flows_set):
+        """ Receives the chunks of flows returned by a flows builder """
+
+        self.flows = OrderedDict()
+        for flows in flows_set:
+            for flow in flows['flow']:
+                self.flows[flow['id']] = flow
+
+        self.signatures = dict((flow_id, self.signature(flow))
+                               for flow_id, flow in self.flows.iteritems())
+
+    @classmethod
+    def signature(cls, value):
+        """ Returns a hash equal for flows with the same fields.
+
+            The controller answers numbers sent as strings as numbers, so
+            numbers are hashed as strings. Ignored fields are left out.
+            Only hashes of nested fields are kept, so signatures of many
+            flows take little memory.
+        """
+
+        kind = type(value)
+        if kind is dict:
+            return hash(frozenset([(key, cls.signature(item))
+                                   for key, item in value.iteritems()
+                                   if key not in cls.IGNORED_FIELDS]))
+        if kind is list:
+            return hash(tuple([cls.signature(item) for item in value]))
+        if kind is int or kind is long:
+            return hash(str(value))
+        return hash(value)
+
+    def diff(self, current_flows):
+        """ Returns a dict with the flows to be deleted from, inserted in
+            and updated in a node with the current flows given
+        """
+
+        current = dict((flow['id'], flow) for flow in current_flows)
+
+        operations = {"delete": [], "insert": [], "update": []}
+
+        for flow_id in current.viewkeys() - self.flows.viewkeys():
+            operations["delete"].append(current[flow_id])
+
+        for flow_id, flow in self.flows.iteritems():
+            if flow_id not in current:
+                operations["insert"].append(flow)
+            elif self.signatures[flow_id] != \
+                    self.signature(current[flow_id]):
+                operations["update"].append(flow)
+
+        log.debug("flows to delete: %s, to insert: %s, to update: %s" %
+                  (len(operations["delete"]), len(operations["insert"]),
+                   len(operations["update"])))
+
+        return operations
@@ -36,13 +36,13 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'double_range'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
 
         output_path = self.tcp_output_path
 
         generator = flow_builder.build()
 
-        limit_ = 3
+        limit_ = 2
         for i in xrange(1, limit_ + 1):
             output_ = output_path.format(type_, i)
             self.compare_json(output_, generator.next())
@@ -55,7 +55,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'eq_src_eq_dst'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.tcp_output_path
@@ -75,7 +75,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_dst'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.tcp_output_path
@@ -95,7 +95,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_dst_eq_src'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.tcp_output_path
@@ -115,7 +115,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_src'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.tcp_output_path
@@ -135,7 +135,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_src_eq_dst'
         input_ = self.tcp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.tcp_output_path
@@ -155,14 +155,14 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'double_range'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
 
         generator = flow_builder.build()
 
-        limit_ = 3
+        limit_ = 2
         for i in xrange(1, limit_ + 1):
             output_ = output_path.format(type_, i)
             self.compare_json(output_, generator.next())
@@ -175,7 +175,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'eq_src_eq_dst'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
@@ -195,7 +195,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_dst'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
@@ -215,7 +215,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_dst_eq_src'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
@@ -235,7 +235,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_src'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
@@ -255,7 +255,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = 'range_src_eq_dst'
         input_ = self.udp_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.udp_output_path
@@ -275,14 +275,14 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = '1tcp_range_dst_eq_src+3icmp+1ip+1udp_range_dst'
         input_ = self.mixed_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.mixed_output_path
 
         generator = flow_builder.build()
 
-        limit_ = 3
+        limit_ = 2
         for i in xrange(1, limit_ + 1):
             output_ = output_path.format(type_, i)
             self.compare_json(output_, generator.next())
@@ -295,14 +295,14 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = '1tcp_range_src_eq_dst+4icmp+1ip+1udp_double_range'
         input_ = self.mixed_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.mixed_output_path
 
         generator = flow_builder.build()
 
-        limit_ = 5
+        limit_ = 3
         for i in xrange(1, limit_ + 1):
             output_ = output_path.format(type_, i)
             self.compare_json(output_, generator.next())
@@ -315,7 +315,7 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = '1udp+1udp_range_src+2icmp+1tcp_eq_src'
         input_ = self.mixed_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.mixed_output_path
@@ -335,16 +335,52 @@ class ACLFlowBuilderTestCase(NetworkApiTestCase):
         type_ = '2ip+1udp+3tcp_eq_src_eq_dst+1udp_double_range'
         input_ = self.mixed_input_path.format(type_)
         data = self.load_json_file(input_)
-        flow_builder = AclFlowBuilder(data)
+        flow_builder = AclFlowBuilder(data, port_masks=True)
         flow_builder.ALLOWED_FLOWS_SIZE = 5
 
         output_path = self.mixed_output_path
 
         generator = flow_builder.build()
 
-        limit_ = 5
+        limit_ = 3
         for i in xrange(1, limit_ + 1):
             output_ = output_path.format(type_, i)
             self.compare_json(output_, generator.next())
 
-        self.assertRaises(StopIteration, generator.next)
\ No newline at end of file
+        self.assertRaises(StopIteration, generator.next)
+
+    def test_build_acl_tcp_range_dst_without_port_masks(self):
+        """ Build one flow by port from TCP Range Dst ACL without masks."""
+
+        input_ = self.tcp_input_path.format('range_dst')
+        data = self.load_json_file(input_)
+        flow_builder = AclFlowBuilder(data)
+
+        flows = [flow for chunk in flow_builder.build()
+                 for flow in chunk["flow"]]
+
+        self.assertEqual(
+            ["901", "902", "903", "904", "905"],
+            sorted(flow["match"]["tcp-destination-port"] for flow in flows))
+        self.assertEqual(
+            ["200003_901", "200003_902", "200003_903", "200003_904",
+             "200003_905"],
+            sorted(flow["id"] for flow in flows))
+        for flow in flows:
+            assert_not_in(AclFlowBuilder.EXTENSION_LIST, flow["match"])
+
+    def test_build_acl_tcp_range_dst_without_port_masks_max_length(self):
+        """ Build a more permissive flow from a TCP Range Dst ACL longer
+            than the maximum without masks."""
+
+        input_ = self.tcp_input_path.format('range_dst')
+        data = self.load_json_file(input_)
+        data["rules"][0]["l4-options"]["dest-port-end"] = "1100"
+        flow_builder = AclFlowBuilder(data)
+
+        flows = [flow for chunk in flow_builder.build()
+                 for flow in chunk["flow"]]
+
+        self.assertEqual(1, len(flows))
+        assert_not_in("tcp-destination-port", flows[0]["match"])
+        assert_not_in(AclFlowBuilder.EXTENSION_LIST, flows[0]["match"])
@@ -0,0 +1,193 @@
+import json
+import logging
+import threading
+import time
+
+import requests
+from django.core.cache.backends.locmem import LocMemCache
+from mock import patch
+
+from networkapi.equipamento.models import Equipamento
+from networkapi.equipamento.models import EquipamentoAcesso
+from networkapi.plugins.SDN.ODL import Generic
+from networkapi.plugins.SDN.ODL.flows.acl import AclFlowBuilder
+from networkapi.plugins.SDN.ODL.Generic import ODLPlugin
+from networkapi.plugins.SDN.ODL.tests.utils import build_acl
+from networkapi.plugins.SDN.ODL.tests.utils import FakeRestconfServer
+from networkapi.test.test_case import NetworkApiTestCase
+
+LOG = logging.getLogger(__name__)
+
+NODES_IDS = ["openflow:1", "openflow:2", "openflow:3", "openflow:4"]
+
+
+def legacy_add_flow(plugin, data):
+    """ Previous add_flow, one request for each flow and node, asking the
+    nodes ids again for each flow, without keeping connections open
+    """
+
+    with patch.object(plugin, '_get_session', return_value=requests):
+        builder = AclFlowBuilder(data, plugin.environment,
+                                 version=plugin.version)
+        for flows in builder.build():
+            for flow in flows['flow']:
+                for node_id in plugin._fetch_nodes_ids():
+                    path = "/restconf/config/opendaylight-inventory:nodes/" \
+                           "node/%s/flow-node-inventory:table/0/flow/%s" % \
+                           (node_id, flow['id'])
+                    plugin._request(method='put', path=path,
+                                    data=json.dumps({'flow': [flow]}),
+                                    contentType='json')
+
+
+class FlowsPushTestCase(NetworkApiTestCase):
+    """ Class to test the ODL plugin against a local RESTCONF server """
+
+    def setUp(self):
+        Generic._nodes_cache.clear()
+        patch('networkapi.util.fanout._close_connections').start()
+        patch('networkapi.distributedlock.LOCK_BACKEND', 'memcached').start()
+        patch('networkapi.distributedlock.DEFAULT_MEMCACHED_CLIENT',
+              LocMemCache('odl-flows-push', {})).start()
+
+        self.server = FakeRestconfServer(NODES_IDS)
+        self.server.start()
+
+        self.odl = self.plugin()
+
+    def tearDown(self):
+        patch.stopall()
+        self.server.stop()
+
+    def plugin(self):
+        equipment = Equipamento(id=1, nome='odl-controller')
+        access = EquipamentoAcesso(fqdn=self.server.uri, user='admin',
+                                   password='admin')
+        return ODLPlugin(equipment=equipment, equipment_access=access,
+                         version='BERYLLIUM', environment=0)
+
+    def flows_ids(self, node_id):
+        return sorted(self.server.tables[node_id].keys())
+
+    def requests_count(self, method, fragment=''):
+        return len([path for request_method, path in self.server.requests
+                    if request_method == method and fragment in path])
+
+    def inventory_requests_count(self):
+        paths = [self.server.NODES] + self.server.TOPOLOGIES
+        return len([path for _, path in self.server.requests
+                    if path in paths])
+
+    def test_add_flow_writes_table_of_each_node_once(self):
+        data = build_acl(20)
+
+        self.odl.add_flow(data)
+
+        for node_id in NODES_IDS:
+            self.assertEqual(sorted(rule['id'] for rule in data['rules']),
+                             self.flows_ids(node_id))
+        self.assertEqual(len(NODES_IDS), self.requests_count('PUT'))
+        self.assertEqual(3, self.inventory_requests_count())
+
+    def test_add_flow_keeps_other_flows(self):
+        self.odl.add_flow(build_acl(3))
+        flow = self.server.tables[NODES_IDS[0]]['2']
+
+        self.odl.add_flow(build_acl(3, first_id=2), nodes_ids=[NODES_IDS[0]])
+
+        self.assertEqual(['1', '2', '3', '4'], self.flows_ids(NODES_IDS[0]))
+        self.assertEqual(['1', '2', '3'], self.flows_ids(NODES_IDS[1]))
+        self.assertEqual(flow, self.server.tables[NODES_IDS[0]]['2'])
+
+    def test_nodes_ids_cached(self):
+        self.odl.add_flow(build_acl(1))
+        self.plugin().add_flow(build_acl(1, first_id=2))
+
+        self.assertEqual(3, self.inventory_requests_count())
+
+        Generic._nodes_cache[self.server.uri] = (0, [])
+        self.odl.del_flow(1)
+
+        self.assertEqual(6, self.inventory_requests_count())
+        for node_id in NODES_IDS:
+            self.assertEqual(['2'], self.flows_ids(node_id))
+
+    def test_connections_reused(self):
+        self.odl.add_flow(build_acl(5))
+        self.odl.add_flow(build_acl(5, first_id=6))
+        self.odl.get_flows()
+
+        self.assertLessEqual(self.server.connections, len(NODES_IDS))
+        self.assertLess(self.server.connections,
+                        len(self.server.requests) / 2)
+
+    def test_concurrent_add_flow_keeps_all_flows(self):
+        get_table = ODLPlugin._get_table
+
+        def slow_get_table(plugin, node_id):
+            # Widens the window between reading and writing back a table
+            table = get_table(plugin, node_id)
+            time.sleep(0.2)
+            return table
+
+        patch.object(ODLPlugin, '_get_table', slow_get_table).start()
+
+        threads = [threading.Thread(target=self.plugin().add_flow,
+                                    args=(build_acl(3, first_id=first_id),))
+                   for first_id in (1, 4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for node_id in NODES_IDS:
+            self.assertEqual(['1', '2', '3', '4', '5', '6'],
+                             self.flows_ids(node_id))
+
+    def test_update_all_flows(self):
+        self.odl.add_flow(build_acl(5))
+        self.server.tables[NODES_IDS[0]].pop('3')
+        self.server.tables[NODES_IDS[1]].clear()
+        self.server.requests = []
+
+        data = build_acl(5, first_id=3)
+        data['rules'][0]['l4-options']['dest-port-start'] = '8080'
+        self.odl.update_all_flows(data)
+
+        for node_id in NODES_IDS:
+            self.assertEqual(['3', '4', '5', '6', '7'],
+                             self.flows_ids(node_id))
+            match = self.server.tables[node_id]['3']['match']
+            self.assertEqual('8080', match['tcp-destination-port'])
+        self.assertEqual(len(NODES_IDS), self.requests_count('PUT'))
+
+    def test_flush_flows(self):
+        self.odl.add_flow(build_acl(5))
+
+        self.odl.flush_flows()
+
+        self.assertEqual(dict((node_id, []) for node_id in NODES_IDS),
+                         self.odl.get_flows())
+
+    def test_add_flow_requests(self):
+        data = build_acl(100)
+
+        legacy_add_flow(self.odl, data)
+        legacy_requests = len(self.server.requests)
+        legacy_connections = self.server.connections
+
+        for node_id in NODES_IDS:
+            self.server.tables[node_id].clear()
+        self.server.requests = []
+        self.server.connections = 0
+
+        self.odl.add_flow(data)
+
+        LOG.info('Push of 100 flows to %s nodes: one by one %s requests in '
+                 '%s connections, by table %s requests in %s connections' %
+                 (len(NODES_IDS), legacy_requests, legacy_connections,
+                  len(self.server.requests), self.server.connections))
+
+        for node_id in NODES_IDS:
+            self.assertEqual(100, len(self.flows_ids(node_id)))
+        self.assertLess(len(self.server.requests) * 50, legacy_requests)
@@ -0,0 +1,107 @@
+from copy import deepcopy
+
+from nose.tools import assert_equal
+
+from networkapi.plugins.SDN.ODL.flows.acl import AclFlowBuilder
+from networkapi.plugins.SDN.ODL.flows.reconciler import FlowsReconciler
+from networkapi.plugins.SDN.ODL.tests.utils import build_acl
+from networkapi.test.test_case import NetworkApiTestCase
+
+
+def as_controller(flows):
+    """ Flows as the controller answers them, numbers sent as strings are
+    answered as numbers and cookies are changed
+    """
+
+    flows = deepcopy(flows)
+    for flow in flows:
+        flow['cookie'] = 0
+        match = flow['match']
+        if 'tcp-destination-port' in match:
+            match['tcp-destination-port'] = \
+                int(match['tcp-destination-port'])
+    return flows
+
+
+class FlowsReconcilerTestCase(NetworkApiTestCase):
+    """ Class to test the diff of current and desired flows of a node """
+
+    json_aclapi_input_path = 'plugins/SDN/ODL/json/aclapi_input/%s'
+
+    def build(self, data):
+        return AclFlowBuilder(data, environment=0, version='BERYLLIUM',
+                              port_masks=True).build()
+
+    def flows(self, data):
+        return [flow for flows in self.build(data) for flow in flows['flow']]
+
+    def ids(self, flows):
+        return sorted(flow['id'] for flow in flows)
+
+    def test_acl_change(self):
+        current = as_controller(self.flows(self.load_json_file(
+            self.json_aclapi_input_path % 'acl_id_150001.json')))
+        data = self.load_json_file(
+            self.json_aclapi_input_path % 'acl_id_150002.json')
+
+        operations = FlowsReconciler(self.build(data)).diff(current)
+
+        assert_equal(
+            ['150004'] +
+            ['150007_%s' % i for i in
+             (1000, 1008, 1024, 1536, 1792, 1920, 1984, 2000)] +
+            ['150008_%s' % i for i in (1000, 1008, 1010)] +
+            ['150010_%s' % i for i in
+             (1000, 128, 16, 256, 32, 512, 64, 768, 896, 960, 992)],
+            self.ids(operations["delete"]))
+        assert_equal(
+            ['150005'] +
+            ['150009_%s' % i for i in
+             (1000, 128, 16, 256, 32, 512, 64, 768, 896, 960, 992)],
+            self.ids(operations["insert"]))
+        assert_equal(['150001_1024', '150003', '150009_10', '150009_12',
+                      '150010_10', '150010_12'],
+                     self.ids(operations["update"]))
+
+    def test_operations(self):
+        current = dict((flow['id'], flow)
+                       for flow in as_controller(self.flows(build_acl(5))))
+        current['2']['priority'] = current['2']['priority'] + 1
+        del current['3']['match']['tcp-destination-port']
+        current.pop('5')
+
+        operations = FlowsReconciler(self.build(build_acl(6))).diff(
+            current.values())
+
+        assert_equal([], operations["delete"])
+        assert_equal(['5', '6'], self.ids(operations["insert"]))
+        assert_equal(['2', '3'], self.ids(operations["update"]))
+
+        operations = FlowsReconciler(self.build(build_acl(2))).diff(
+            current.values())
+
+        assert_equal(['3', '4'], self.ids(operations["delete"]))
+        assert_equal(['2'], self.ids(operations["update"]))
+        assert_equal([], operations["insert"])
+
+    def test_signature(self):
+        signature = FlowsReconciler.signature
+
+        assert_equal(signature({"a": {"b": "10", "c": [1, "x"]}}),
+                     signature({"a": {"c": ["1", "x"], "b": 10}}))
+        assert_equal(signature({"a": 1, "cookie": 1}),
+                     signature({"a": 1, "cookie": 2}))
+        self.assertNotEqual(signature({"a": 1}), signature({"a": 1, "b": 1}))
+        self.assertNotEqual(signature({"a": True}), signature({"a": "True"}))
+
+    def test_resync(self):
+        current = as_controller(self.flows(build_acl(10000)))
+        desired = [{'flow': self.flows(build_acl(10000, first_id=500))}]
+
+        operations = FlowsReconciler(desired).diff(current)
+
+        assert_equal(set(str(i) for i in xrange(1, 500)),
+                     set(flow['id'] for flow in operations["delete"]))
+        assert_equal(set(str(i) for i in xrange(10001, 10500)),
+                     set(flow['id'] for flow in operations["insert"]))
+        assert_equal([], operations["update"])
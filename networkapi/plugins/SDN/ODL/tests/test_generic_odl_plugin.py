@@ -411,6 +411,7 @@ class GenericOpenDayLightTestCaseSuccess(NetworkApiTestCase):
             raise e
         original = self.odl._request
         self.odl._request=fake_method
+        self.odl.NODES_CACHE_TTL = 0
 
         self.assertEqual(self.odl._get_nodes_ids(), [])
         self.odl._request=original
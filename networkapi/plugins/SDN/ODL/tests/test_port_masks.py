@@ -0,0 +1,86 @@
+import logging
+import random
+from os import listdir
+
+from nose.tools import assert_equal
+
+from networkapi.plugins.SDN.ODL.flows.acl import AclFlowBuilder
+from networkapi.plugins.SDN.ODL.utils.port_masks import PORT_MASK_EXACT
+from networkapi.plugins.SDN.ODL.utils.port_masks import to_port_masks
+from networkapi.test.test_case import NetworkApiTestCase
+
+LOG = logging.getLogger(__name__)
+
+
+def legacy_flows_count(rule):
+    """ Number of flows of a rule when each port of a range had its flow """
+
+    l4_options = rule.get("l4-options", {})
+    count = 1
+    for op, start, end in [("src-port-op", "src-port-start", "src-port-end"),
+                           ("dest-port-op", "dest-port-start",
+                            "dest-port-end")]:
+        if l4_options.get(op) == "range":
+            count *= int(l4_options[end]) - int(l4_options[start]) + 1
+    return count
+
+
+class PortMasksTestCase(NetworkApiTestCase):
+    """ Class to test decomposition of port ranges in port/mask pairs """
+
+    def masked_ports(self, masks):
+        ports = []
+        for port, mask in masks:
+            size = (~mask & PORT_MASK_EXACT) + 1
+            assert_equal(0, port & ~mask & PORT_MASK_EXACT)
+            ports.extend(xrange(port, port + size))
+        return ports
+
+    def test_single_port(self):
+        assert_equal([(80, PORT_MASK_EXACT)], to_port_masks("80", "80"))
+
+    def test_common_ranges(self):
+        assert_equal([(0, 0)], to_port_masks(0, 65535))
+        assert_equal([(1024, 0xfc00), (2048, 0xf800), (4096, 0xf000),
+                      (8192, 0xe000), (16384, 0xc000), (32768, 0x8000)],
+                     to_port_masks(1024, 65535))
+        assert_equal(30, len(to_port_masks(1, 65534)))
+
+    def test_ranges_are_covered_exactly(self):
+        rand = random.Random(1)
+        for _ in xrange(200):
+            start = rand.randint(0, 65535)
+            end = rand.randint(start, min(start + rand.choice([10, 5000]),
+                                          65535))
+
+            ports = self.masked_ports(to_port_masks(start, end))
+
+            assert_equal(range(start, end + 1), ports)
+
+    def test_benchmark_flows_count(self):
+        """ Count flows of ACLs in json fixtures and of wide ranges """
+
+        path = 'plugins/SDN/ODL/json/aclapi_input/'
+        acls = [self.load_json_file(path + name)
+                for name in sorted(listdir('networkapi/' + path))]
+        acls.append({"kind": "default#acl", "rules": [{
+            "id": "1", "protocol": "tcp", "action": "permit",
+            "source": "10.0.0.0/24", "destination": "10.0.1.0/24",
+            "l4-options": {"dest-port-op": "range",
+                           "dest-port-start": "1024",
+                           "dest-port-end": "65535"}}]})
+
+        legacy_count = 0
+        new_count = 0
+        for acl in acls:
+            legacy_count += sum(legacy_flows_count(rule)
+                                for rule in acl["rules"])
+
+            builder = AclFlowBuilder(acl, port_masks=True)
+            builder.MAX_RANGE_LENGTH = 65536 * 65536
+            new_count += sum(len(flows["flow"]) for flows in builder.build())
+
+        LOG.info('Flows of %s ACLs: one by port %s, port/mask pairs %s' %
+                 (len(acls), legacy_count, new_count))
+
+        self.assertLess(new_count * 100, legacy_count)
@@ -1,6 +1,26 @@
 # -*- coding: utf-8 -*-
 
+import re
+import socket
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler
+from BaseHTTPServer import HTTPServer
+from collections import OrderedDict
+from json import dumps
+from json import loads
 from os import environ
+from SocketServer import ThreadingMixIn
+
+
+def build_acl(rules_count, first_id=1):
+    """ ACL with one flow for each rule """
+
+    return {"kind": "default#acl", "rules": [{
+        "id": str(rule_id), "protocol": "tcp", "action": "permit",
+        "source": "10.0.0.0/24", "destination": "10.0.1.0/24",
+        "l4-options": {"dest-port-op": "eq",
+                       "dest-port-start": str(rule_id % 65536)}}
+        for rule_id in xrange(first_id, first_id + rules_count)]}
 
 
 class OpenDaylightTestUtils(object):
@@ -28,3 +48,137 @@ class OpenDaylightTestUtils(object):
 
             equipment_access.fqdn = ctrl_uri
             equipment_access.save()
+
+
+class FakeRestconfHandler(BaseHTTPRequestHandler):
+    """ Handles one connection to FakeRestconfServer, keeping it open """
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.sockets.append(self.connection)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _handle(self):
+        length = int(self.headers.getheader('content-length') or 0)
+        data = loads(self.rfile.read(length)) if length else None
+
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+            status, body = self.server.answer(self.command, self.path, data)
+
+        content = dumps(body) if body is not None else ''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/yang.data+json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeRestconfServer(ThreadingMixIn, HTTPServer):
+    """ Local server answering the RESTCONF requests of the ODL plugin.
+
+    Keeps table 0 of each node in memory and counts the requests and the
+    connections opened by clients.
+    """
+
+    daemon_threads = True
+
+    NODES = "/restconf/config/opendaylight-inventory:nodes/"
+    TOPOLOGIES = [
+        "/restconf/config/network-topology:network-topology/topology/flow:1/",
+        "/restconf/operational/network-topology:network-topology/topology/flow:1/",
+    ]
+    TABLE = re.compile(r'^/restconf/config/opendaylight-inventory:nodes/'
+                       r'node/([^/]+)/flow-node-inventory:table/0/?'
+                       r'(?:flow/([^/]+))?$')
+
+    def __init__(self, nodes_ids):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), FakeRestconfHandler)
+        self.lock = threading.Lock()
+        self.tables = dict((node_id, OrderedDict()) for node_id in nodes_ids)
+        self.requests = []
+        self.connections = 0
+        self.sockets = []
+
+    @property
+    def uri(self):
+        return 'http://%s:%s' % self.server_address
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+        # Ends handlers waiting for requests in connections kept open
+        for sock in self.sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+    def answer(self, method, path, data):
+        """ Returns status and body of the answer to a request """
+
+        not_found = (404, {"errors": {"error": [
+            {"error-message": "Request could not be completed because the "
+                             "relevant data model content does not exist"}]}})
+
+        if method == 'GET' and path == self.NODES:
+            return 200, {"nodes": {"node": [
+                {"id": node_id} for node_id in sorted(self.tables)]}}
+
+        if method == 'GET' and path in self.TOPOLOGIES:
+            return 200, {"topology": [{"topology-id": "flow:1", "node": [
+                {"node-id": node_id} for node_id in sorted(self.tables)]}]}
+
+        match = self.TABLE.match(path)
+        if match is None or match.group(1) not in self.tables:
+            return not_found
+
+        table = self.tables[match.group(1)]
+        flow_id = match.group(2)
+
+        if flow_id is None:
+            if method == 'GET':
+                if not table:
+                    return not_found
+                return 200, {"flow-node-inventory:table": [
+                    {"id": 0, "flow": table.values()}]}
+            if method == 'PUT':
+                table.clear()
+                for flow in data["flow-node-inventory:table"][0]["flow"]:
+                    table[flow["id"]] = flow
+                return 200, None
+            if not table:
+                return not_found
+            table.clear()
+            return 200, None
+
+        if method == 'PUT':
+            table[flow_id] = data["flow"][0]
+            return 200, None
+        if flow_id not in table:
+            return not_found
+        if method == 'GET':
+            return 200, {"flow-node-inventory:flow": [table[flow_id]]}
+        del table[flow_id]
+        return 200, None
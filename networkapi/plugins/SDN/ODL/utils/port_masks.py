@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+PORT_MASK_EXACT = 0xffff
+
+
+def to_port_masks(port_start, port_end):
+    """Returns the minimal list of (port, mask) pairs matching every port
+        from port_start to port_end, both included.
+
+        Each pair is the largest block of ports aligned to its first port
+        that fits in what is left of the range, so a range of 16 bits
+        ports never needs more than 30 pairs. Single ports have mask
+        PORT_MASK_EXACT.
+    """
+
+    port_start = int(port_start)
+    port_end = int(port_end)
+
+    masks = []
+    while port_start <= port_end:
+
+        # Largest block aligned to port_start, then shrink it to the range
+        size = port_start & -port_start if port_start else PORT_MASK_EXACT + 1
+        while size > port_end - port_start + 1:
+            size >>= 1
+
+        masks.append((port_start, PORT_MASK_EXACT & ~(size - 1)))
+        port_start += size
+
+    return masks
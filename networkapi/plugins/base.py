@@ -16,15 +16,18 @@
 import logging
 import random
 import re
+import select
 import string
 import unicodedata
 from time import sleep
+from time import time
 
 import paramiko
 
 from . import exceptions
 from networkapi.api_rest import exceptions as api_exceptions
 from networkapi.equipamento.models import EquipamentoAcesso
+from networkapi.settings import DEPLOY_COMMAND_TIMEOUT
 from networkapi.settings import TFTP_SERVER_ADDR
 from networkapi.util.decorators import mock_return
 
@@ -45,8 +48,20 @@ class BasePlugin(object):
     admin_privileges = 'not defined'
     GUEST_PRIVILEGES = 'not defined'
 
+    # Seconds select waits for the channel before checking it again
+    RECV_POLL_TIMEOUT = 0.1
+    # Seconds to wait for the answer of a command
+    RECV_TIMEOUT = DEPLOY_COMMAND_TIMEOUT
+    RECV_BUFFER_SIZE = 65535
+    # Received characters searched again with each new chunk, so messages
+    # split between two chunks are still found
+    RECV_MATCH_OVERLAP = 512
+
     connect_port = 22
     connect_max_retries = 3
+    # Maximum seconds to wait before the first reconnection, doubled in each
+    # retry. Randomized so processes do not reconnect at the same time.
+    connect_retry_wait = 2
     equipment = None
     equipment_access = None
     channel = None
@@ -114,7 +129,8 @@ class BasePlugin(object):
                         raise Exception(e)
                     log.error('Try %s/%s - Error connecting to host %s: %s' %
                               (retries, self.connect_max_retries, device, e))
-                    sleep(random.randint(1, 15))
+                    sleep(random.uniform(
+                        0, self.connect_retry_wait * 2 ** (retries - 1)))
 
         except IOError, e:
             log.error('Could not connect to host %s: %s' % (device, e))
@@ -177,6 +193,28 @@ class BasePlugin(object):
 
         raise NotImplementedError()
 
+    def recv_chunk(self, deadline=None):
+        """Return the next data sent by equipment.
+
+        Waits in select on the channel, returning as soon as the equipment
+        answers instead of sleeping between checks.
+
+        :param deadline: time() after which CommandTimeoutException is raised
+        """
+
+        while not self.channel.recv_ready():
+            timeout = self.RECV_POLL_TIMEOUT
+            if deadline is not None:
+                remaining = deadline - time()
+                if remaining <= 0:
+                    log.error('Equipment did not answer in %s seconds' %
+                              self.RECV_TIMEOUT)
+                    raise exceptions.CommandTimeoutException()
+                timeout = min(timeout, remaining)
+            select.select([self.channel], [], [], timeout)
+
+        return self.channel.recv(self.RECV_BUFFER_SIZE)
+
     def waitString(self, wait_str_ok_regex='', wait_str_invalid_regex=None, wait_str_failed_regex=None):
 
         if wait_str_invalid_regex is None:
@@ -185,18 +223,20 @@ class BasePlugin(object):
         if wait_str_failed_regex is None:
             wait_str_failed_regex = self.ERROR_REGEX
 
+        deadline = time() + self.RECV_TIMEOUT
         string_ok = 0
         recv_string = ''
         while not string_ok:
-            while not self.channel.recv_ready():
-                sleep(1)
-            recv_string = self.channel.recv(9999)
-            file_name_string = self.removeDisallowedChars(recv_string)
-            if re.search(wait_str_invalid_regex, recv_string, re.DOTALL):
+            start = max(0, len(recv_string) - self.RECV_MATCH_OVERLAP)
+            recv_string += self.recv_chunk(deadline)
+            # Only the end of the previous data is searched again
+            new_string = recv_string[start:]
+            file_name_string = self.removeDisallowedChars(new_string)
+            if re.search(wait_str_invalid_regex, new_string, re.DOTALL):
                 raise exceptions.CommandErrorException(file_name_string)
-            elif re.search(wait_str_failed_regex, recv_string, re.DOTALL):
+            elif re.search(wait_str_failed_regex, new_string, re.DOTALL):
                 raise exceptions.InvalidCommandException(file_name_string)
-            elif re.search(wait_str_ok_regex, recv_string, re.DOTALL):
+            elif re.search(wait_str_ok_regex, new_string, re.DOTALL):
                 string_ok = 1
 
         return recv_string
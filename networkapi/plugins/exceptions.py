@@ -32,6 +32,11 @@ class ConnectionException(APIException):
     default_detail = 'Failed trying to connect to equipment.'
 
 
+class CommandTimeoutException(APIException):
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    default_detail = 'Equipment did not answer the command in time.'
+
+
 class CurrentlyBusyErrorException(APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_detail = 'Equipment is currenlty busy. ' \
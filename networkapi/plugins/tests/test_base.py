@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+import time
+import unittest
+
+import paramiko
+from mock import Mock
+from mock import patch
+
+from networkapi.plugins import exceptions
+from networkapi.plugins.base import BasePlugin
+
+PROMPT = '\r\nswitch#'
+
+
+class FakeSwitch(paramiko.ServerInterface):
+
+    """SSH server answering commands of a shell with canned outputs.
+
+    Outputs are lists of (seconds to wait, data), so answers can be slow or
+    split in chunks.
+    """
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.key = paramiko.RSAKey.generate(1024)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+        self.transport = None
+
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_pty_request(self, channel, term, width, height,
+                                  pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        return True
+
+    def serve(self):
+        conn, _ = self.sock.accept()
+        self.transport = paramiko.Transport(conn)
+        self.transport.add_server_key(self.key)
+        self.transport.start_server(server=self)
+        channel = self.transport.accept(10)
+        if channel is None:
+            return
+
+        buf = ''
+        while True:
+            data = channel.recv(1024)
+            if not data:
+                return
+            buf += data
+            while '\n' in buf:
+                command, buf = buf.split('\n', 1)
+                channel.send(command + '\r\n')
+                for delay, output in self.answers.get(command, []):
+                    time.sleep(delay)
+                    channel.send(output)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        self.sock.close()
+
+
+class WaitStringTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.switch = None
+        self.plugin = None
+
+    def tearDown(self):
+        if self.plugin is not None:
+            self.plugin.channel.close()
+        if self.switch is not None:
+            self.switch.close()
+
+    def connect(self, answers):
+        self.switch = FakeSwitch(answers)
+        self.plugin = BasePlugin(
+            equipment_access=Mock(fqdn='127.0.0.1', user='admin',
+                                  password='admin'),
+            connect_port=self.switch.port)
+        with patch('networkapi.util.decorators.get_variable',
+                   return_value='0'):
+            self.plugin.connect()
+
+    def test_match_split_between_chunks(self):
+        self.connect({
+            'copy': [(0.01, 'Copy complete, now sav'),
+                     (0.05, 'ing to disk' + PROMPT)]
+        })
+
+        self.plugin.channel.send('copy\n')
+        recv = self.plugin.waitString(BasePlugin.VALID_TFTP_GET_MESSAGE)
+
+        self.assertIn('Copy complete, now saving to disk', recv)
+
+    def test_error_split_between_chunks(self):
+        self.connect({
+            'copy': [(0.01, 'Transfer fa'), (0.05, 'iled' + PROMPT)]
+        })
+
+        self.plugin.channel.send('copy\n')
+        with self.assertRaises(exceptions.InvalidCommandException):
+            self.plugin.waitString('Copy complete')
+
+    def test_deadline(self):
+        self.connect({})
+        self.plugin.RECV_TIMEOUT = 0.3
+
+        self.plugin.channel.send('show version\n')
+        start = time.time()
+        with self.assertRaises(exceptions.CommandTimeoutException):
+            self.plugin.waitString('switch#')
+
+        self.assertLess(time.time() - start, 1)
+
+
+class ConnectTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patch('networkapi.util.decorators.get_variable',
+              return_value='0').start()
+        self.sleep = patch('networkapi.plugins.base.sleep').start()
+        self.ssh = patch('networkapi.plugins.base.paramiko.SSHClient').start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_retry_wait_doubles(self):
+        self.ssh.return_value.connect.side_effect = [IOError(), IOError(),
+                                                     None]
+        plugin = BasePlugin(equipment_access=Mock())
+        plugin.connect_max_retries = 4
+
+        with patch('networkapi.plugins.base.random.uniform',
+                   return_value=0) as uniform:
+            plugin.connect()
+
+        self.assertEqual([((0, 2),), ((0, 4),)], uniform.call_args_list)
+        self.assertEqual(2, self.sleep.call_count)
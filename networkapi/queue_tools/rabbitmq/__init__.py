@@ -13,6 +13,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from .queue_manager import begin_batch
+from .queue_manager import end_batch
+from .queue_manager import get_publisher
+from .queue_manager import publish_batch
+from .queue_manager import Publisher
 from .queue_manager import QueueManager
 
-__all__ = ('QueueManager',)
+__all__ = ('begin_batch', 'end_batch', 'get_publisher', 'publish_batch',
+           'Publisher', 'QueueManager')
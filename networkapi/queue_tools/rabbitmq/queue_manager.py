@@ -15,17 +15,179 @@
 # limitations under the License.
 import json
 import logging
+import threading
 import types
+from contextlib import contextmanager
 
 from kombu import Connection
 from kombu import Exchange
-from kombu import Producer
 from kombu import Queue
+from kombu.pools import ProducerPool
 
+from networkapi.settings import BROKER_BUFFER_SIZE
 from networkapi.settings import BROKER_CONNECT_TIMEOUT
 from networkapi.settings import BROKER_DESTINATION
+from networkapi.settings import BROKER_MEMORY_TRANSPORT
+from networkapi.settings import BROKER_POOL_LIMIT
 from networkapi.settings import BROKER_URL
 
+# Publishers by broker uri, shared by every thread of the process
+_publishers = {}
+_publishers_lock = threading.Lock()
+
+# Messages waiting for the end of the current batch of the thread
+_batch = threading.local()
+
+
+class Publisher(object):
+
+    """Publish messages to a broker using a pool of connections.
+
+    Exchanges and queues are declared only on the first message sent to
+    them by the process, not on every send.
+    """
+
+    def __init__(self, broker, limit=BROKER_POOL_LIMIT,
+                 timeout=BROKER_CONNECT_TIMEOUT):
+        self.timeout = float(timeout)
+        self.connection = Connection(broker, connect_timeout=self.timeout)
+        self.producers = ProducerPool(
+            self.connection.Pool(limit=limit), limit=limit)
+        self._declared = set()
+        self._lock = threading.Lock()
+
+    def _declare(self, channel, destination):
+        """Declare exchange and queue of destination once."""
+
+        if destination in self._declared:
+            return
+
+        exchange_name, queue_type, queue_name, routing_key = destination
+        exchange = Exchange(exchange_name, type=queue_type)
+        exchange(channel).declare()
+
+        if queue_name:
+            Queue(name=queue_name, exchange=exchange,
+                  routing_key=routing_key)(channel).declare()
+
+        with self._lock:
+            self._declared.add(destination)
+
+    def publish(self, messages):
+        """Publish messages using one pooled producer.
+
+        :param messages: List of (destination, body), where destination is
+                         (exchange_name, queue_type, queue_name, routing_key)
+        """
+
+        # Blocks while every connection of the pool is in use
+        with self.producers.acquire(block=True,
+                                    timeout=self.timeout) as producer:
+            for destination, body in messages:
+                self._declare(producer.channel, destination)
+                producer.publish(body, exchange=destination[0],
+                                 routing_key=destination[3],
+                                 retry=True, retry_policy={'max_retries': 1})
+
+    def close(self):
+        self.producers.force_close_all()
+        self.producers.connections.force_close_all()
+
+
+def get_publisher(broker):
+    """Return the publisher of the process for broker."""
+
+    publisher = _publishers.get(broker)
+    if publisher is None:
+        with _publishers_lock:
+            publisher = _publishers.get(broker)
+            if publisher is None:
+                publisher = Publisher(broker)
+                _publishers[broker] = publisher
+    return publisher
+
+
+def reset_publishers():
+    """Close and forget the publishers of the process."""
+
+    with _publishers_lock:
+        for publisher in _publishers.values():
+            publisher.close()
+        _publishers.clear()
+
+
+def publish(broker, messages):
+    """Publish messages now or, inside a batch, when the batch ends.
+
+    The messages buffered by a batch are limited to BROKER_BUFFER_SIZE,
+    when the limit is reached the caller publishes them before going on.
+    """
+
+    if not getattr(_batch, 'depth', 0):
+        get_publisher(broker).publish(messages)
+        return
+
+    _batch.messages.extend((broker, message) for message in messages)
+    if len(_batch.messages) >= BROKER_BUFFER_SIZE:
+        flush_batch()
+
+
+def flush_batch():
+    """Publish the messages buffered by the current thread."""
+
+    messages = getattr(_batch, 'messages', None)
+    if not messages:
+        return
+    _batch.messages = []
+
+    by_broker = {}
+    for broker, message in messages:
+        by_broker.setdefault(broker, []).append(message)
+
+    for broker, broker_messages in by_broker.items():
+        get_publisher(broker).publish(broker_messages)
+
+
+def begin_batch():
+    """Start buffering the messages sent by the current thread."""
+
+    if not getattr(_batch, 'depth', 0):
+        _batch.depth = 0
+        _batch.messages = []
+    _batch.depth += 1
+
+
+def end_batch(discard=False):
+    """Close a batch, the outermost one publishes the buffered messages or,
+    with discard, drops them.
+    """
+
+    depth = getattr(_batch, 'depth', 0)
+    if depth > 1:
+        _batch.depth = depth - 1
+        return
+
+    _batch.depth = 0
+    if discard:
+        _batch.messages = []
+    else:
+        flush_batch()
+
+
+@contextmanager
+def publish_batch():
+    """Buffer the messages sent inside the block and publish them together
+    when the outermost block exits. Messages are dropped when it raises.
+    """
+
+    begin_batch()
+    try:
+        yield
+    except:
+        end_batch(discard=True)
+        raise
+    end_batch()
+
 
 class QueueManager(object):
 
@@ -51,10 +213,13 @@ class QueueManager(object):
             BROKER_DESTINATION
         self._queue_type = queue_type
 
-        self.broker = 'amqp://{}/{}'.format(
-            BROKER_URL,
-            broker_vhost,
-        )
+        if BROKER_MEMORY_TRANSPORT:
+            self.broker = 'memory://'
+        else:
+            self.broker = 'amqp://{}/{}'.format(
+                BROKER_URL,
+                broker_vhost,
+            )
 
     def append(self, dict_obj):
         """
@@ -84,33 +249,12 @@ class QueueManager(object):
     def send(self):
 
         try:
-            # Connection
-            conn = Connection(self.broker)
-
-            # Channel
-            channel = conn.channel()
-
-            # Exchange
-            task_exchange = Exchange(self._exchange_name,
-                                     type=self._queue_type)
-
-            # Queues
-            if self._queue_name:
-                queue = Queue(name=self._queue_name, channel=channel,
-                              exchange=task_exchange,
-                              routing_key=self._routing_key)
-                queue.declare()
-
-            # Producer
-            producer = Producer(exchange=task_exchange, channel=channel,
-                                routing_key=self._routing_key)
-
-            # Send message
-            for message in self._msgs:
-                serialized_message = json.dumps(message, ensure_ascii=False)
-                producer.publish(serialized_message)
+            destination = (self._exchange_name, self._queue_type,
+                           self._queue_name, self._routing_key)
 
-            conn.close()
+            publish(self.broker, [
+                (destination, json.dumps(message, ensure_ascii=False))
+                for message in self._msgs])
 
         except Exception, e:
 
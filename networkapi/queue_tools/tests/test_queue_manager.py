@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+from kombu import Connection
+from mock import patch
+
+from networkapi.queue_tools.rabbitmq import publish_batch
+from networkapi.queue_tools.rabbitmq import QueueManager
+from networkapi.queue_tools.rabbitmq.queue_manager import get_publisher
+from networkapi.queue_tools.rabbitmq.queue_manager import reset_publishers
+
+
+class QueueManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patch('networkapi.queue_tools.rabbitmq.queue_manager.'
+              'BROKER_MEMORY_TRANSPORT', True).start()
+        self.connection = Connection('memory://')
+
+    def tearDown(self):
+        patch.stopall()
+        self.connection.close()
+        reset_publishers()
+
+    def send(self, *msgs):
+        queue_manager = QueueManager(broker_vhost='tasks',
+                                     queue_name='tasks.test',
+                                     exchange_name='tasks.test',
+                                     routing_key='tasks.test')
+        for msg in msgs:
+            queue_manager.append(msg)
+        queue_manager.send()
+
+    def received(self):
+        queue = self.connection.SimpleQueue('tasks.test')
+        msgs = []
+        while queue.qsize():
+            message = queue.get(block=False)
+            msgs.append(json.loads(message.body))
+            message.ack()
+        queue.close()
+        return msgs
+
+    def test_send_messages(self):
+        self.send({'id': 1}, {'id': 2})
+        self.assertEqual([{'id': 1}, {'id': 2}], self.received())
+
+    def test_reuse_pooled_connection(self):
+        self.send({'id': 1})
+        publisher = get_publisher('memory://')
+        with patch.object(publisher, '_declare',
+                          wraps=publisher._declare) as declare:
+            self.send({'id': 2})
+            self.send({'id': 3})
+        self.assertIs(publisher, get_publisher('memory://'))
+        self.assertEqual(1, len(publisher._declared))
+        self.assertEqual(2, declare.call_count)
+        self.assertEqual(3, len(self.received()))
+
+    def test_batch_publishes_on_outermost_exit(self):
+        publisher = get_publisher('memory://')
+        with patch.object(publisher, 'publish',
+                          wraps=publisher.publish) as publish:
+            with publish_batch():
+                self.send({'id': 1})
+                with publish_batch():
+                    self.send({'id': 2})
+                self.assertEqual([], self.received())
+                self.send({'id': 3})
+            self.assertEqual(1, publish.call_count)
+        self.assertEqual([{'id': 1}, {'id': 2}, {'id': 3}], self.received())
+
+    def test_full_batch_is_published(self):
+        patch('networkapi.queue_tools.rabbitmq.queue_manager.'
+              'BROKER_BUFFER_SIZE', 2).start()
+        with publish_batch():
+            self.send({'id': 1})
+            self.send({'id': 2})
+            self.assertEqual(2, len(self.received()))
+            self.send({'id': 3})
+            self.assertEqual([], self.received())
+        self.assertEqual([{'id': 3}], self.received())
+
+    def test_batch_dropped_when_block_raises(self):
+        with self.assertRaises(ValueError):
+            with publish_batch():
+                self.send({'id': 1})
+                raise ValueError()
+        self.send({'id': 2})
+        self.assertEqual([{'id': 2}], self.received())
+
+    def test_batch_publish_error(self):
+        publisher = get_publisher('memory://')
+        with patch.object(publisher, 'publish', side_effect=IOError):
+            with self.assertRaises(IOError):
+                with publish_batch():
+                    self.send({'id': 1})
+
+    def test_send_error(self):
+        publisher = get_publisher('memory://')
+        with patch.object(publisher, 'publish', side_effect=IOError):
+            with self.assertRaises(Exception):
+                self.send({'id': 1})
@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 import logging
-import re
 
 from django.core.exceptions import ObjectDoesNotExist
 from netaddr import IPNetwork
 
+from networkapi.api_rack.addressing import get_subnet
 from networkapi.rack.models import RackConfigError
 from networkapi.system import exceptions as var_exceptions
 from networkapi.system.facade import get_value as get_variable
+from networkapi.util.template import get_roteiro
+from networkapi.util.template import substitute
 
 log = logging.getLogger(__name__)
 
@@ -15,26 +17,15 @@ log = logging.getLogger(__name__)
 def replace(filein, fileout, dicionario):
     try:
         # Read contents from file as a single string
-        file_handle = open(filein, 'r')
-        file_string = file_handle.read()
-        file_handle.close()
+        file_string = get_roteiro(filein)
     except:
         raise RackConfigError(
             None, None, 'Erro abrindo roteiro: %s.' % (filein))
     try:
-        #
-        for key in dicionario:
-            # Use RE package to allow for replacement (also allowing for
-            # (multiline) REGEX)
-            file_string = (re.sub(key, dicionario[key], file_string))
-    except:
-        raise RackConfigError(
-            None, None, 'Erro atualizando as variáveis no roteiro: %s.' % (filein))
-    try:
-        # Write contents to file.
+        # Write contents to file, replacing all variables in a single pass.
         # Using mode 'w' truncates the file.
         file_handle = open(fileout, 'w')
-        file_handle.write(file_string)
+        file_handle.writelines(substitute(file_string, dicionario))
         file_handle.close()
     except:
         raise RackConfigError(
@@ -42,8 +33,7 @@ def replace(filein, fileout, dicionario):
 
 
 def splitnetworkbyrack(net, bloco, posicao):
-    subnets = list(net.subnet(bloco))
-    return subnets[posicao]
+    return get_subnet(net, bloco, posicao)
 
 
 def dic_vlan_core(variablestochangecore, rack, name_core, name_rack):
@@ -20,6 +20,7 @@ from urllib2 import *
 from _mysql_exceptions import OperationalError
 from django.db import transaction
 from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from rest_framework.exceptions import AuthenticationFailed
 
 from networkapi.api_rest.authentication import BasicAuthentication
@@ -141,6 +142,10 @@ class RestResource(object):
         if not request.user.is_anonymous():
             return request.user
 
+        # Failed authentication is not repeated in the same request
+        if hasattr(request, '_legacy_auth_failed'):
+            return None
+
         user = None
         username, password, user_ldap = RestResource.read_user_data(request)
 
@@ -155,6 +160,8 @@ class RestResource(object):
 
         if user:
             request.user = user
+        else:
+            request._legacy_auth_failed = True
 
         return user
 
@@ -229,6 +236,20 @@ class RestResource(object):
 
         return http_res
 
+    def stream_response(self, content, status=200, content_type='text/plain'):
+        """Cria um StreamingHttpResponse que envia as partes do conteúdo à
+        medida que são geradas, como as de xml_utils.iter_dumps."""
+
+        http_res = StreamingHttpResponse(
+            content,
+            status=status,
+            content_type=content_type)
+
+        http_res['X-Request-Id'] = local.request_id
+        http_res['X-Request-Context'] = local.request_context
+
+        return http_res
+
 
 class RestResponse:
 
@@ -103,6 +103,9 @@ CACHES = {
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
+# Backend of distributed locks: memcached or mysql (GET_LOCK, needs MySQL 5.7+)
+LOCK_BACKEND = os.getenv('NETWORKAPI_LOCK_BACKEND', 'memcached')
+
 # Diretório dos arquivos dos scripts
 # SCRIPTS_DIR = os.path.abspath(os.path.join(__file__, '../../scripts'))
 SCRIPTS_DIR = os.getenv('NETWORKAPI_SCRIPTS_DIR', os.path.abspath(
@@ -270,6 +273,19 @@ SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', '')
 VLAN_CACHE_TIME = None
 EQUIPMENT_CACHE_TIME = None
 
+# Seconds that system variables are kept in memory by each worker.
+# 0 disables the cache.
+VARIABLE_CACHE_TIME = int(os.getenv('NETWORKAPI_VARIABLE_CACHE_TIME', '30'))
+
+# Seconds that successful credentials are remembered by each worker, so
+# bursts of requests do not repeat AuthAPI/LDAP authentication.
+# 0 disables the cache.
+AUTH_CACHE_TIME = int(os.getenv('NETWORKAPI_AUTH_CACHE_TIME', '10'))
+
+# Seconds that administrative and equipment group permissions of user
+# groups are kept in memory by each worker. 0 disables the cache.
+PERMISSION_CACHE_TIME = int(os.getenv('NETWORKAPI_PERMISSION_CACHE_TIME', '30'))
+
 # List of callables that know how to import templates from various sources.
 MIDDLEWARE_CLASSES = (
     'networkapi.extra_logging.middleware.ExtraLoggingMiddleware',
@@ -724,6 +740,48 @@ BROKER_DESTINATION = os.getenv('NETWORKAPI_BROKER_DESTINATION', 'tasks')
 BROKER_URL = os.getenv('NETWORKAPI_BROKER_URL',
                        u'networkapi:networkapi@localhost:5672')
 
+# Connections kept by the process-wide publisher of each broker vhost
+BROKER_POOL_LIMIT = int(os.getenv('NETWORKAPI_BROKER_POOL_LIMIT', '10'))
+
+# Messages buffered in a view before they are published
+BROKER_BUFFER_SIZE = int(os.getenv('NETWORKAPI_BROKER_BUFFER_SIZE', '500'))
+
+# Publish to kombu in-memory transport instead of the broker (tests)
+BROKER_MEMORY_TRANSPORT = os.getenv(
+    'NETWORKAPI_BROKER_MEMORY_TRANSPORT', '0') == '1'
+
+
+##################################
+#       DEPLOY SETTINGS
+##################################
+
+# Equipments receiving the same deploy in parallel
+DEPLOY_WORKERS = int(os.getenv('NETWORKAPI_DEPLOY_WORKERS', '4'))
+
+# Seconds to wait for the answer of each command sent by CLI plugins
+DEPLOY_COMMAND_TIMEOUT = int(
+    os.getenv('NETWORKAPI_DEPLOY_COMMAND_TIMEOUT', '300'))
+
+# Seconds to wait for the deploy in each equipment
+DEPLOY_TIMEOUT = int(os.getenv('NETWORKAPI_DEPLOY_TIMEOUT', '600'))
+
+
+##################################
+#       F5 PLUGIN SETTINGS
+##################################
+
+# Idle iControl sessions kept by each process for each F5 device
+F5_SESSION_POOL_SIZE = int(os.getenv('NETWORKAPI_F5_SESSION_POOL_SIZE', '4'))
+
+# Seconds an idle session can be reused, must be lower than the session
+# timeout of the device (variable set_session_timeout_plugin_f5)
+F5_SESSION_IDLE_TIME = int(os.getenv('NETWORKAPI_F5_SESSION_IDLE_TIME', '30'))
+
+# Directory where WSDLs of iControl are cached. The cache is loaded with
+# pickle, so the directory must be private to the user of the application.
+# WSDLs are not cached when it is not set.
+F5_WSDL_CACHE_DIR = os.getenv('NETWORKAPI_F5_WSDL_CACHE_DIR') or None
+
 
 ##################################
 # CELERY SETTINGS
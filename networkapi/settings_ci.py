@@ -22,8 +22,12 @@ from settings import ALLOWED_HOSTS
 from settings import AMBLOG_MGMT
 from settings import APPLYED_CONFIG_REL_PATH
 from settings import ASSOCIATE_PERMISSION_AUTOMATICALLY
+from settings import AUTH_CACHE_TIME
+from settings import BROKER_BUFFER_SIZE
 from settings import BROKER_CONNECT_TIMEOUT
 from settings import BROKER_DESTINATION
+from settings import BROKER_MEMORY_TRANSPORT
+from settings import BROKER_POOL_LIMIT
 from settings import BROKER_URL
 from settings import CACHE_BACKEND
 from settings import CACHES
@@ -44,8 +48,14 @@ from settings import CONFIG_TEMPLATE_PATH
 from settings import DATABASES
 from settings import DEBUG
 from settings import DEFAULT_CHARSET
+from settings import DEPLOY_COMMAND_TIMEOUT
+from settings import DEPLOY_TIMEOUT
+from settings import DEPLOY_WORKERS
 from settings import DIVISAODC_MGMT
 from settings import EQUIPMENT_CACHE_TIME
+from settings import F5_SESSION_IDLE_TIME
+from settings import F5_SESSION_POOL_SIZE
+from settings import F5_WSDL_CACHE_DIR
 from settings import FOREMAN_HOSTS_ENVIRONMENT_ID
 from settings import FOREMAN_PASSWORD
 from settings import FOREMAN_URL
@@ -61,6 +71,7 @@ from settings import KICKSTART_SO_LF
 from settings import LANGUAGE_CODE
 from settings import LEAF
 from settings import local_files
+from settings import LOCK_BACKEND
 from settings import LOG_DAYS
 from settings import LOG_DB_LEVEL
 from settings import LOG_FILE
@@ -106,6 +117,7 @@ from settings import PATH_TO_ADD_CONFIG
 from settings import PATH_TO_CONFIG
 from settings import PATH_TO_GUIDE
 from settings import PATH_TO_MV
+from settings import PERMISSION_CACHE_TIME
 from settings import POOL_CREATE
 from settings import POOL_HEALTHCHECK
 from settings import POOL_MANAGEMENT_LB_METHOD
@@ -147,6 +159,7 @@ from settings import USE_I18N
 from settings import USER_SCRIPTS_FILES_PATH
 from settings import USER_SCRIPTS_REL_PATH
 from settings import USER_SCRIPTS_TOAPPLY_REL_PATH
+from settings import VARIABLE_CACHE_TIME
 from settings import VIP_CREATE
 from settings import VIP_REAL_v4_CHECK
 from settings import VIP_REAL_v4_CREATE
@@ -14,15 +14,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import time
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
 
 from networkapi.api_rest import exceptions as api_exceptions
+from networkapi.settings import VARIABLE_CACHE_TIME
 from networkapi.system import exceptions
 from networkapi.system.models import Variable
 
 log = logging.getLogger(__name__)
 
+# Snapshot of variables table shared by all requests of this worker
+_variables_cache = {
+    'values': None,
+    'expires': 0
+}
+
 
 def save_variable(name, value, description):
 
@@ -68,7 +78,50 @@ def get_by_name(name):
     return var
 
 
+def get_cached_variables():
+    """Return dict name -> value of all variables.
+
+    All variables are loaded with a single query and kept in memory for
+    VARIABLE_CACHE_TIME seconds or until some variable is saved or deleted.
+    """
+
+    values = _variables_cache['values']
+
+    if values is None or _variables_cache['expires'] < time.time():
+        values = dict()
+        # Like uniqueResult, first variable found with a name is used
+        for name, value in Variable.objects.values_list('name', 'value')\
+                .order_by('id'):
+            values.setdefault(name, value)
+
+        _variables_cache['values'] = values
+        _variables_cache['expires'] = time.time() + VARIABLE_CACHE_TIME
+
+    return values
+
+
+def clear_variables_cache(*args, **kwargs):
+    """Discard variables kept in memory by this worker."""
+
+    _variables_cache['values'] = None
+    _variables_cache['expires'] = 0
+
+
+post_save.connect(clear_variables_cache, sender=Variable,
+                  dispatch_uid='clear_variables_cache_save')
+post_delete.connect(clear_variables_cache, sender=Variable,
+                    dispatch_uid='clear_variables_cache_delete')
+
+
 def get_value(name, default=None):
+    if VARIABLE_CACHE_TIME:
+        value = get_cached_variables().get(name)
+        if value is None:
+            if default:
+                return default
+            raise exceptions.VariableDoesNotExistException()
+        return value
+
     try:
         var = Variable.objects.filter(name=name).uniqueResult()
     except ObjectDoesNotExist:
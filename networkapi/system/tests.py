@@ -5,7 +5,17 @@ when you run "manage.py test".
 
 Replace this with more appropriate tests for your application.
 """
+import time
+import unittest
+
+from django.db.models.signals import post_save
 from django.test import TestCase
+from mock import patch
+
+from networkapi.settings import VARIABLE_CACHE_TIME
+from networkapi.system import facade
+from networkapi.system.exceptions import VariableDoesNotExistException
+from networkapi.system.models import Variable
 
 
 class SimpleTest(TestCase):
@@ -15,3 +25,40 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class VariableCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        facade.clear_variables_cache()
+        self.values_list = patch(
+            'networkapi.system.models.Variable.objects.values_list').start()
+        self.values_list.return_value.order_by.return_value = [
+            ('use_ldap', '0'), ('use_cache_user', '1'), ('use_ldap', '1')]
+
+    def tearDown(self):
+        patch.stopall()
+        facade.clear_variables_cache()
+
+    def test_get_value_loads_all_variables_once(self):
+        self.assertEqual('0', facade.get_value('use_ldap'))
+        self.assertEqual('1', facade.get_value('use_cache_user'))
+        self.assertEqual(1, self.values_list.call_count)
+
+    def test_get_value_not_found(self):
+        self.assertEqual('default', facade.get_value('unknown', 'default'))
+        with self.assertRaises(VariableDoesNotExistException):
+            facade.get_value('unknown')
+
+    def test_get_value_reloads_after_timeout(self):
+        facade.get_value('use_ldap')
+        with patch('networkapi.system.facade.time.time',
+                   return_value=time.time() + VARIABLE_CACHE_TIME + 1):
+            facade.get_value('use_ldap')
+        self.assertEqual(2, self.values_list.call_count)
+
+    def test_save_variable_clears_cache(self):
+        facade.get_value('use_ldap')
+        post_save.send(sender=Variable, instance=Variable(), created=True)
+        facade.get_value('use_ldap')
+        self.assertEqual(2, self.values_list.call_count)
@@ -6,6 +6,9 @@ import base64
 import json
 import logging
 
+from django.core.signals import request_started
+from django.db import connection
+from django.db import reset_queries
 from django.test import TestCase
 
 from networkapi.settings import local_files
@@ -15,6 +18,26 @@ from networkapi.test.utils import load_file_as_string
 LOG = logging.getLogger(__name__)
 
 
+class _CaptureQueriesContext(object):
+
+    """Counts the queries executed inside it, including the ones of the
+    requests made by the test client."""
+
+    def __enter__(self):
+        self.old_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        # The queries of the connection are reset when a request starts
+        request_started.disconnect(reset_queries)
+        self.starting_queries = len(connection.queries)
+        self.executed = 0
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        connection.use_debug_cursor = self.old_debug_cursor
+        request_started.connect(reset_queries)
+        self.executed = len(connection.queries) - self.starting_queries
+
+
 class NetworkApiTestCase(TestCase):
 
     def setUp(self):
@@ -83,3 +106,7 @@ class NetworkApiTestCase(TestCase):
             received_data,
             msg.format(expected_data, received_data)
         )
+
+    def capture_queries(self):
+        """Context manager that counts the queries executed inside it."""
+        return _CaptureQueriesContext()
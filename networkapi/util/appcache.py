@@ -1,9 +1,9 @@
 import hashlib
 import logging
+import time
 
 from django.core.cache import cache as djangocache
 
-from networkapi.distributedlock import distributedlock
 from networkapi.system.facade import get_value
 
 
@@ -42,13 +42,60 @@ def get_cache(key):
         log.error(ERROR)
 
 
+def _get_namespace_key(prefix):
+    return '%s:version' % prefix
+
+
+def _get_namespace_version(prefix):
+    """Return current version of namespace prefix, creating it if needed.
+
+    New namespaces start with current time in milliseconds instead of 1, so
+    if the version entry is evicted, entries cached with the old version are
+    not reachable again.
+    """
+
+    key = _get_namespace_key(prefix)
+    version = djangocache.get(key)
+    if version is None:
+        djangocache.add(key, int(time.time() * 1000), DEFAULT_CACHE_TIMEOUT)
+        version = djangocache.get(key)
+    return version
+
+
+def _get_search_key(prefix, search):
+    search_md5 = hashlib.md5(str(search)).hexdigest()
+    return '%s:%s:%s' % (prefix, _get_namespace_version(prefix), search_md5)
+
+
+# Hits, misses, sets and invalidations of cached searches in this process,
+# by prefix
+cache_stats = dict()
+
+
+def _count(prefix, name):
+    stats = cache_stats.setdefault(prefix, {
+        'hits': 0,
+        'misses': 0,
+        'sets': 0,
+        'invalidations': 0,
+    })
+    stats[name] += 1
+
+
+def get_cache_stats():
+    """Return counters of cached searches of this process by prefix."""
+
+    return dict((prefix, dict(stats))
+                for prefix, stats in cache_stats.items())
+
+
 def get_cached_search(prefix, search):
 
     if cache_enabled():
         try:
-            search_md5 = hashlib.md5(str(search)).hexdigest()
-            key = prefix+search_md5
+            key = _get_search_key(prefix, search)
             data = get_cache(key)
+            _count(prefix, 'hits' if data is not None else 'misses')
             return data
         except Exception as e:
             log.error(e)
@@ -56,44 +103,42 @@ def get_cached_search(prefix, search):
 
 
 def set_cache_search_with_list(prefix, search, data, timeout=DEFAULT_CACHE_TIMEOUT):
+    """Cache result of a search in namespace prefix.
 
-    if cache_enabled():
-        with distributedlock(prefix):
-            try:
-                search_md5 = hashlib.md5(str(search)).hexdigest()
-                key = prefix+search_md5
-                djangocache.set(key, data, timeout)
-
-                cached_search_md5_list = get_cache(prefix)
-                if not cached_search_md5_list:
-                    cached_search_md5_list = []
+    Key of entry has current version of namespace, so there is no list of
+    keys to keep and no lock to take.
+    """
 
-                if search_md5 not in cached_search_md5_list:
-                    cached_search_md5_list.append(search_md5)
-
-                log.debug("Caching key %s in list %s with timeout %s..." %
-                          (key, prefix, timeout))
-                key = prefix
-                djangocache.set(key, cached_search_md5_list, timeout)
-            except Exception as e:
-                log.error(e)
+    if cache_enabled():
+        try:
+            key = _get_search_key(prefix, search)
+            log.debug("Caching key %s in namespace %s with timeout %s..." %
+                      (key, prefix, timeout))
+            djangocache.set(key, data, timeout)
+            _count(prefix, 'sets')
+        except Exception as e:
+            log.error(e)
 
 
 def delete_cached_searches_list(prefix):
+    """Invalidate all searches cached in namespace prefix.
+
+    Namespace version is incremented atomically, so entries of previous
+    version are not read anymore and expire by themselves.
+    """
 
     if cache_enabled():
-        with distributedlock(prefix):
+        try:
+            log.debug("Invalidating cache namespace %s ..." % prefix)
             try:
-                cached_search_md5_list = get_cache(prefix)
-                if cached_search_md5_list:
-                    for cached_search_md5 in cached_search_md5_list:
-                        key = str(prefix)+str(cached_search_md5)
-                        log.debug("Deleting cache entry %s ... " % key)
-                        djangocache.delete(key)
-                    log.debug("Deleting cache list entry %s ..." % prefix)
-                    djangocache.delete(prefix)
-            except Exception as e:
-                log.error(e)
-                raise e
-
-            return True
+                djangocache.incr(_get_namespace_key(prefix))
+            except ValueError:
+                # Namespace was never used or was evicted, so a new
+                # version will be created by next search
+                pass
+            _count(prefix, 'invalidations')
+        except Exception as e:
+            log.error(e)
+            raise e
+
+        return True
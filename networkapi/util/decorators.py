@@ -105,6 +105,36 @@ def permission_obj_apiview(functions):
     return outer
 
 
+def buffer_audit_apiview(func):
+    """Saves event logs of the view with a single insert when it returns.
+
+    Must be below commit_on_success, so event logs are saved in the
+    transaction of the changes.
+    """
+    @functools.wraps(func)
+    def inner(self, request, *args, **kwargs):
+        from networkapi.models.models_signal_receiver import audit_buffer
+
+        with audit_buffer():
+            return func(self, request, *args, **kwargs)
+    return inner
+
+
+def publish_batch_apiview(func):
+    """Publishes queue messages sent by the view together when it returns.
+
+    Must be below commit_on_success, so an error publishing them rolls back
+    the changes of the view. Messages of a view that raises are dropped.
+    """
+    @functools.wraps(func)
+    def inner(self, request, *args, **kwargs):
+        from networkapi.queue_tools.rabbitmq import publish_batch
+
+        with publish_batch():
+            return func(self, request, *args, **kwargs)
+    return inner
+
+
 def raise_exception_treat(func):
     @functools.wraps(func)
     def inner(self, request, *args, **kwargs):
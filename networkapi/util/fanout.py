@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+import logging
+import sys
+import threading
+from Queue import Empty
+from Queue import Queue
+from time import time
+
+from django.db import connections
+
+from networkapi.extra_logging import local
+from networkapi.plugins import exceptions as base_exceptions
+from networkapi.settings import DEPLOY_TIMEOUT
+from networkapi.settings import DEPLOY_WORKERS
+
+log = logging.getLogger(__name__)
+
+
+def _close_connections():
+    """Close DB connections opened by the current thread."""
+
+    for connection in connections.all():
+        connection.close()
+
+
+class FanOut(object):
+
+    """Run a call for each device in a bounded pool of threads.
+
+    Each device has its own timeout, counted from the moment its call
+    starts. After the first failure or timeout no other device is started,
+    devices already finished with success are compensated and the error of
+    the first failed device, in the order devices were given, is raised.
+    Calls that succeed after their timeout are compensated when they end.
+
+    Calls run in other threads, so they use their own DB connections and
+    do not see uncommitted changes of the caller. Queries they do, like
+    the ones plugins do to find the access of the device, only see what
+    was committed.
+
+    A single device is called in the caller thread, inside its transaction
+    and without timeout.
+    """
+
+    def __init__(self, call, compensate=None, timeout=DEPLOY_TIMEOUT,
+                 workers=DEPLOY_WORKERS):
+
+        self.call = call
+        self.compensate = compensate
+        self.timeout = timeout
+        self.workers = workers
+
+    def __call__(self, devices):
+        """Return dict of results by device id.
+
+        :param devices: List of (device id, device)
+        """
+
+        devices = list(devices)
+
+        if len(devices) <= 1:
+            # Nothing to wait for, keep the call in the caller transaction
+            return dict((device_id, self.call(device_id, device))
+                        for device_id, device in devices)
+
+        self._results = dict()
+        self._started = dict()
+        self._failed = False
+        self._cond = threading.Condition()
+        self._queue = Queue()
+        for item in devices:
+            self._queue.put(item)
+
+        context = dict(local.__dict__)
+        for _ in range(min(self.workers, len(devices))):
+            worker = threading.Thread(target=self._work, args=(context,))
+            worker.daemon = True
+            worker.start()
+
+        self._wait([device_id for device_id, _ in devices])
+
+        errors = [(device_id, self._results[device_id][1])
+                  for device_id, _ in devices
+                  if device_id in self._results and
+                  not self._results[device_id][0]]
+
+        if errors:
+            self._rollback(devices)
+            for device_id, exc_info in errors:
+                log.error('Call failed in equipment %s: %s' %
+                          (device_id, exc_info[1]))
+            exc_info = errors[0][1]
+            raise exc_info[0], exc_info[1], exc_info[2]
+
+        return dict((device_id, result[1])
+                    for device_id, result in self._results.items())
+
+    def _work(self, context):
+
+        local.__dict__.update(context)
+        try:
+            while True:
+                with self._cond:
+                    if self._failed:
+                        return
+                    try:
+                        device_id, device = self._queue.get_nowait()
+                    except Empty:
+                        return
+                    self._started[device_id] = time()
+                    self._cond.notify_all()
+
+                try:
+                    result = (True, self.call(device_id, device))
+                except Exception:
+                    result = (False, sys.exc_info())
+
+                with self._cond:
+                    late = device_id in self._results
+                    if not late:
+                        self._results[device_id] = result
+                        self._failed = self._failed or not result[0]
+                    self._cond.notify_all()
+
+                if late:
+                    log.warning('Call in equipment %s finished after '
+                                'timeout' % device_id)
+                    if result[0]:
+                        self._compensate(device_id, device, result[1])
+        finally:
+            _close_connections()
+
+    def _wait(self, device_ids):
+        """Wait for started calls, giving up on calls out of time."""
+
+        with self._cond:
+            while True:
+                now = time()
+                running = list()
+                for device_id in self._started:
+                    if device_id in self._results:
+                        continue
+                    if now - self._started[device_id] < self.timeout:
+                        running.append(device_id)
+                        continue
+                    msg = 'Equipment %s did not answer in %s seconds' % \
+                        (device_id, self.timeout)
+                    try:
+                        raise base_exceptions.CommandErrorException(msg)
+                    except Exception:
+                        self._results[device_id] = (False, sys.exc_info())
+                    self._failed = True
+
+                # Nothing running and nothing else will start
+                if not running and (self._failed or
+                                    len(self._results) == len(device_ids)):
+                    return
+
+                if running:
+                    deadline = min(self._started[device_id]
+                                   for device_id in running) + self.timeout
+                    self._cond.wait(max(deadline - now, 0.01))
+                else:
+                    self._cond.wait(1)
+
+    def _rollback(self, devices):
+        """Compensate devices where the call was done."""
+
+        for device_id, device in devices:
+            result = self._results.get(device_id)
+            if result is None or not result[0]:
+                continue
+            self._compensate(device_id, device, result[1])
+
+    def _compensate(self, device_id, device, result):
+
+        if self.compensate is None:
+            return
+
+        try:
+            log.info('Compensating call in equipment %s' % device_id)
+            self.compensate(device_id, device, result)
+        except Exception, e:
+            log.error('Error compensating call in equipment %s: %s' %
+                      (device_id, e))
+
+
+def fan_out(devices, call, compensate=None, timeout=DEPLOY_TIMEOUT,
+            workers=DEPLOY_WORKERS):
+    """Run call(device_id, device) in parallel for each device.
+
+    See FanOut, compensate(device_id, device, result) is called for devices
+    where the call was done when another one failed or timed out.
+    """
+
+    return FanOut(call, compensate, timeout, workers)(devices)
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import copy
 import logging
-import random
 import urllib
 from time import sleep
 
@@ -10,8 +9,11 @@ from django.db.models.loading import import_module
 from django.db.models.loading import module_has_submodule
 from rest_framework.response import Response
 
+from networkapi.distributedlock import acquire_locks
 from networkapi.distributedlock import distributedlock
 from networkapi.distributedlock import LockNotAcquiredError
+from networkapi.distributedlock import release_locks
+from networkapi.distributedlock.backoff import backoff_delay
 from networkapi.extra_logging import local
 
 log = logging.getLogger(__name__)
@@ -42,49 +44,49 @@ class CustomResponse(Response):
 def create_lock(objects, lock_name):
     """Creates locks for list of objects"""
 
-    locks_list = list()
+    keys = list()
     for obj in objects:
         if isinstance(obj, dict):
-            lock = distributedlock(lock_name % obj['id'])
+            keys.append(lock_name % obj['id'])
         else:
-            lock = distributedlock(lock_name % obj)
-        lock.__enter__()
-        locks_list.append(lock)
+            keys.append(lock_name % obj)
 
-    return locks_list
+    return acquire_locks(keys)
 
 
 def destroy_lock(locks_list):
     """Destroys locks by list of objects"""
 
-    for lock in locks_list:
-        lock.__exit__('', '', '')
+    release_locks(locks_list)
 
 
 def create_lock_with_blocking(locks_name):
     """
     Creates locks for list of objects.
     Tries to lock all objects, if can not, unlocks all
-    and tries again in 1 at 10 seconds.
+    and tries again after an increasing random delay.
     """
 
-    locks_list = list()
-    for lock_name in locks_name:
-        try:
-            lock = distributedlock(lock_name, blocking=False)
-            lock.__enter__()
-            locks_list.append(lock)
-        except LockNotAcquiredError:
-            destroy_lock(locks_list)
-            break
-
-    if locks_name and not locks_list:
-        time_sleep = random.randint(1, 10)
-        log.warning('Trying lock in %s seconds' % time_sleep)
+    attempt = 0
+    while True:
+        locks_list = list()
+        for lock_name in sorted(set(locks_name)):
+            try:
+                lock = distributedlock(lock_name, blocking=False)
+                lock.__enter__()
+                locks_list.append(lock)
+            except LockNotAcquiredError:
+                destroy_lock(locks_list)
+                locks_list = None
+                break
+
+        if locks_list is not None:
+            return locks_list
+
+        time_sleep = backoff_delay(attempt)
+        attempt += 1
+        log.debug('Trying lock in %.3f seconds' % time_sleep)
         sleep(time_sleep)
-        create_lock_with_blocking(locks_name)
-
-    return locks_list
 
 
 def url_search(obj_model, property_search, request):
@@ -158,6 +160,8 @@ def generate_return_json(obj_serializer, main_property, **kwargs):
             'url_prev_search': str(url_prev_search),
             'prev_search': obj_model.get('prev_search')
         })
+        if 'next_cursor' in obj_model:
+            data['next_cursor'] = obj_model.get('next_cursor')
 
     return data
 
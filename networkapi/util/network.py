@@ -1,15 +1,102 @@
 # -*- coding: utf-8 -*-
 import logging
+from bisect import bisect_left
 
 from django.db.models.query_utils import Q
 
 from networkapi.api_network.exceptions import NetworkConflictException
+from networkapi.infrastructure.ipaddr import IPAddress
 from networkapi.infrastructure.ipaddr import IPNetwork
 from networkapi.util.geral import get_app
 
 log = logging.getLogger(__name__)
 
 
+def get_first_free_address(first, last, used, topdown=False):
+    """Return the first integer address between first and last (inclusive)
+    that is not in used, or None when the range is exhausted.
+
+    Only used addresses inside the range are visited, so the cost depends on
+    the number of allocated addresses instead of the size of the network.
+    """
+
+    used = sorted(set(addr for addr in used if first <= addr <= last),
+                  reverse=topdown)
+
+    step = -1 if topdown else 1
+    candidate = last if topdown else first
+
+    # Used addresses are sorted in walking order, so the first one that
+    # does not match the candidate marks a gap.
+    for addr in used:
+        if addr != candidate:
+            break
+        candidate += step
+
+    if first <= candidate <= last:
+        return candidate
+
+    return None
+
+
+def get_free_numbers(ranges, used, count=1):
+    """Return list with the count lowest numbers of ranges not in used.
+
+    Ranges are (first, last), inclusive, searched in the given order, so
+    free numbers of the first range come before those of the second one.
+    Only used numbers are visited, so the cost depends on the number of
+    used numbers instead of the size of the ranges.
+    """
+
+    used = sorted(set(used))
+    free = list()
+
+    for first, last in ranges:
+        number = first
+        idx = bisect_left(used, number)
+        while number <= last and len(free) < count:
+            if idx < len(used) and used[idx] == number:
+                number += 1
+                idx += 1
+                continue
+
+            # Gap until the next used number or the end of the range
+            end = min(last, used[idx] - 1) if idx < len(used) else last
+            end = min(end, number + count - len(free) - 1)
+            free.extend(xrange(number, end + 1))
+            number = end + 1
+
+        # Ranges may overlap, numbers taken are not free in the next ones
+        used = sorted(set(used).union(free))
+
+    return free
+
+
+def get_available_address(net, used, min_reserved=0, max_reserved=0,
+                          topdown=False):
+    """Return first available host address of net as IPv4Address/IPv6Address.
+
+    :param net: IPv4Network or IPv6Network
+    :param used: Iterable of integer addresses already allocated
+    :param min_reserved: Number of first hosts that can not be used
+                         (Configuration.IPv4_MIN/IPv6_MIN)
+    :param max_reserved: Number of last hosts that can not be used
+                         (Configuration.IPv4_MAX/IPv6_MAX)
+    :param topdown: Search from the last host to the first one
+    """
+
+    # Network and broadcast addresses are never hosts
+    first = int(net.network) + max(1, min_reserved)
+    last = int(net.broadcast) - max(1, max_reserved)
+
+    address = get_first_free_address(first, last, used, topdown)
+
+    if address is None:
+        return None
+
+    return IPAddress(address, version=net.version)
+
+
 def get_free_space_network(free_nets, used_nets):
     """Return list of free subnets."""
 
@@ -31,6 +118,41 @@ def get_free_space_network(free_nets, used_nets):
     return free_nets
 
 
+def get_free_subnet(net, used_nets, new_prefix):
+    """Return first subnet of net with prefix new_prefix that does not
+    intersect used_nets, or None when there is no room for it.
+
+    Used networks not contained in net are ignored, like in
+    get_free_space_network. Instead of splitting net in free fragments for
+    each used network, used networks are kept as sorted address intervals
+    and scanned once, jumping to the next aligned block after each of them.
+    """
+
+    if not net.prefixlen <= new_prefix <= net.max_prefixlen:
+        return None
+
+    first = int(net.network)
+    last = int(net.broadcast)
+    size = 1 << (net.max_prefixlen - new_prefix)
+
+    used = sorted((int(used_net.network), int(used_net.broadcast))
+                  for used_net in used_nets if used_net in net)
+
+    # First address aligned to the new prefix
+    candidate = first
+    for used_first, used_last in used:
+        if candidate + size - 1 < used_first:
+            break
+        if used_last >= candidate:
+            candidate = (used_last // size + 1) * size
+
+    if candidate + size - 1 > last:
+        return None
+
+    return IPNetwork('%s/%s' % (IPAddress(candidate, version=net.version),
+                                new_prefix), version=net.version)
+
+
 def verify_networks(subnets, supernets):
     """Verify a list of networks has make intersect with a second list and
     contrariwise.
@@ -1,12 +1,110 @@
 # -*- coding: utf-8 -*-
+import inspect
 import logging
 
+from django.db.models.fields.related import ForeignRelatedObjectsDescriptor
+from django.db.models.fields.related import ManyRelatedObjectsDescriptor
+from django.db.models.fields.related import ReverseManyRelatedObjectsDescriptor
+from django.db.models.fields.related import ReverseSingleRelatedObjectDescriptor
+from django.db.models.fields.related import SingleRelatedObjectDescriptor
 from rest_framework import serializers
 
 from networkapi.models.BaseManager import BaseQuerySet
 
 log = logging.getLogger(__name__)
 
+# Levels of nested serializers followed by the eager loading planner
+EAGER_LOADING_DEPTH = 4
+
+
+def get_relation(model, name):
+    """Return (related model, many) of relation name of model, or
+    (None, None) when name is not a relation.
+
+    Attributes are looked up in the class dicts, so properties of the model
+    are not evaluated.
+    """
+
+    for klass in inspect.getmro(model):
+        descriptor = klass.__dict__.get(name)
+        if descriptor is not None:
+            break
+    else:
+        return None, None
+
+    if isinstance(descriptor, ReverseSingleRelatedObjectDescriptor):
+        return descriptor.field.rel.to, False
+    if isinstance(descriptor, SingleRelatedObjectDescriptor):
+        return descriptor.related.model, False
+    if isinstance(descriptor, ReverseManyRelatedObjectsDescriptor):
+        return descriptor.field.rel.to, True
+    if isinstance(descriptor, (ForeignRelatedObjectsDescriptor,
+                               ManyRelatedObjectsDescriptor)):
+        return descriptor.related.model, True
+
+    return None, None
+
+
+def get_select_related(queryset):
+    """Return list of paths in select_related of queryset."""
+
+    paths = list()
+
+    def walk(tree, prefix):
+        for name, subtree in tree.items():
+            if subtree:
+                walk(subtree, prefix + name + '__')
+            else:
+                paths.append(prefix + name)
+
+    if isinstance(queryset.query.select_related, dict):
+        walk(queryset.query.select_related, '')
+
+    return paths
+
+
+class EagerLoadingPlan(object):
+
+    """Relations to be loaded with the queryset of a serializer."""
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.hooks = list()
+
+    def add(self, path, many):
+        if many:
+            self.prefetch_related.add(path)
+        else:
+            self.select_related.add(path)
+
+    def apply(self, queryset):
+        """Return queryset with all relations of plan.
+
+        select_related of django replaces paths selected before, so paths
+        of eager_loading hooks are merged with the plan and applied once.
+        """
+
+        select_related = set(self.select_related)
+        for key, hook in self.hooks:
+            try:
+                queryset = hook(queryset)
+                select_related.update(get_select_related(queryset))
+            except Exception, e:
+                log.warning(u'Eager loading of %s failed: %s' % (key, e))
+
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(
+                *sorted(self.prefetch_related))
+
+        log.debug(u'Eager loading plan: select_related %s, '
+                  u'prefetch_related %s' %
+                  (sorted(select_related), sorted(self.prefetch_related)))
+
+        return queryset
+
 
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
 
@@ -36,39 +134,17 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
         if args:
             queryset = args[0]
 
-            if not fields:
-                try:
-                    fields_class = None
-
-                    if kind == 'basic' and self.Meta.__dict__.get('basic_fields'):
-                        fields_class = self.Meta.basic_fields
-                    elif kind == 'details' and self.Meta.__dict__.get('details_fields'):
-                        fields_class = self.Meta.details_fields
-                    elif self.Meta.__dict__.get('default_fields'):
-                        fields_class = self.Meta.default_fields
-                    else:
-                        fields_class = self.Meta.fields
-
-                    all_fields = fields_class + include
-                except:
-                    pass
-            else:
-                all_fields = include + fields
+            all_fields = self.get_all_fields(fields, include, kind)
 
             filtred_fields = [self.get_main_key(field, kind)[0]
                               for field in all_fields]
 
-            if filtred_fields and type(queryset) == BaseQuerySet:
-                # import pdb; pdb.Pdb(skip=['django.*']).set_trace()  #
-                # breakpoint 184999ff //
-
-                # for key in all_fields:
-                # import pdb; pdb.Pdb(skip=['django.*']).set_trace()  #
-                # breakpoint 50ca06f4 //
-
-                #     queryset = self.recur(self, key, kind, queryset)
-
-                queryset = self.exec_eager_loading(filtred_fields, queryset)
+            # Querysets already evaluated come from prefetched relations of
+            # the parent serializer
+            if filtred_fields and type(queryset) == BaseQuerySet and \
+                    queryset._result_cache is None:
+                queryset = self.exec_eager_loading(all_fields, queryset,
+                                                   kind, exclude)
 
             args = (queryset,)
 
@@ -214,22 +290,131 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
 
         return key, fields_aux
 
-    def exec_eager_loading(self, filted_fields, queryset):
+    def get_all_fields(self, fields, include, kind):
+        """Return fields to be rendered by serializer."""
+
+        if fields:
+            return include + fields
+
         try:
+            if kind == 'basic' and self.Meta.__dict__.get('basic_fields'):
+                fields_class = self.Meta.basic_fields
+            elif kind == 'details' and self.Meta.__dict__.get('details_fields'):
+                fields_class = self.Meta.details_fields
+            elif self.Meta.__dict__.get('default_fields'):
+                fields_class = self.Meta.default_fields
+            else:
+                fields_class = self.Meta.fields
+
+            return fields_class + include
+        except:
+            return tuple()
+
+    def get_eager_loading_plan(self, all_fields, kind, exclude=tuple(),
+                               plan=None, prefix='', many=False, depth=0):
+        """Walk fields of serializer and of nested serializers and return
+        EagerLoadingPlan with relations used by them.
+
+        Relation of a mapping is its 'relation' key, for mappings whose
+        'obj' is a property over a relation (like viprequestport_set for
+        ports), or its 'obj'. Relations after a many relation are
+        prefetched, relations from the root are selected. eager_loading
+        hooks are used only in the root serializer.
+        """
 
-            # get fields with prefetch_related
-            mapping = self.mapping
+        if plan is None:
+            plan = EagerLoadingPlan()
 
-            # For each field
-            for key in filted_fields:
-                # if has key
-                eager_loading = mapping.get(key, {}).get('eager_loading')
-                if eager_loading:
-                    queryset = eager_loading(queryset)
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        forbidden = set([field.split('__')[0] for field in exclude])
+
+        for field in all_fields:
+            key, other_fields = self.get_main_key(field, kind)
+            if key.split('__')[0] in forbidden:
+                continue
+            slr_model = self.mapping.get(key)
+            if not slr_model:
+                continue
+
+            if depth == 0 and slr_model.get('eager_loading'):
+                plan.hooks.append((key, slr_model.get('eager_loading')))
+
+            if model is None:
+                continue
+
+            serializer = slr_model.get('serializer')
+            if slr_model.get('keys') or not serializer:
+                # Mappings over values built by a method field are not
+                # walked, only the relations read by the method are loaded
+                if slr_model.get('relation'):
+                    self.plan_relation(plan, model, slr_model['relation'],
+                                       prefix, many)
+                continue
+
+            name = slr_model.get('relation', slr_model.get('obj'))
+            related_model, related_many = self.plan_relation(
+                plan, model, name, prefix, many)
+            if related_model is None:
+                continue
+
+            path = prefix + name
+            if depth + 1 >= EAGER_LOADING_DEPTH or \
+                    not issubclass(serializer, DynamicFieldsModelSerializer):
+                continue
+
+            nested = serializer.__new__(serializer)
+            try:
+                nested.get_serializers()
+            except:
+                continue
+
+            kwargs = slr_model.get('kwargs', dict())
+            include = tuple(kwargs.get('include', tuple()))
+            if other_fields:
+                include += (other_fields,)
+            nested_fields = nested.get_all_fields(
+                tuple(kwargs.get('fields', tuple())), include,
+                kwargs.get('kind'))
+
+            nested.get_eager_loading_plan(
+                nested_fields, kwargs.get('kind'),
+                tuple(kwargs.get('exclude', tuple())), plan, path + '__',
+                many or related_many, depth + 1)
+
+        return plan
+
+    @staticmethod
+    def plan_relation(plan, model, name, prefix, many):
+        """Add relation name of model, which may span relations separated
+        by '__', to plan. Return (related model, many) of the end of the
+        relation, where many tells if a many relation was crossed, or
+        (None, None) when name is not a relation.
+        """
+
+        paths = list()
+        path = prefix
+        for relation in name.split('__'):
+            model, related_many = get_relation(model, relation)
+            if model is None:
+                return None, None
+            many = many or related_many
+            path += relation
+            paths.append((path, many))
+            path += '__'
+
+        for path, path_many in paths:
+            plan.add(path, path_many)
+
+        return model, many
+
+    def exec_eager_loading(self, all_fields, queryset, kind=None,
+                           exclude=tuple()):
+        try:
+            plan = self.get_eager_loading_plan(all_fields, kind, exclude)
         except Exception, e:
-            log.info(e)
-            pass
-        return queryset
+            log.warning(u'Failed to plan eager loading: %s' % e)
+            return queryset
+        return plan.apply(queryset)
 
 
 class RecursiveField(serializers.Serializer):
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import re
+from threading import Lock
+
+from django.template import Template
+
+log = logging.getLogger(__name__)
+
+# Compiled templates and roteiro contents by path, with the mtime and size
+# of the file they were read from
+_templates = dict()
+_roteiros = dict()
+_lock = Lock()
+
+# Patterns matching the keys of roteiro dictionaries, by keys
+_key_patterns = dict()
+KEY_PATTERNS_MAX = 64
+
+
+def _get_cached(cache, path, load):
+    """Return load(content of path), loading it again when the file
+    changes."""
+
+    with open(path, 'r') as file_handle:
+        stat = os.fstat(file_handle.fileno())
+        version = (stat.st_mtime, stat.st_size)
+        with _lock:
+            cached = cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        log.debug('Loading template %s' % path)
+        value = load(file_handle.read())
+
+    with _lock:
+        cache[path] = (version, value)
+    return value
+
+
+def get_template(path):
+    """Return Django Template of file, compiled once while the file is not
+    changed.
+
+    Raises IOError when the file can not be read and TemplateSyntaxError
+    when it is not a valid template.
+    """
+
+    return _get_cached(_templates, path, Template)
+
+
+def get_roteiro(path):
+    """Return content of roteiro file, read once while it is not changed."""
+
+    return _get_cached(_roteiros, path, lambda content: content)
+
+
+def clear_templates():
+    """Forget every cached template."""
+
+    with _lock:
+        _templates.clear()
+        _roteiros.clear()
+        _key_patterns.clear()
+
+
+def _get_key_pattern(keys):
+
+    keys = tuple(sorted(keys, key=lambda key: (-len(key), key)))
+    with _lock:
+        pattern = _key_patterns.get(keys)
+    if pattern is None:
+        # Longest keys first, so a key is not replaced inside a longer one
+        pattern = re.compile('|'.join(re.escape(key) for key in keys))
+        with _lock:
+            if len(_key_patterns) >= KEY_PATTERNS_MAX:
+                _key_patterns.clear()
+            _key_patterns[keys] = pattern
+    return pattern
+
+
+def substitute(text, dicionario):
+    """Generate parts of text with every key of dicionario replaced by its
+    value, in a single pass over text.
+
+    Keys are literal strings. When keys overlap, the longest one is
+    replaced, so VLANBELEAF does not change VLANBELEAFSP1.
+    """
+
+    if not dicionario:
+        yield text
+        return
+
+    pattern = _get_key_pattern(dicionario.keys())
+    start = 0
+    for match in pattern.finditer(text):
+        yield text[start:match.start()]
+        yield dicionario[match.group(0)]
+        start = match.end()
+    yield text[start:]
+
+
+def render_to_file(filename, parts):
+    """Write rendered parts to filename as they are generated.
+
+    :param parts: Iterable of strings, usually a generator rendering
+                  templates. When it fails, the incomplete file is removed.
+    """
+
+    file_handle = open(filename, 'w')
+    try:
+        with file_handle:
+            for part in parts:
+                file_handle.write(part)
+    except Exception:
+        os.remove(filename)
+        raise
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from django.core.cache.backends.locmem import LocMemCache
+from mock import patch
+
+from networkapi.util import appcache
+
+
+class AppCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LocMemCache('appcache-test', {})
+        patch('networkapi.util.appcache.djangocache', self.cache).start()
+        patch('networkapi.util.appcache.cache_enabled',
+              return_value=1).start()
+        appcache.cache_stats.clear()
+
+    def tearDown(self):
+        patch.stopall()
+        appcache.cache_stats.clear()
+
+    def test_cached_search(self):
+        self.assertIsNone(appcache.get_cached_search('ENV', {'id': 1}))
+
+        appcache.set_cache_search_with_list('ENV', {'id': 1}, ['env1'])
+
+        self.assertEqual(['env1'],
+                         appcache.get_cached_search('ENV', {'id': 1}))
+        self.assertIsNone(appcache.get_cached_search('ENV', {'id': 2}))
+        self.assertEqual(
+            {'hits': 1, 'misses': 2, 'sets': 1, 'invalidations': 0},
+            appcache.get_cache_stats()['ENV'])
+
+    def test_invalidation_changes_namespace(self):
+        appcache.set_cache_search_with_list('ENV', 'search', ['env1'])
+        appcache.set_cache_search_with_list('VIP', 'search', ['vip1'])
+
+        self.assertTrue(appcache.delete_cached_searches_list('ENV'))
+
+        self.assertIsNone(appcache.get_cached_search('ENV', 'search'))
+        self.assertEqual(['vip1'], appcache.get_cached_search('VIP', 'search'))
+
+        appcache.set_cache_search_with_list('ENV', 'search', ['env2'])
+        self.assertEqual(['env2'], appcache.get_cached_search('ENV', 'search'))
+
+    def test_invalidation_of_unused_namespace(self):
+        self.assertTrue(appcache.delete_cached_searches_list('ENV'))
+        self.assertIsNone(appcache.get_cached_search('ENV', 'search'))
+
+    def test_evicted_namespace_does_not_return_old_entries(self):
+        appcache.set_cache_search_with_list('ENV', 'search', ['env1'])
+
+        with patch('networkapi.util.appcache.time.time',
+                   return_value=2000000000):
+            self.cache.delete('ENV:version')
+            self.assertIsNone(appcache.get_cached_search('ENV', 'search'))
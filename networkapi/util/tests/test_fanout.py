@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+from mock import patch
+
+from networkapi.extra_logging import local
+from networkapi.plugins import exceptions as base_exceptions
+from networkapi.util.fanout import fan_out
+
+
+class FanOutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.close = patch(
+            'networkapi.util.fanout._close_connections').start()
+        self.compensated = list()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def compensate(self, device_id, device, result):
+        self.compensated.append(device_id)
+
+    def test_results_by_device(self):
+        results = fan_out([('1', 2), ('2', 3), ('3', 4)],
+                          lambda device_id, device: device * 2)
+        self.assertEqual({'1': 4, '2': 6, '3': 8}, results)
+
+        # Workers close their DB connections when they end
+        for _ in range(100):
+            if self.close.call_count == 3:
+                break
+            time.sleep(0.01)
+        self.assertEqual(3, self.close.call_count)
+
+    def test_single_device_runs_in_caller_thread(self):
+        results = fan_out(
+            [('1', None)],
+            lambda device_id, device: threading.current_thread().name)
+        self.assertEqual(threading.current_thread().name, results['1'])
+        self.assertFalse(self.close.called)
+
+    def test_latency_of_slowest_device(self):
+        start = time.time()
+        fan_out([(str(i), 0.2) for i in range(4)],
+                lambda device_id, device: time.sleep(device), workers=4)
+        self.assertLess(time.time() - start, 0.6)
+
+    def test_bounded_workers(self):
+        threads = set()
+
+        def call(device_id, device):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01)
+
+        fan_out([(str(i), None) for i in range(10)], call, workers=2)
+        self.assertEqual(2, len(threads))
+
+    def test_failure_compensates_devices_done(self):
+
+        def call(device_id, device):
+            if device_id == '2':
+                time.sleep(0.05)
+                raise base_exceptions.CommandErrorException('Failed in 2')
+            return device_id
+
+        with self.assertRaises(base_exceptions.CommandErrorException):
+            fan_out([('1', None), ('2', None), ('3', None)], call,
+                    self.compensate)
+        self.assertEqual(['1', '3'], self.compensated)
+
+    def test_failure_stops_devices_not_started(self):
+        called = list()
+
+        def call(device_id, device):
+            called.append(device_id)
+            raise ValueError(device_id)
+
+        with self.assertRaises(ValueError):
+            fan_out([(str(i), None) for i in range(5)], call,
+                    self.compensate, workers=1)
+        self.assertEqual(['0'], called)
+        self.assertEqual([], self.compensated)
+
+    def test_timeout(self):
+
+        def call(device_id, device):
+            time.sleep(device)
+            return device_id
+
+        start = time.time()
+        with self.assertRaises(base_exceptions.CommandErrorException):
+            fan_out([('1', 0), ('2', 1)], call, self.compensate, timeout=0.1)
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(['1'], self.compensated)
+
+    def test_timeout_compensates_late_success(self):
+
+        def call(device_id, device):
+            time.sleep(device)
+            return device_id
+
+        with self.assertRaises(base_exceptions.CommandErrorException):
+            fan_out([('1', 0), ('2', 0.2)], call, self.compensate,
+                    timeout=0.1)
+        self.assertEqual(['1'], self.compensated)
+
+        # Call in 2 ends after the fan out gave up on it
+        for _ in range(100):
+            if len(self.compensated) == 2:
+                break
+            time.sleep(0.01)
+        self.assertEqual(['1', '2'], self.compensated)
+
+    def test_keep_logging_context(self):
+        local.request_id = 'request-1'
+        try:
+            results = fan_out(
+                [('1', None), ('2', None)],
+                lambda device_id, device: getattr(local, 'request_id', None))
+        finally:
+            del local.request_id
+        self.assertEqual({'1': 'request-1', '2': 'request-1'}, results)
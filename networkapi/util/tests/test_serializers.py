@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import unittest
+
+from networkapi.api_vip_request.models import VipRequest
+from networkapi.api_vip_request.serializers.v3 import VipRequestV3Serializer
+from networkapi.util.serializers import EagerLoadingPlan
+from networkapi.util.serializers import get_relation
+from networkapi.util.serializers import get_select_related
+
+
+def get_plan(serializer, fields=tuple(), include=tuple(), kind=None,
+             exclude=tuple()):
+    nested = serializer.__new__(serializer)
+    nested.get_serializers()
+    all_fields = nested.get_all_fields(fields, include, kind)
+    return nested.get_eager_loading_plan(all_fields, kind, exclude)
+
+
+class RelationTestCase(unittest.TestCase):
+
+    def test_foreign_key(self):
+        model, many = get_relation(VipRequest, 'environmentvip')
+        self.assertEqual('EnvironmentVip', model.__name__)
+        self.assertFalse(many)
+
+    def test_reverse_foreign_key(self):
+        model, many = get_relation(VipRequest, 'viprequestport_set')
+        self.assertEqual('VipRequestPort', model.__name__)
+        self.assertTrue(many)
+
+    def test_property_is_not_evaluated(self):
+        self.assertEqual((None, None), get_relation(VipRequest, 'ports'))
+        self.assertEqual((None, None), get_relation(VipRequest, 'ipv4_id'))
+        self.assertEqual((None, None), get_relation(VipRequest, 'unknown'))
+
+
+class EagerLoadingPlanTestCase(unittest.TestCase):
+
+    def test_plan_of_nested_includes(self):
+        plan = get_plan(
+            VipRequestV3Serializer,
+            include=('ports__details__pools__details__server_pool__details',
+                     'environmentvip__details',))
+
+        self.assertIn('environmentvip', plan.select_related)
+        self.assertEqual(set([
+            'viprequestoptionvip_set',
+            'viprequestoptionvip_set__optionvip',
+            'viprequestport_set',
+            'viprequestport_set__viprequestportoptionvip_set',
+            'viprequestport_set__viprequestportoptionvip_set__optionvip',
+            'viprequestport_set__viprequestportpool_set',
+            'viprequestport_set__viprequestportpool_set__optionvip',
+            'viprequestport_set__viprequestportpool_set__server_pool',
+        ]), set([path for path in plan.prefetch_related
+                 if path.count('__') < 3]))
+        self.assertFalse([path for path in plan.select_related
+                          if path.startswith('viprequestport_set')])
+
+        hooks = [key for key, hook in plan.hooks]
+        self.assertIn('environmentvip__details', hooks)
+
+    def test_plan_of_method_field_relations(self):
+        plan = get_plan(VipRequestV3Serializer, fields=('id', 'options',
+                                                        'ports'))
+
+        self.assertEqual(set([
+            'viprequestoptionvip_set',
+            'viprequestoptionvip_set__optionvip',
+            'viprequestport_set',
+            'viprequestport_set__viprequestportoptionvip_set',
+            'viprequestport_set__viprequestportoptionvip_set__optionvip',
+            'viprequestport_set__viprequestportpool_set',
+        ]), plan.prefetch_related)
+        self.assertFalse(plan.select_related)
+
+    def test_plan_of_kind(self):
+        plan = get_plan(VipRequestV3Serializer, kind='details')
+
+        self.assertIn('environmentvip', plan.select_related)
+        self.assertIn('ipv4', plan.select_related)
+        self.assertIn('viprequestport_set', plan.prefetch_related)
+
+    def test_plan_without_excluded_fields(self):
+        plan = get_plan(VipRequestV3Serializer, kind='details',
+                        exclude=('ports',))
+
+        self.assertNotIn('viprequestport_set', plan.prefetch_related)
+
+    def test_plan_without_relations(self):
+        plan = get_plan(VipRequestV3Serializer, fields=('id', 'name'))
+
+        self.assertFalse(plan.select_related)
+        self.assertFalse(plan.prefetch_related)
+
+    def test_apply_merges_select_related(self):
+        plan = EagerLoadingPlan()
+        plan.add('environmentvip', False)
+        plan.add('viprequestport_set', True)
+        plan.hooks.append(
+            ('ipv4', lambda queryset: queryset.select_related('ipv4')))
+        plan.hooks.append(
+            ('ipv6', lambda queryset: queryset.select_related('ipv6')))
+
+        def fail(queryset):
+            raise Exception('Invalid hook')
+        plan.hooks.append(('fail', fail))
+
+        queryset = plan.apply(VipRequest.objects.all())
+
+        self.assertEqual(['environmentvip', 'ipv4', 'ipv6'],
+                         sorted(get_select_related(queryset)))
+        self.assertEqual(['viprequestport_set'],
+                         list(queryset._prefetch_related_lookups))
+
+    def test_serializer_queryset(self):
+        queryset = VipRequestV3Serializer(
+            VipRequest.objects.all(), many=True, kind='details').object
+
+        self.assertIn('environmentvip', get_select_related(queryset))
+        self.assertIn('viprequestport_set',
+                      queryset._prefetch_related_lookups)
+
+    def test_evaluated_queryset(self):
+        queryset = VipRequest.objects.all()
+        queryset._result_cache = []
+
+        serializer = VipRequestV3Serializer(queryset, many=True,
+                                            kind='details')
+
+        self.assertIs(queryset, serializer.object)
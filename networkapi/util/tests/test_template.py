@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from django.template import Context
+
+from networkapi.util.template import clear_templates
+from networkapi.util.template import get_roteiro
+from networkapi.util.template import get_template
+from networkapi.util.template import render_to_file
+from networkapi.util.template import substitute
+
+INTERFACE_TEMPLATE = """interface {{ INTERFACE_NAME }}
+ description {{ INTERFACE_DESCRIPTION }}
+ {% if BOOL_INTERFACE_IS_TRUNK %}switchport mode trunk
+ switchport trunk allowed vlan {{ VLAN_RANGE }}{% else %}switchport access vlan {{ VLAN_RANGE }}{% endif %}
+ no shutdown
+!
+"""
+
+
+class TemplateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        clear_templates()
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write(self, name, content):
+        filename = os.path.join(self.path, name)
+        with open(filename, 'w') as file_handle:
+            file_handle.write(content)
+        return filename
+
+    def read(self, filename):
+        with open(filename, 'r') as file_handle:
+            return file_handle.read()
+
+    def test_template_compiled_once(self):
+        filename = self.write('int', INTERFACE_TEMPLATE)
+
+        template = get_template(filename)
+
+        self.assertIs(template, get_template(filename))
+        self.assertIn('interface eth1/1', template.render(
+            Context({'INTERFACE_NAME': 'eth1/1'})))
+
+    def test_template_reloaded_when_file_changes(self):
+        filename = self.write('int', 'first {{ NAME }}')
+        template = get_template(filename)
+
+        self.write('int', 'second {{ NAME }}')
+        os.utime(filename, (time.time() + 10, time.time() + 10))
+
+        self.assertIsNot(template, get_template(filename))
+        self.assertEqual('second x', get_template(filename).render(
+            Context({'NAME': 'x'})))
+
+    def test_missing_template(self):
+        with self.assertRaises(IOError):
+            get_template(os.path.join(self.path, 'missing'))
+
+    def test_substitute_single_pass(self):
+        text = 'hostname HOSTNAME\nvlan VLANBELEAF VLANBELEAFSP1\n'
+        dicionario = {'HOSTNAME': 'LF-1', 'VLANBELEAF': '10',
+                      'VLANBELEAFSP1': '11', 'LF': 'not replaced'}
+
+        self.assertEqual('hostname LF-1\nvlan 10 11\n',
+                         ''.join(substitute(text, dicionario)))
+        self.assertEqual(text, ''.join(substitute(text, {})))
+
+    def test_roteiro(self):
+        dicionario = {'VAR1': '10.0.1.1', 'VAR10': '10.0.10.1'}
+        filein = self.write('roteiro', 'ip VAR1\nip VAR10\nip VAR2\n')
+
+        self.assertEqual('ip 10.0.1.1\nip 10.0.10.1\nip VAR2\n',
+                         ''.join(substitute(get_roteiro(filein), dicionario)))
+
+    def test_render_to_file_removes_incomplete_file(self):
+        filename = os.path.join(self.path, 'config')
+
+        def parts():
+            yield 'interface eth1/1\n'
+            raise KeyError('VLAN_RANGE')
+
+        with self.assertRaises(KeyError):
+            render_to_file(filename, parts())
+        self.assertFalse(os.path.exists(filename))
+
+    def test_render_to_file(self):
+        filename = os.path.join(self.path, 'config')
+        template = get_template(self.write('int', INTERFACE_TEMPLATE))
+        interfaces = [{'INTERFACE_NAME': 'eth1/%s' % i,
+                       'INTERFACE_DESCRIPTION': 'server%s' % i,
+                       'BOOL_INTERFACE_IS_TRUNK': i % 2,
+                       'VLAN_RANGE': '1-100'} for i in range(2)]
+
+        render_to_file(filename, (template.render(Context(key_dict))
+                                  for key_dict in interfaces))
+
+        self.assertEqual(
+            'interface eth1/0\n description server0\n '
+            'switchport access vlan 1-100\n no shutdown\n!\n'
+            'interface eth1/1\n description server1\n '
+            'switchport mode trunk\n switchport trunk allowed vlan 1-100\n'
+            ' no shutdown\n!\n',
+            self.read(filename))
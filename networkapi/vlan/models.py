@@ -1549,14 +1549,9 @@ class Vlan(BaseModel):
                 self.log.error(msg)
                 raise VlanErrorV3(msg)
 
-    def allocate_vlan(self):
-        """Create a Vlan with the new Model
-
-        The fields num_vlan, acl_file_name, acl_valida and ativada will be
-        generated automatically
-
-        @return: nothing
-        """
+    def get_vlan_number_ranges(self):
+        """Return list with the ranges (min_num, max_num) of vlan numbers of
+        environment, in the order numbers are allocated."""
 
         if (self.ambiente.min_num_vlan_1 and self.ambiente.max_num_vlan_1) or \
                 (self.ambiente.min_num_vlan_2 and self.ambiente.max_num_vlan_2):
@@ -1582,33 +1577,49 @@ class Vlan(BaseModel):
             min_num_02 = MIN_VLAN_NUMBER_02
             max_num_02 = MAX_VLAN_NUMBER_02
 
-        # Calculate Number VLAN
-        self.num_vlan = self.calculate_vlan_number_v3(min_num_01, max_num_01)
-        if self.num_vlan is None:
-            self.num_vlan = self.calculate_vlan_number_v3(
-                min_num_02, max_num_02)
-            if self.num_vlan is None:
-                raise VlanNumberNotAvailableError(
-                    None, u'Number VLAN unavailable for environment %d.'
-                    % self.ambiente.id)
+        return [(min_num_01, max_num_01), (min_num_02, max_num_02)]
 
-    def calculate_vlan_number_v3(self, min_num, max_num, list_available=False):
-        """Caculate if has a number available in range (min_num/max_num) to
-        specified environment
+    def allocate_vlan(self):
+        """Create a Vlan with the new Model
 
-        @param min_num: Minimum number that the vlan can be created.
-        @param max_num: Maximum number that the vlan can be created.
-        @param list_available: If = True, return the list of numbers availables
+        The fields num_vlan, acl_file_name, acl_valida and ativada will be
+        generated automatically
 
-        @return: None when hasn't a number available | num_vlan when found
-                 a number available
+        @return: nothing
         """
 
-        interval = range(min_num, max_num + 1)
+        # Calculate Number VLAN, the lowest available in ranges of
+        # environment, searching the first range before the second.
+        # Numbers are not reserved in the database, the caller must hold
+        # the locks of environments related (LOCK_ENVIRONMENT_ALLOCATES)
+        # until vlan is saved, as in create_v3.
+        ranges = self.get_vlan_number_ranges()
+        numbers = network.get_free_numbers(
+            ranges, self.search_vlan_numbers_used(ranges))
 
-        # Vlan numbers in interval in the same environment
-        vlan_numbers_in_interval = self.search_vlan_numbers(
-            self.ambiente_id, min_num, max_num)
+        if not numbers:
+            raise VlanNumberNotAvailableError(
+                None, u'Number VLAN unavailable for environment %d.'
+                % self.ambiente.id)
+
+        self.num_vlan = numbers[0]
+
+    def search_vlan_numbers_used(self, ranges):
+        """Return sorted list of vlan numbers in ranges used in environment
+        or in environments with the same equipments.
+
+        @param ranges: List of (min_num, max_num)
+        """
+
+        in_ranges = Q()
+        for min_num, max_num in ranges:
+            in_ranges |= Q(num_vlan__range=(min_num, max_num))
+
+        # Vlan numbers in the same environment
+        vlan_numbers = Vlan.objects.filter(
+            in_ranges,
+            ambiente__id=self.ambiente_id
+        ).values_list('num_vlan', flat=True)
 
         # Find equipment's ids from environmnet that is 'switches',
         # 'roteadores' or 'balanceadores'
@@ -1620,22 +1631,33 @@ class Vlan(BaseModel):
         vlans_others_environments = Vlan.objects.exclude(
             ambiente__id=self.ambiente_id
         ).filter(
+            in_ranges,
             ambiente__equipamentoambiente__equipamento__id__in=id_equipamentos
-        ).values_list('num_vlan', flat=True)
+        ).values_list('num_vlan', flat=True).distinct()
 
-        # Clean duplicates numbers and update merge 'vlan_numbers_in_interval'
-        # with 'vlans_others_environments'
-        vlan_numbers_in_interval = set(vlan_numbers_in_interval)
-        vlan_numbers_in_interval.update(vlans_others_environments)
+        used = sorted(set(vlan_numbers).union(vlans_others_environments))
+        self.log.debug('VLANs in ranges %s: %s.', ranges, used)
 
-        self.log.debug('Interval: %s.', interval)
-        self.log.debug('VLANs in interval: %s.', vlan_numbers_in_interval)
+        return used
 
-        diff_set = set(interval) - set(vlan_numbers_in_interval)
-        self.log.debug('Difference in the lists: %s.', diff_set)
+    def calculate_vlan_number_v3(self, min_num, max_num, list_available=False):
+        """Caculate if has a number available in range (min_num/max_num) to
+        specified environment
+
+        @param min_num: Minimum number that the vlan can be created.
+        @param max_num: Maximum number that the vlan can be created.
+        @param list_available: If = True, return the list of numbers availables
+
+        @return: None when hasn't a number available | num_vlan when found
+                 the lowest number available
+        """
+
+        ranges = [(min_num, max_num)]
+        used = self.search_vlan_numbers_used(ranges)
 
         if list_available:
-            return diff_set
-        for num_vlan in diff_set:
-            return num_vlan
-        return None
+            return set(network.get_free_numbers(
+                ranges, used, max_num - min_num + 1))
+
+        numbers = network.get_free_numbers(ranges, used)
+        return numbers[0] if numbers else None
@@ -28,7 +28,7 @@ from networkapi.exception import InvalidValueError
 from networkapi.grupo.models import GrupoError
 from networkapi.infrastructure.datatable import build_query_to_datatable
 from networkapi.infrastructure.ipaddr import IPNetwork
-from networkapi.infrastructure.xml_utils import dumps_networkapi
+from networkapi.infrastructure.xml_utils import iter_dumps_networkapi
 from networkapi.infrastructure.xml_utils import loads
 from networkapi.rest import RestResource
 from networkapi.settings import VLAN_CACHE_TIME
@@ -549,7 +549,7 @@ class VlanFindResource(RestResource):
             vlan_map['vlan'] = itens
             vlan_map['total'] = total
 
-            return self.response(dumps_networkapi(vlan_map))
+            return self.stream_response(iter_dumps_networkapi(vlan_map))
 
         except InvalidValueError, e:
             self.log.error(
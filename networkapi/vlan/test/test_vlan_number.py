@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock import Mock
+from mock import patch
+
+from networkapi.util.network import get_free_numbers
+from networkapi.vlan.models import Vlan
+from networkapi.vlan.models import VlanNumberNotAvailableError
+
+
+class FreeNumbersTestCase(unittest.TestCase):
+
+    def test_lowest_free(self):
+        self.assertEqual([10], get_free_numbers([(10, 20)], []))
+        self.assertEqual([13], get_free_numbers([(10, 20)],
+                                                [12, 10, 11, 30, 1]))
+        self.assertEqual([], get_free_numbers([(10, 12)], [10, 11, 12]))
+
+    def test_count(self):
+        used = [11, 12, 15]
+
+        self.assertEqual([10, 13, 14, 16, 17],
+                         get_free_numbers([(10, 20)], used, 5))
+        self.assertEqual([10, 13, 14, 16, 17, 18, 19, 20],
+                         get_free_numbers([(10, 20)], used, 100))
+
+    def test_ranges_in_order(self):
+        ranges = [(100, 102), (10, 20)]
+
+        self.assertEqual([102, 10, 11],
+                         get_free_numbers(ranges, [100, 101], 3))
+
+    def test_overlapping_ranges(self):
+        ranges = [(10, 15), (10, 20)]
+
+        self.assertEqual([10, 12, 13, 14, 15, 16, 17],
+                         get_free_numbers(ranges, [11], 7))
+        self.assertEqual([10, 11, 12], get_free_numbers([(10, 12), (10, 12)],
+                                                        [], 10))
+
+    def test_mostly_used(self):
+        # Most of the vlan numbers of the equipments are in use
+        free = [1, 2, 1000, 3001, 4094]
+        used = [num for num in range(1, 4095) if num not in free]
+
+        self.assertEqual([1], get_free_numbers([(1, 4094)], used))
+        self.assertEqual([1000, 3001],
+                         get_free_numbers([(3, 3500), (3, 3500)], used, 3))
+        self.assertEqual(free, get_free_numbers([(1, 4094)], used, 4094))
+        self.assertEqual([], get_free_numbers([(3, 999), (1001, 3000)],
+                                              used))
+
+
+class AllocateVlanTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patch.object(Vlan, 'get_vlan_number_ranges',
+                     return_value=[(10, 12), (100, 200)]).start()
+        self.search = patch.object(Vlan, 'search_vlan_numbers_used',
+                                   return_value=[10, 12, 100]).start()
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_allocate_vlan(self):
+        vlan = Vlan()
+
+        vlan.allocate_vlan()
+
+        self.assertEqual(11, vlan.num_vlan)
+        self.search.assert_called_once_with([(10, 12), (100, 200)])
+
+    def test_numbers_unavailable(self):
+        self.search.return_value = [10, 11, 12] + range(100, 201)
+        vlan = Vlan()
+
+        with patch.object(Vlan, 'ambiente', Mock(id=1)):
+            with self.assertRaises(VlanNumberNotAvailableError):
+                vlan.allocate_vlan()
+        self.assertIsNone(vlan.num_vlan)
+
+    def test_calculate_vlan_number_v3(self):
+        vlan = Vlan()
+
+        self.assertEqual(11, vlan.calculate_vlan_number_v3(10, 12))
+        self.assertEqual(set([11]),
+                         vlan.calculate_vlan_number_v3(10, 12, True))
+        self.search.return_value = [10, 11, 12]
+        self.assertIsNone(vlan.calculate_vlan_number_v3(10, 12))